@@ -0,0 +1,5 @@
+"""
+aks — AkshayaLang core package.
+"""
+
+__version__ = "1.0.0"
@@ -2,7 +2,28 @@
 ast.py — AkshayaLang AST (Sovereign Refactored 10/10 Version)
 """
 
+import operator
+
 from aks.tokens import Token
+from aks.execution_context import Frame
+from aks.types import add
+from aks.persistent import PVector, PMap
+from aks.serialize import mirror, normalize  # noqa: F401  (normalize is re-exported)
+
+# Strict binary operators; `and` / `or` short-circuit and are handled separately.
+BINARY_OPERATORS = {
+    '+': add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
 
 # === Exception for Return Signals ===
 class ReturnSignal(Exception):
@@ -10,8 +31,70 @@ class ReturnSignal(Exception):
         self.value = value
 
 
+# === Completion Records ===
+class Completion:
+    """
+    The result of a statement that ends its enclosing blocks early. Blocks
+    and loops hand it upward unchanged until a function call unwraps it.
+    """
+
+    __slots__ = ("kind", "value")
+
+    RETURN = "return"
+    # `return f(...)`: the value is (function, arguments, calling context),
+    # and the call is made by the trampoline in UserFunction.call.
+    TAIL_CALL = "tail_call"
+
+    def __init__(self, kind, value=None):
+        self.kind = kind
+        self.value = value
+
+    def __repr__(self):
+        return f"Completion({self.kind}, {self.value!r})"
+
+
+def unwrap(result):
+    """The value of a program or function body that may have ended in a `return`."""
+    if type(result) is not Completion:
+        return result
+    if result.kind is Completion.TAIL_CALL:
+        function, arguments, context = result.value
+        return function.call(arguments, context)
+    return result.value
+
+
+# === Resolved Variable Slots (see aks.resolver) ===
+class _Unbound:
+    """Marker for a local slot that has not been assigned yet."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<unbound>"
+
+
+UNBOUND = _Unbound()
+
+
+def load_slot(slots, address):
+    depth, slot = address
+    for _ in range(depth):
+        slots = slots[0]
+    return slots[slot]
+
+
+def store_slot(slots, address, value):
+    depth, slot = address
+    for _ in range(depth):
+        slots = slots[0]
+    slots[slot] = value
+
+
 # === Base AST Node ===
 class ASTNode:
+    # (line, column) of a statement's first token, set by the parser.
+    position = None
+
     def evaluate(self, context):
         raise NotImplementedError("evaluate() not implemented.")
 
@@ -19,6 +102,20 @@ class ASTNode:
         return f"<{self.__class__.__name__}>"
 
 
+def child_nodes(node):
+    """The AST nodes directly under `node`, found generically through its attributes."""
+    for value in vars(node).values():
+        if isinstance(value, ASTNode):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, ASTNode):
+                    yield item
+                elif isinstance(item, tuple):
+                    # Dict literal pairs.
+                    yield from (part for part in item if isinstance(part, ASTNode))
+
+
 # === Literal Nodes ===
 class NumberLiteral(ASTNode):
     def __init__(self, value):
@@ -54,22 +151,30 @@ class BooleanLiteral(ASTNode):
 
 
 class ListLiteral(ASTNode):
+    constant_elements = None  # tuple of values, set by the optimizer when every element is a literal
+
     def __init__(self, elements):
         self.elements = elements
 
     def evaluate(self, context):
-        return [el.evaluate(context) for el in self.elements]
+        if self.constant_elements is not None:
+            return PVector(self.constant_elements)
+        return PVector([el.evaluate(context) for el in self.elements])
 
     def __repr__(self):
         return f"ListLiteral({self.elements})"
 
 
 class DictLiteral(ASTNode):
+    const_keys = None  # tuple of keys, set by the optimizer when every key is a literal
+
     def __init__(self, pairs):
         self.pairs = pairs  # list of (key_node, value_node)
 
     def evaluate(self, context):
-        return {key.evaluate(context): value.evaluate(context) for key, value in self.pairs}
+        if self.const_keys is not None:
+            return PMap(zip(self.const_keys, [value.evaluate(context) for _, value in self.pairs]))
+        return PMap([(key.evaluate(context), value.evaluate(context)) for key, value in self.pairs])
 
     def __repr__(self):
         return f"DictLiteral({self.pairs})"
@@ -91,10 +196,17 @@ class ObjectLiteral(ASTNode):
 
 # === Identifier ===
 class Identifier(ASTNode):
+    address = None
+
     def __init__(self, name):
         self.name = name
 
     def evaluate(self, context):
+        if self.address is not None:
+            value = load_slot(context.slots, self.address)
+            if value is UNBOUND:
+                raise NameError(f"Variable '{self.name}' is not defined.")
+            return value
         return context.get_variable(self.name)
 
     def __repr__(self):
@@ -110,24 +222,14 @@ class BinaryExpression(ASTNode):
 
     def evaluate(self, context):
         l = self.left.evaluate(context)
-        r = self.right.evaluate(context)
-        ops = {
-            '+': l + r,
-            '-': l - r,
-            '*': l * r,
-            '/': l / r,
-            '==': l == r,
-            '!=': l != r,
-            '<': l < r,
-            '>': l > r,
-            '<=': l <= r,
-            '>=': l >= r,
-            'and': l and r,
-            'or': l or r
-        }
-        if self.operator in ops:
-            return ops[self.operator]
-        raise Exception(f"Unknown operator {self.operator}")
+        if self.operator == 'and':
+            return l and self.right.evaluate(context)
+        if self.operator == 'or':
+            return l or self.right.evaluate(context)
+        op = BINARY_OPERATORS.get(self.operator)
+        if op is None:
+            raise Exception(f"Unknown operator {self.operator}")
+        return op(l, self.right.evaluate(context))
 
     def __repr__(self):
         return f"BinaryExpression({self.left}, '{self.operator}', {self.right})"
@@ -152,25 +254,36 @@ class UnaryExpression(ASTNode):
 
 # === Variable Binding & Assignment ===
 class BindStatement(ASTNode):
+    address = None
+
     def __init__(self, identifier, expression):
         self.identifier = identifier
         self.expression = expression
 
     def evaluate(self, context):
         value = self.expression.evaluate(context)
-        context.set_variable(self.identifier.name, value)
+        if self.address is not None:
+            store_slot(context.slots, self.address, value)
+        else:
+            context.set_variable(self.identifier.name, value)
         return value
 
     def __repr__(self):
-        return f"Bind({self.name} = {self.expression})"
+        return f"Bind({self.identifier.name} = {self.expression})"
 
 
 class AssignmentStatement(ASTNode):
+    address = None
+
     def __init__(self, name, expression):
         self.name = name
         self.expression = expression
 
     def evaluate(self, context):
+        if self.address is not None:
+            value = self.expression.evaluate(context)
+            store_slot(context.slots, self.address, value)
+            return value
         if not context.has_variable(self.name):
             raise NameError(f"Variable '{self.name}' not defined")
         value = self.expression.evaluate(context)
@@ -191,7 +304,7 @@ class IfStatement(ASTNode):
     def evaluate(self, context):
         if self.condition.evaluate(context):
             return self.then_branch.evaluate(context)
-        elif self.else_branch:
+        elif self.else_branch is not None:
             return self.else_branch.evaluate(context)
         return None
 
@@ -208,6 +321,8 @@ class WhileStatement(ASTNode):
         result = None
         while self.condition.evaluate(context):
             result = self.body.evaluate(context)
+            if type(result) is Completion:
+                return result
         return result
 
     def __repr__(self):
@@ -217,9 +332,16 @@ class WhileStatement(ASTNode):
 class ReturnStatement(ASTNode):
     def __init__(self, value):
         self.value = value
+        # `return f(...)` needs nothing from the current call once f is entered.
+        self.tail_call = isinstance(value, FunctionCall)
 
     def evaluate(self, context):
-        raise ReturnSignal(self.value.evaluate(context))
+        if self.tail_call:
+            func, args = self.value.target(context)
+            if isinstance(func, UserFunction):
+                return Completion(Completion.TAIL_CALL, (func, args, context))
+            return Completion(Completion.RETURN, func(*args))
+        return Completion(Completion.RETURN, self.value.evaluate(context))
 
     def __repr__(self):
         return f"Return({self.value})"
@@ -227,13 +349,24 @@ class ReturnStatement(ASTNode):
 
 # === Function Support ===
 class FunctionDeclaration(ASTNode):
+    address = None
+    # Set by the resolver; None means the function is dynamically scoped.
+    frame_size = None
+
     def __init__(self, name, params, body):
         self.name = name
         self.params = params
         self.body = body
 
     def evaluate(self, context):
-        context.set_variable(self.name, UserFunction(self.params, self.body))
+        if self.frame_size is None:
+            context.set_variable(self.name, UserFunction(self.params, self.body))
+            return None
+        function = UserFunction(self.params, self.body, closure=context, frame_size=self.frame_size)
+        if self.address is not None:
+            store_slot(context.slots, self.address, function)
+        else:
+            context.set_variable(self.name, function)
         return None
 
     def __repr__(self):
@@ -246,28 +379,83 @@ class FunctionCall(ASTNode):
         self.arguments = arguments
 
     def evaluate(self, context):
-        func = self.callee.evaluate(context)
-        args = [arg.evaluate(context) for arg in self.arguments]
-        return func.call(args, context)
+        func, args = self.target(context)
+        if isinstance(func, UserFunction):
+            return func.call(args, context)
+        return func(*args)
+
+    def target(self, context):
+        """The callee and its evaluated arguments, without making the call."""
+        if isinstance(self.callee, Identifier) and self.callee.address is None:
+            func = context.get_callable(self.callee.name)
+        else:
+            func = self.callee.evaluate(context)
+        return func, [arg.evaluate(context) for arg in self.arguments]
 
     def __repr__(self):
         return f"Call({self.callee})"
 
 
+class IndexExpression(ASTNode):
+    def __init__(self, target, index):
+        self.target = target
+        self.index = index
+
+    def evaluate(self, context):
+        target = self.target.evaluate(context)
+        index = self.index.evaluate(context)
+        if isinstance(index, float) and index.is_integer():
+            index = int(index)
+        return target[index]
+
+    def __repr__(self):
+        return f"Index({self.target}, {self.index})"
+
+
 class UserFunction:
-    def __init__(self, params, body):
+    """
+    A function defined in AkshayaLang. Unresolved functions run in a child
+    of the caller's context. Resolved ones (see aks.resolver) carry the
+    context that defined them and keep their locals in a slot frame.
+    """
+
+    def __init__(self, params, body, closure=None, frame_size=0):
         self.params = params
         self.body = body
+        self.closure = closure
+        self.frame_size = frame_size
+        # Runs the body in an activation frame; CompiledFunction swaps in its closure.
+        self.entry = body.evaluate
 
     def call(self, arguments, outer_context):
-        local = outer_context.create_child()
-        for name, value in zip(self.params, arguments):
-            local.set_variable(name, value)
-        try:
-            self.body.evaluate(local)
-        except ReturnSignal as rs:
-            return rs.value
-        return None
+        """
+        Run the function. Tail calls come back as TAIL_CALL completions and
+        loop here, so a chain of them uses constant Python stack.
+        """
+        function = self
+        inherited = None
+        while True:
+            if function.closure is not None:
+                slots = [function.closure.slots]
+                slots.extend(arguments[:len(function.params)])
+                slots.extend([UNBOUND] * (function.frame_size - len(slots)))
+                local = Frame(function.closure, slots)
+            else:
+                local = Frame(outer_context)
+                if inherited:
+                    local.variables.update(inherited)
+                local.variables.update(zip(function.params, arguments))
+            result = function.entry(local)
+            if type(result) is not Completion:
+                return None
+            if result.kind is not Completion.TAIL_CALL:
+                return result.value
+            # The caller's frame is finished. Under dynamic scoping its locals
+            # stay visible to the callee, so they are copied into the callee's
+            # frame rather than kept alive as a parent link.
+            function, arguments, caller = result.value
+            inherited = caller.variables
+            outer_context = caller.parent
 
     def __repr__(self):
         return f"<UserFunction {self.params}>"
@@ -282,6 +470,8 @@ class Block(ASTNode):
         result = None
         for stmt in self.statements:
             result = stmt.evaluate(context)
+            if type(result) is Completion:
+                return result
         return result
 
     def __repr__(self):
@@ -297,6 +487,8 @@ class Program(ASTNode):
         result = None
         for stmt in self.statements:
             result = stmt.evaluate(context)
+            if type(result) is Completion:
+                return result
         return result
 
 class MirrorStatement(ASTNode):
@@ -304,20 +496,4 @@ class MirrorStatement(ASTNode):
         self.expression = expression
 
     def evaluate(self, context):
-        value = self.expression.evaluate(context)
-    
-        def normalize(obj):
-            if isinstance(obj, dict):
-                return {
-                    str(k.name) if isinstance(k, Identifier) else 
-                    str(k.value) if hasattr(k, "value") else str(k):
-                    normalize(v)
-                    for k, v in obj.items()
-                }
-            elif isinstance(obj, list):
-                return [normalize(e) for e in obj]
-            elif hasattr(obj, "value"):
-                return obj.value
-            return obj
-    
-        return normalize(value)
+        return mirror(self.expression.evaluate(context), context)
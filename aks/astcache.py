@@ -0,0 +1,389 @@
+"""
+astcache.py — Persistent Parsed-AST Cache (.aksc files)
+
+Like __pycache__ for AkshayaLang. The parsed AST of a source file is
+written to `__akscache__/<name>.aksc` next to the file, or into a shared
+cache directory, and read back in place of lexing and parsing when the
+source is unchanged.
+
+File layout:
+
+    magic      b"AKSC"
+    key        32-byte SHA-256 over the interpreter version and the source
+    checksum   CRC-32 of everything after it, little-endian
+    strings    varint count, then (varint length, UTF-8 bytes) per entry
+    tree       one node in prefix form: a tag byte, then its fields
+
+A statement with a source position is preceded by a _POSITION tag and
+its line and column, so profiles of cached runs still point at lines.
+
+Names, operators and string literals are stored once in the string table
+and referenced by index. Integers are zigzag varints and floats are
+8-byte IEEE doubles. Only node types the parser produces are encoded, so
+loading never runs code the way unpickling can.
+
+Loading checks the checksum, that every node sits where the parser could
+have put it (blocks where blocks go, no missing children) and that the
+tree uses up the data exactly. An entry that fails any of that, or fails
+to decode at all, is a cache miss and gets rewritten.
+"""
+
+import hashlib
+import os
+import struct
+import zlib
+
+import aks
+from aks.errors import CompileError
+from aks.ast import (
+    NumberLiteral, StringLiteral, BooleanLiteral, ListLiteral, DictLiteral,
+    Identifier, BinaryExpression, UnaryExpression, IndexExpression,
+    BindStatement, AssignmentStatement, IfStatement, WhileStatement,
+    ReturnStatement, FunctionDeclaration, FunctionCall, Block, Program,
+    MirrorStatement
+)
+
+MAGIC = b"AKSC"
+# Bump whenever the encoding or the AST node set changes.
+FORMAT_VERSION = 4
+CACHE_DIRNAME = "__akscache__"
+SUFFIX = ".aksc"
+
+_DOUBLE = struct.Struct("<d")
+_CHECKSUM = struct.Struct("<I")
+_HEADER = len(MAGIC) + 32 + _CHECKSUM.size
+
+(
+    _NONE, _FLOAT, _INT, _TRUE, _FALSE, _STRING, _LIST, _DICT, _IDENTIFIER,
+    _BINARY, _UNARY, _INDEX, _BIND, _ASSIGN, _IF, _WHILE, _RETURN, _FUNCTION,
+    _CALL, _BLOCK, _PROGRAM, _MIRROR, _POSITION,
+) = range(23)
+
+
+def cache_key(source):
+    """SHA-256 over the interpreter and format versions plus the source text."""
+    digest = hashlib.sha256(f"{aks.__version__}/{FORMAT_VERSION}\0".encode("utf-8"))
+    digest.update(source.encode("utf-8"))
+    return digest.digest()
+
+
+# ====== Encoding ======
+
+class _Encoder:
+    def __init__(self):
+        self.out = bytearray()
+        self.strings = {}
+
+    def varint(self, n):
+        out = self.out
+        while n > 0x7F:
+            out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def string(self, text):
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        self.varint(index)
+
+    def nodes(self, nodes):
+        self.varint(len(nodes))
+        for node in nodes:
+            self.node(node)
+
+    def node(self, node):
+        out = self.out
+        kind = type(node)
+        if node is None:
+            out.append(_NONE)
+            return
+        if node.position is not None:
+            out.append(_POSITION)
+            self.varint(node.position[0])
+            self.varint(node.position[1])
+        if kind is NumberLiteral:
+            value = node.value
+            if isinstance(value, int):
+                out.append(_INT)
+                self.varint(value << 1 if value >= 0 else (-value << 1) - 1)
+            else:
+                out.append(_FLOAT)
+                out += _DOUBLE.pack(value)
+        elif kind is BooleanLiteral:
+            out.append(_TRUE if node.value else _FALSE)
+        elif kind is StringLiteral:
+            out.append(_STRING)
+            self.string(node.value)
+        elif kind is Identifier:
+            out.append(_IDENTIFIER)
+            self.string(node.name)
+        elif kind is BinaryExpression:
+            out.append(_BINARY)
+            self.string(node.operator)
+            self.node(node.left)
+            self.node(node.right)
+        elif kind is UnaryExpression:
+            out.append(_UNARY)
+            self.string(node.operator)
+            self.node(node.operand)
+        elif kind is FunctionCall:
+            out.append(_CALL)
+            self.node(node.callee)
+            self.nodes(node.arguments)
+        elif kind is IndexExpression:
+            out.append(_INDEX)
+            self.node(node.target)
+            self.node(node.index)
+        elif kind is ListLiteral:
+            out.append(_LIST)
+            self.nodes(node.elements)
+        elif kind is DictLiteral:
+            out.append(_DICT)
+            self.varint(len(node.pairs))
+            for key, value in node.pairs:
+                self.node(key)
+                self.node(value)
+        elif kind is BindStatement:
+            out.append(_BIND)
+            self.string(node.identifier.name)
+            self.node(node.expression)
+        elif kind is AssignmentStatement:
+            out.append(_ASSIGN)
+            self.string(node.name)
+            self.node(node.expression)
+        elif kind is IfStatement:
+            out.append(_IF)
+            self.node(node.condition)
+            self.node(node.then_branch)
+            self.node(node.else_branch)
+        elif kind is WhileStatement:
+            out.append(_WHILE)
+            self.node(node.condition)
+            self.node(node.body)
+        elif kind is ReturnStatement:
+            out.append(_RETURN)
+            self.node(node.value)
+        elif kind is FunctionDeclaration:
+            out.append(_FUNCTION)
+            self.string(node.name)
+            self.varint(len(node.params))
+            for param in node.params:
+                self.string(param)
+            self.node(node.body)
+        elif kind is Block:
+            out.append(_BLOCK)
+            self.nodes(node.statements)
+        elif kind is Program:
+            out.append(_PROGRAM)
+            self.nodes(node.statements)
+        elif kind is MirrorStatement:
+            out.append(_MIRROR)
+            self.node(node.expression)
+        else:
+            raise CompileError(f"Cannot serialize {kind.__name__}")
+
+
+def dumps(tree, key):
+    """Encode `tree` as .aksc bytes stamped with `key`."""
+    encoder = _Encoder()
+    encoder.node(tree)
+    body = encoder.out
+
+    encoder.out = payload = bytearray()
+    encoder.varint(len(encoder.strings))
+    for text in encoder.strings:
+        data = text.encode("utf-8")
+        encoder.varint(len(data))
+        payload += data
+    payload += body
+    return MAGIC + key + _CHECKSUM.pack(zlib.crc32(payload)) + bytes(payload)
+
+
+# ====== Decoding ======
+
+class _Decoder:
+    def __init__(self, data, pos):
+        self.data = data
+        self.pos = pos
+        self.strings = []
+
+    def varint(self):
+        data = self.data
+        shift = result = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def string(self):
+        return self.strings[self.varint()]
+
+    def nodes(self):
+        return [self.node() for _ in range(self.varint())]
+
+    def block(self):
+        node = self.node()
+        if type(node) is not Block:
+            raise ValueError(f"Corrupt .aksc data: expected a block, got {type(node).__name__}")
+        return node
+
+    def optional_block(self):
+        if self.data[self.pos] == _NONE:
+            self.pos += 1
+            return None
+        return self.block()
+
+    def node(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _IDENTIFIER:
+            return Identifier(self.string())
+        if tag == _FLOAT:
+            value, = _DOUBLE.unpack_from(self.data, self.pos)
+            self.pos += 8
+            return NumberLiteral(value)
+        if tag == _BINARY:
+            operator = self.string()
+            left = self.node()
+            return BinaryExpression(left, operator, self.node())
+        if tag == _CALL:
+            callee = self.node()
+            return FunctionCall(callee, self.nodes())
+        if tag == _POSITION:
+            position = (self.varint(), self.varint())
+            node = self.node()
+            node.position = position
+            return node
+        if tag == _BIND:
+            name = self.string()
+            return BindStatement(Identifier(name), self.node())
+        if tag == _BLOCK:
+            return Block(self.nodes())
+        if tag == _NONE:
+            raise ValueError("Corrupt .aksc data: missing node")
+        if tag == _INT:
+            n = self.varint()
+            return NumberLiteral(n >> 1 if not n & 1 else -((n + 1) >> 1))
+        if tag == _TRUE:
+            return BooleanLiteral(True)
+        if tag == _FALSE:
+            return BooleanLiteral(False)
+        if tag == _STRING:
+            return StringLiteral(self.string())
+        if tag == _UNARY:
+            operator = self.string()
+            return UnaryExpression(operator, self.node())
+        if tag == _INDEX:
+            target = self.node()
+            return IndexExpression(target, self.node())
+        if tag == _LIST:
+            return ListLiteral(self.nodes())
+        if tag == _DICT:
+            return DictLiteral([(self.node(), self.node()) for _ in range(self.varint())])
+        if tag == _ASSIGN:
+            name = self.string()
+            return AssignmentStatement(name, self.node())
+        if tag == _IF:
+            condition = self.node()
+            then_branch = self.block()
+            return IfStatement(condition, then_branch, self.optional_block())
+        if tag == _WHILE:
+            condition = self.node()
+            return WhileStatement(condition, self.block())
+        if tag == _RETURN:
+            return ReturnStatement(self.node())
+        if tag == _FUNCTION:
+            name = self.string()
+            params = [self.string() for _ in range(self.varint())]
+            return FunctionDeclaration(name, params, self.block())
+        if tag == _PROGRAM:
+            return Program(self.nodes())
+        if tag == _MIRROR:
+            return MirrorStatement(self.node())
+        raise ValueError(f"Corrupt .aksc data: unknown tag {tag}")
+
+
+def loads(data, key=None):
+    """
+    Decode .aksc bytes back into an AST. Returns None when the data is not
+    an .aksc file or, if `key` is given, was written for a different key.
+    Raises ValueError (or whatever decoding trips over) for damaged data.
+    """
+    if data[:4] != MAGIC or (key is not None and data[4:36] != key):
+        return None
+    if len(data) < _HEADER or _CHECKSUM.unpack_from(data, 36)[0] != zlib.crc32(data[_HEADER:]):
+        raise ValueError("Corrupt .aksc data: checksum mismatch")
+    decoder = _Decoder(data, _HEADER)
+    for _ in range(decoder.varint()):
+        length = decoder.varint()
+        decoder.strings.append(data[decoder.pos:decoder.pos + length].decode("utf-8"))
+        decoder.pos += length
+    tree = decoder.node()
+    if type(tree) not in (Program, Block) or decoder.pos != len(data):
+        raise ValueError("Corrupt .aksc data: not a whole program")
+    return tree
+
+
+# ====== Files ======
+
+class AstCache:
+    """
+    Reads and writes .aksc files. With no `cache_dir`, entries go into
+    `__akscache__` beside each source; otherwise into `cache_dir`, named
+    after a hash of the source path so that equal file names don't clash.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, source_path):
+        source_path = os.path.abspath(source_path)
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        if self.cache_dir is None:
+            return os.path.join(os.path.dirname(source_path), CACHE_DIRNAME, stem + SUFFIX)
+        tag = hashlib.sha256(source_path.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{stem}-{tag}{SUFFIX}")
+
+    def load(self, source_path, source, parse):
+        """
+        The AST for `source`, read from the cache when its entry matches
+        and otherwise produced by `parse(source)` and written back.
+        """
+        key = cache_key(source)
+        cache_path = self.path_for(source_path)
+        try:
+            with open(cache_path, "rb") as f:
+                tree = loads(f.read(), key)
+        except Exception:
+            # Unreadable or damaged entries of any kind (including trees
+            # deep enough to hit the recursion limit) are just misses.
+            tree = None
+        if tree is not None:
+            self.hits += 1
+            return tree
+
+        self.misses += 1
+        tree = parse(source)
+        self._write(cache_path, dumps(tree, key))
+        return tree
+
+    @staticmethod
+    def _write(cache_path, data):
+        # A read-only tree just means no caching, as with __pycache__.
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
@@ -0,0 +1,131 @@
+"""
+batch.py — Parallel Batch Runner for Many .aks Scripts
+
+Runs a directory or glob of scripts on a pool of worker processes. Each
+worker imports the interpreter and builds one ExecutionContext with the
+standard library when it starts; every script then runs on a fork of
+that template (see StandardLibrary.fork), so the per-script cost is the
+script itself rather than interpreter startup.
+
+Results stream back as one JSON object per script:
+
+    {"script": "jobs/a.aks", "ok": true, "result": 42, "output": "", "seconds": 0.0012}
+    {"script": "jobs/b.aks", "ok": false, "error": "NameError: ...", "output": "", "seconds": 0.0003}
+
+`output` is whatever the script printed. A script that calls `exit()`
+ends only itself: its record carries `exit_code`, and it counts as ok
+when that code is 0. Scripts are handed out `chunksize` at a time; with
+`ordered` the results come back in script order, otherwise as soon as
+each chunk finishes.
+"""
+
+import contextlib
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aks.execution_context import ExecutionContext
+from aks.interpreter import Interpreter
+from aks.serialize import normalize
+from aks.stdlib import register_standard_library
+
+SUFFIX = ".aks"
+
+# The worker's prepared standard library, built once per process.
+_library = None
+_options = {}
+
+
+def collect_scripts(target):
+    """Sorted .aks paths under a directory, matching a glob, or the one file named."""
+    if os.path.isdir(target):
+        paths = []
+        for root, dirs, files in os.walk(target):
+            dirs.sort()
+            paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(SUFFIX))
+        return paths
+    if os.path.isfile(target):
+        return [target]
+    return sorted(path for path in glob.glob(target, recursive=True) if os.path.isfile(path))
+
+
+def _init_worker(options):
+    global _library, _options
+    _library = register_standard_library(ExecutionContext())
+    _options = options
+
+
+def run_script(path):
+    """Run one script on a fork of the worker's template context; returns its record."""
+    if _library is None:
+        _init_worker(_options)
+    use_cache = _options.get("use_cache", True)
+    interpreter = Interpreter(
+        _library.fork().context,
+        backend=_options.get("backend", "tree"),
+        cache_dir=_options.get("cache_dir"),
+    )
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            result = interpreter.run_file(path, use_cache=use_cache)
+        record = {"script": path, "ok": True, "result": normalize(result)}
+    except SystemExit as e:
+        code = 0 if e.code is None else e.code
+        record = {"script": path, "ok": code == 0, "result": None, "exit_code": code}
+    except Exception as e:
+        # Interpreter errors arrive wrapped; report the underlying one.
+        cause = e.__cause__ or e.__context__ or e
+        record = {"script": path, "ok": False, "error": f"{type(cause).__name__}: {cause}"}
+    record["output"] = output.getvalue()
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def _run_chunk(paths):
+    return [run_script(path) for path in paths]
+
+
+def run_batch(paths, workers=None, chunksize=1, ordered=True, backend="tree",
+              use_cache=True, cache_dir=None):
+    """
+    Yield the record of every script in `paths`. `workers=0` runs them in
+    this process, which is handy for debugging; otherwise a pool of
+    `workers` processes (default: one per CPU) runs them.
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1, got {chunksize}")
+    if workers is not None and workers < 0:
+        raise ValueError(f"workers must not be negative, got {workers}")
+    options = {"backend": backend, "use_cache": use_cache, "cache_dir": cache_dir}
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    if workers == 0:
+        _init_worker(options)
+        for chunk in chunks:
+            yield from _run_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as pool:
+        if ordered:
+            for records in pool.map(_run_chunk, chunks):
+                yield from records
+        else:
+            for future in as_completed([pool.submit(_run_chunk, chunk) for chunk in chunks]):
+                yield from future.result()
+
+
+def write_records(records, sink):
+    """Write each record as a JSON line as it arrives; returns (succeeded, failed)."""
+    succeeded = failed = 0
+    for record in records:
+        sink.write(json.dumps(record, default=str) + "\n")
+        sink.flush()
+        if record["ok"]:
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
@@ -0,0 +1,7 @@
+"""
+bench — AkshayaLang Performance Benchmarks
+
+Each module is runnable on its own, e.g. `python -m aks.bench.lexer`.
+`aks bench` (see suite.py) runs them all as one suite with statistics,
+JSON results and regression comparison.
+"""
@@ -0,0 +1,61 @@
+"""
+backends.py — Execution Backend Benchmark
+
+Runs the same loop-heavy scripts on every Interpreter backend.
+
+Usage:
+    python -m aks.bench.backends [--iterations N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from aks.interpreter import BACKENDS, Interpreter
+
+SCRIPTS = {
+    "arith_loop": """
+        bind i to 0
+        bind total to 0
+        while i < {n} {{
+            bind total to total + i * 2 - 1
+            bind i to i + 1
+        }}
+        total
+    """,
+    "fib": """
+        fn fib(n) {{ if n < 2 {{ return n }} return fib(n - 1) + fib(n - 2) }}
+        fib({depth})
+    """,
+}
+
+
+def measure(backend, source, repeat=3):
+    """Best wall time in seconds for running `source` on `backend`."""
+    best = float("inf")
+    for _ in range(repeat):
+        interpreter = Interpreter(backend=backend)
+        start = time.perf_counter()
+        interpreter.run(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AkshayaLang backend benchmark")
+    parser.add_argument("--iterations", type=int, default=100_000, help="Loop iterations for arith_loop")
+    parser.add_argument("--depth", type=int, default=20, help="Argument for fib")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    parser.add_argument("--backend", action="append", choices=BACKENDS, help="Backends to run (default: all)")
+    args = parser.parse_args(argv)
+
+    for name, template in SCRIPTS.items():
+        source = template.format(n=args.iterations, depth=args.depth)
+        baseline = None
+        for backend in args.backend or BACKENDS:
+            seconds = measure(backend, source, args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:12} {backend:10} {seconds:8.3f}s  x{baseline / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+calls.py — Function Call Overhead Benchmark
+
+Times a loop of user function calls on the tree backend and counts the
+memory blocks each live activation holds, which is sampled with
+`sys.getallocatedblocks()` at the bottom of a recursion.
+
+Usage:
+    python -m aks.bench.calls [--calls N] [--depth N]
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+from aks.interpreter import Interpreter
+
+CALL_LOOP = """
+    fn f(x) {{ return x }}
+    bind i to 0
+    while i < {calls} {{
+        f(i)
+        bind i to i + 1
+    }}
+"""
+
+DIVE = """
+    fn dive(n) {{ if n == 0 {{ return probe() }} return dive(n - 1) }}
+    dive({depth})
+"""
+
+
+def time_calls(calls):
+    """Wall time in seconds for `calls` user function calls."""
+    interpreter = Interpreter()
+    start = time.perf_counter()
+    interpreter.run(CALL_LOOP.format(calls=calls))
+    return time.perf_counter() - start
+
+
+def blocks_per_activation(depth):
+    """Allocated memory blocks held by each live function activation."""
+    interpreter = Interpreter()
+    interpreter.context.define_function("probe", sys.getallocatedblocks)
+    gc.disable()
+    try:
+        shallow = interpreter.run(DIVE.format(depth=0))
+        deep = interpreter.run(DIVE.format(depth=depth))
+    finally:
+        gc.enable()
+    return (deep - shallow) / depth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AkshayaLang call overhead benchmark")
+    parser.add_argument("--calls", type=int, default=1_000_000, help="Number of timed calls")
+    parser.add_argument("--depth", type=int, default=50, help="Recursion depth for block counting")
+    args = parser.parse_args(argv)
+
+    print(f"blocks/activation  {blocks_per_activation(args.depth):8.1f}")
+    seconds = time_calls(args.calls)
+    print(f"{args.calls} calls   {seconds:8.3f}s  ({args.calls / seconds:,.0f} calls/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+lexer.py — Tokenizer Throughput Benchmark
+
+Usage:
+    python -m aks.bench.lexer [--size BYTES] [--repeat N]
+"""
+
+import argparse
+import time
+
+from aks.lexer import tokenize
+
+SAMPLE_LINES = (
+    'bind total_count to (alpha + 12.5) * beta / 3\n',
+    'bind label to "sovereign vessel"\n',
+    'fn scale(x, factor) { return x * factor }\n',
+    'if ready { mirror { name: "akshaya", depth: 108 } }\n',
+)
+
+
+def generate_source(size):
+    """Build a synthetic .aks source of roughly `size` bytes."""
+    chunk = "".join(SAMPLE_LINES)
+    return chunk * max(1, size // len(chunk))
+
+
+def measure(source, repeat=3):
+    """Return (token_count, best_seconds) over `repeat` runs."""
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(tokenize(source))
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AkshayaLang lexer throughput benchmark")
+    parser.add_argument("--size", type=int, default=2_000_000, help="Source size in bytes")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    args = parser.parse_args(argv)
+
+    source = generate_source(args.size)
+    count, seconds = measure(source, args.repeat)
+    print(f"lexer: {len(source)} bytes, {count} tokens in {seconds:.3f}s "
+          f"-> {count / seconds:,.0f} tokens/sec")
+
+
+if __name__ == "__main__":
+    main()
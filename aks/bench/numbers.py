@@ -0,0 +1,67 @@
+"""
+numbers.py — Numeric Representation Benchmark
+
+Times a counting loop whose literals are integers against the same loop
+written with float literals, on each backend, and measures equality,
+hashing and construction of the boxed values in aks.types.
+
+Usage:
+    python -m aks.bench.numbers [--iterations N] [--repeat N]
+"""
+
+import argparse
+import timeit
+
+from aks.interpreter import Interpreter, BACKENDS
+from aks.types import AKSNumber, AKSBoolean
+
+LOOP = """
+    bind total to {zero}
+    bind i to {zero}
+    while i < {iterations} {{
+        total = total + i % {seven}
+        i = i + {one}
+    }}
+    total
+"""
+
+INT_LITERALS = {"zero": "0", "one": "1", "seven": "7"}
+FLOAT_LITERALS = {"zero": "0.0", "one": "1.0", "seven": "7.0"}
+
+
+def time_loop(literals, iterations, repeat, **options):
+    """Best wall time in seconds for the counting loop with the given literals."""
+    code = LOOP.format(iterations=iterations, **literals)
+    return min(timeit.repeat(lambda: Interpreter(**options).run(code), number=1, repeat=repeat))
+
+
+def time_boxed(number):
+    """Seconds for `number` equality checks, hashes and boolean constructions."""
+    a, b = AKSNumber(1), AKSNumber(1)
+    return {
+        "AKSNumber ==": timeit.timeit(lambda: a == b, number=number),
+        "hash(AKSNumber)": timeit.timeit(lambda: hash(a), number=number),
+        "AKSBoolean(x)": timeit.timeit(lambda: AKSBoolean(True), number=number),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AkshayaLang numeric representation benchmark")
+    parser.add_argument("--iterations", type=int, default=200_000, help="Loop iterations")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept")
+    args = parser.parse_args(argv)
+
+    configurations = [(backend, {"backend": backend}) for backend in BACKENDS]
+    configurations.append(("tree+specialize", {"specialize": True}))
+    print(f"{'backend':<16} {'int':>9} {'float':>9}")
+    for name, options in configurations:
+        ints = time_loop(INT_LITERALS, args.iterations, args.repeat, **options)
+        floats = time_loop(FLOAT_LITERALS, args.iterations, args.repeat, **options)
+        print(f"{name:<16} {ints:8.3f}s {floats:8.3f}s")
+
+    for name, seconds in time_boxed(args.iterations).items():
+        print(f"{name:<16} {seconds / args.iterations * 1e9:8.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
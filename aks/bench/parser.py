@@ -0,0 +1,69 @@
+"""
+parser.py — Parser Throughput Benchmark
+
+Usage:
+    python -m aks.bench.parser [--size BYTES] [--repeat N]
+"""
+
+import argparse
+import time
+
+from aks.ast import ASTNode
+from aks.lexer import tokenize_stream
+from aks.parser import Parser
+
+SAMPLE_LINES = (
+    'bind total_count to (alpha + 12.5) * beta / 3 - gamma\n',
+    'bind label to "sovereign vessel"\n',
+    'fn scale(x, factor) { bind y to x * factor return y + 1 }\n',
+    'if ready { mirror { name: "akshaya", depth: 108 } } else { bind ready to 1 }\n',
+    'while n { bind n to n - 1 }\n',
+)
+
+
+def generate_source(size):
+    """Build a synthetic .aks source of roughly `size` bytes."""
+    chunk = "".join(SAMPLE_LINES)
+    return chunk * max(1, size // len(chunk))
+
+
+def count_nodes(root):
+    """Count every AST node reachable from `root`."""
+    count = 0
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ASTNode):
+            count += 1
+            stack.extend(vars(item).values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return count
+
+
+def measure(source, repeat=3):
+    """Return (node_count, best_seconds) for parsing a pre-lexed `source`."""
+    tokens = tokenize_stream(source)
+    best = float("inf")
+    tree = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tree = Parser(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    return count_nodes(tree), best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AkshayaLang parser throughput benchmark")
+    parser.add_argument("--size", type=int, default=500_000, help="Source size in bytes")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    args = parser.parse_args(argv)
+
+    source = generate_source(args.size)
+    count, seconds = measure(source, args.repeat)
+    print(f"parser: {len(source)} bytes, {count} nodes in {seconds:.3f}s "
+          f"-> {count / seconds:,.0f} nodes/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+scopes.py — Variable Lookup Depth Benchmark
+
+Reads a global at the bottom of a deep recursion, with and without the
+static resolver. Dynamic lookups walk one context per call frame, while
+resolved lookups cost the same at any depth.
+
+Usage:
+    python -m aks.bench.scopes [--depth N] [--reads N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from aks.interpreter import Interpreter
+
+SCRIPT = """
+    bind g to 1
+    fn read(k) {{
+        bind total to 0
+        while k > 0 {{
+            bind total to total + g
+            bind k to k - 1
+        }}
+        return total
+    }}
+    fn dive(n) {{ if n == 0 {{ return read({reads}) }} return dive(n - 1) }}
+    dive({depth})
+"""
+
+
+def measure(source, resolve, repeat=3):
+    """Best wall time in seconds for running `source` on the tree backend."""
+    best = float("inf")
+    for _ in range(repeat):
+        interpreter = Interpreter(resolve=resolve)
+        start = time.perf_counter()
+        interpreter.run(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AkshayaLang variable lookup benchmark")
+    parser.add_argument("--depth", type=int, default=80, help="Call depth at which variables are read")
+    parser.add_argument("--reads", type=int, default=20_000, help="Loop iterations at the bottom")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs")
+    args = parser.parse_args(argv)
+
+    source = SCRIPT.format(depth=args.depth, reads=args.reads)
+    dynamic = measure(source, resolve=False, repeat=args.repeat)
+    resolved = measure(source, resolve=True, repeat=args.repeat)
+    print(f"dynamic   {dynamic:8.3f}s")
+    print(f"resolved  {resolved:8.3f}s  x{dynamic / resolved:.2f}")
+
+
+if __name__ == "__main__":
+    main()
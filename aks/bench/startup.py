@@ -0,0 +1,146 @@
+"""
+startup.py — Script Startup Latency Benchmark
+
+Compares the wall time of running a trivial script with a cold
+`python -m akshayalang.cli run` against the thin fork server client
+`python -m aks.forkserver connect`. Each run is a fresh subprocess, so
+the numbers include Python's own startup. A fork server on a temporary
+socket is started for the duration of the benchmark.
+
+`profile_startup` (behind `aks --startup-profile`) measures the time a
+cold run takes to reach the first statement of a script, and breaks the
+imports down with `python -X importtime`. STARTUP_BUDGET is the limit
+tests/test_startup.py holds it to.
+
+Usage:
+    python -m aks.bench.startup [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT = 'bind answer to 6 * 7\nanswer\n'
+# Exits at its first statement, so the run time is the time to get there.
+FIRST_STATEMENT = "exit()\n"
+# Seconds from process start to the first statement of a cold `aks run`.
+STARTUP_BUDGET = 0.25
+
+
+def _environment(socket_path=None):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    environment = dict(os.environ)
+    if socket_path is not None:
+        environment["AKS_FORK_SERVER"] = socket_path
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [root, environment.get("PYTHONPATH")]))
+    return environment
+
+
+def time_command(command, runs, environment):
+    """Wall times in seconds of `runs` executions of `command`."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=environment, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _wait_for(path, server, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if server.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("fork server did not start")
+        time.sleep(0.01)
+
+
+def compare_startup(runs):
+    """{"cold": times, "forkserver": times} for running SCRIPT `runs` times each way."""
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "startup.aks")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(SCRIPT)
+        socket_path = os.path.join(directory, "aks.sock")
+        environment = _environment(socket_path)
+
+        cold = time_command([sys.executable, "-m", "akshayalang.cli", "run", "--no-cache", script],
+                            runs, environment)
+        server = subprocess.Popen([sys.executable, "-m", "aks.forkserver", "serve"],
+                                  env=environment, stderr=subprocess.DEVNULL)
+        try:
+            _wait_for(socket_path, server)
+            warm = time_command([sys.executable, "-m", "aks.forkserver", "connect", script],
+                                runs, environment)
+        finally:
+            server.terminate()
+            server.wait()
+    return {"cold": cold, "forkserver": warm}
+
+
+def parse_importtime(text):
+    """(module, self seconds, cumulative seconds, depth) for each line of `-X importtime` output."""
+    imports = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # the header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6, depth))
+    return imports
+
+
+def profile_startup(runs=5):
+    """
+    {"seconds": fastest of `runs` cold runs to the first statement,
+     "imports": parse_importtime of one more run under -X importtime}.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "first.aks")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(FIRST_STATEMENT)
+        environment = _environment()
+        command = ["-m", "akshayalang.cli", "run", "--no-cache", script]
+        seconds = min(time_command([sys.executable] + command, runs, environment))
+        traced = subprocess.run([sys.executable, "-X", "importtime"] + command, env=environment,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True,
+                                universal_newlines=True)
+    return {"seconds": seconds, "imports": parse_importtime(traced.stderr)}
+
+
+def startup_report(profile, top=15):
+    """The time to first statement against the budget, and the `top` slowest imports."""
+    imports = profile["imports"]
+    total = sum(cumulative for _, _, cumulative, depth in imports if depth == 0)
+    rows = [
+        f"time to first statement  {profile['seconds'] * 1000:8.1f} ms  "
+        f"(budget {STARTUP_BUDGET * 1000:.0f} ms)",
+        f"imports, traced run      {total * 1000:8.1f} ms  ({len(imports)} modules)",
+        "",
+        f"{'cumulative ms':>14} {'self ms':>9}  module",
+    ]
+    for name, own, cumulative, depth in sorted(imports, key=lambda row: row[2], reverse=True)[:top]:
+        rows.append(f"{cumulative * 1000:14.1f} {own * 1000:9.1f}  {'  ' * depth}{name}")
+    return "\n".join(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AkshayaLang startup latency benchmark")
+    parser.add_argument("--runs", type=int, default=20, help="Runs of each command")
+    args = parser.parse_args(argv)
+
+    results = compare_startup(args.runs)
+    for name, times in results.items():
+        print(f"{name:<12} median {statistics.median(times) * 1000:8.1f} ms  "
+              f"min {min(times) * 1000:8.1f} ms")
+    speedup = statistics.median(results["cold"]) / statistics.median(results["forkserver"])
+    print(f"fork server is x{speedup:.1f} faster to first result")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+suite.py — Benchmark Suite and Regression Harness
+
+Runs every registered benchmark with warmup runs and timed repeats, and
+records the statistics as JSON so that two results files can be
+compared. The lexer, parser, backend, scope and call benchmarks reuse
+the generators and scripts of their stand-alone modules.
+
+Usage:
+    aks bench [--filter TEXT] [--repeat N] [--warmup N] [--scale X] [--output FILE]
+    aks bench --compare BASELINE.json [CURRENT.json] [--threshold 0.1]
+
+With only a baseline, `--compare` runs the suite and compares against it.
+The exit status is 1 when any benchmark's median time grew by more than
+the threshold.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+
+import aks
+from aks.bench import backends, calls, lexer, parser, scopes
+from aks.execution_context import ExecutionContext
+from aks.interpreter import Interpreter
+from aks.lexer import tokenize, tokenize_stream
+from aks.parser import Parser
+from aks.stdlib import register_standard_library
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.10
+
+# name -> case(scale), which returns (run, work, unit): `run()` is timed and
+# processes `work` units each time, for throughput.
+SUITE = {}
+
+
+def benchmark(name):
+    def register(case):
+        SUITE[name] = case
+        return case
+    return register
+
+
+def _interpreter(**options):
+    context = ExecutionContext()
+    register_standard_library(context)
+    return Interpreter(context, **options)
+
+
+def _script(source, **options):
+    return lambda: _interpreter(**options).run(source)
+
+
+def _count(n, scale):
+    return max(1, int(n * scale))
+
+
+# ====== Front end ======
+
+@benchmark("lexer.tokenize")
+def _lexer(scale):
+    source = lexer.generate_source(_count(2_000_000, scale))
+    return (lambda: tokenize(source)), len(tokenize(source)), "tokens"
+
+
+@benchmark("parser.parse")
+def _parser(scale):
+    tokens = tokenize_stream(parser.generate_source(_count(500_000, scale)))
+    return (lambda: Parser(tokens).parse()), parser.count_nodes(Parser(tokens).parse()), "nodes"
+
+
+# ====== Runtime ======
+
+@benchmark("runtime.arith_loop")
+def _arith_loop(scale):
+    n = _count(100_000, scale)
+    return _script(backends.SCRIPTS["arith_loop"].format(n=n)), n, "iterations"
+
+
+@benchmark("runtime.fib")
+def _fib(scale):
+    # fib(n) makes about 1.618**n calls, so depth grows with the log of the scale.
+    depth = max(2, 20 + round(math.log(scale) / math.log(1.618)))
+    work = 2 * round(1.618 ** depth / math.sqrt(5)) - 1
+    return _script(backends.SCRIPTS["fib"].format(depth=depth)), work, "calls"
+
+
+COLLECTIONS = """
+    bind items to []
+    bind table to {{}}
+    bind i to 0
+    while i < {n} {{
+        items = conj(items, [i, {{value: i}}])
+        table = assoc(table, i, i * 2)
+        i = i + 1
+    }}
+    len(items) + len(table)
+"""
+
+
+@benchmark("runtime.collections")
+def _collections(scale):
+    n = _count(20_000, scale)
+    return _script(COLLECTIONS.format(n=n)), n, "iterations"
+
+
+CONCAT = """
+    bind text to ""
+    bind i to 0
+    while i < {n} {{
+        text = text + "line of text "
+        i = i + 1
+    }}
+    len(text)
+"""
+
+
+@benchmark("runtime.string_concat")
+def _string_concat(scale):
+    n = _count(50_000, scale)
+    return _script(CONCAT.format(n=n)), n, "iterations"
+
+
+@benchmark("runtime.scope_lookup")
+def _scope_lookup(scale):
+    reads = _count(20_000, scale)
+    return _script(scopes.SCRIPT.format(depth=80, reads=reads)), reads, "reads"
+
+
+BUILTIN_LOOP = """
+    bind i to 0
+    bind total to 0
+    while i < {n} {{
+        total = total + len("akshaya") + int(i)
+        i = i + 1
+    }}
+    total
+"""
+
+
+@benchmark("runtime.builtin_calls")
+def _builtin_calls(scale):
+    n = _count(50_000, scale)
+    return _script(BUILTIN_LOOP.format(n=n)), 2 * n, "calls"
+
+
+@benchmark("runtime.user_calls")
+def _user_calls(scale):
+    n = _count(200_000, scale)
+    return _script(calls.CALL_LOOP.format(calls=n)), n, "calls"
+
+
+# ====== Measurement ======
+
+def measure(run, warmup=1, repeat=5):
+    """Wall times in seconds of `repeat` runs after `warmup` untimed ones."""
+    for _ in range(warmup):
+        run()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarize(times, work, unit):
+    median = statistics.median(times)
+    return {
+        "runs": times,
+        "min": min(times),
+        "max": max(times),
+        "mean": statistics.mean(times),
+        "median": median,
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "work": work,
+        "unit": unit,
+        "throughput": work / median if median else None,
+    }
+
+
+def run_suite(names=None, warmup=1, repeat=5, scale=1.0, report=None):
+    """
+    Results for the benchmarks in `names` (default: all), as a dict ready
+    for JSON. `report`, if given, is called with each name and summary.
+    """
+    results = {}
+    for name in SUITE if names is None else names:
+        run, work, unit = SUITE[name](scale)
+        results[name] = summarize(measure(run, warmup, repeat), work, unit)
+        if report is not None:
+            report(name, results[name])
+    return {
+        "version": RESULTS_VERSION,
+        "aks": aks.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "settings": {"warmup": warmup, "repeat": repeat, "scale": scale},
+        "benchmarks": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Rows of (name, baseline median, current median, ratio, status) for two
+    results dicts. Status is "regression" or "improvement" when the median
+    moved by more than `threshold`, "ok" otherwise, and "added"/"removed"
+    for benchmarks only one side has.
+    """
+    old = baseline["benchmarks"]
+    new = current["benchmarks"]
+    rows = []
+    for name in list(old) + [name for name in new if name not in old]:
+        if name not in new:
+            rows.append((name, old[name]["median"], None, None, "removed"))
+            continue
+        if name not in old:
+            rows.append((name, None, new[name]["median"], None, "added"))
+            continue
+        ratio = new[name]["median"] / old[name]["median"]
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, old[name]["median"], new[name]["median"], ratio, status))
+    return rows
+
+
+# ====== Command line ======
+
+def _print_result(name, result):
+    spread = result["stdev"] / result["mean"] * 100 if result["mean"] else 0.0
+    print(f"{name:<24} {result['median'] * 1000:10.2f} ms  ±{spread:4.1f}%  "
+          f"{result['throughput'] or 0:14,.0f} {result['unit']}/s")
+
+
+def _print_comparison(rows):
+    for name, old, new, ratio, status in rows:
+        old_text = f"{old * 1000:10.2f}" if old is not None else f"{'-':>10}"
+        new_text = f"{new * 1000:10.2f}" if new is not None else f"{'-':>10}"
+        ratio_text = f"x{ratio:.2f}" if ratio is not None else ""
+        print(f"{name:<24} {old_text} ms -> {new_text} ms  {ratio_text:>6}  {status}")
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def add_arguments(argument_parser):
+    argument_parser.add_argument("--filter", help="Only run benchmarks whose name contains TEXT")
+    argument_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    argument_parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before timing")
+    argument_parser.add_argument("--scale", type=float, default=1.0, help="Multiply every workload size")
+    argument_parser.add_argument("--output", metavar="FILE", help="Write results as JSON to FILE")
+    argument_parser.add_argument("--compare", nargs="+", metavar="FILE",
+                                 help="Compare CURRENT.json (or a fresh run) against BASELINE.json")
+    argument_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                 help="Relative slowdown of the median that counts as a regression")
+    argument_parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+
+
+def run_from_args(args):
+    """Carry out a parsed `aks bench` command line; returns the exit status."""
+    if args.list:
+        for name in SUITE:
+            print(name)
+        return 0
+    if args.compare and len(args.compare) > 2:
+        print("--compare takes BASELINE.json and optionally CURRENT.json", file=sys.stderr)
+        return 2
+
+    if args.compare and len(args.compare) == 2:
+        current = _load(args.compare[1])
+    else:
+        names = [name for name in SUITE if not args.filter or args.filter in name]
+        if not names:
+            print(f"no benchmarks match {args.filter!r}", file=sys.stderr)
+            return 2
+        current = run_suite(names, warmup=args.warmup, repeat=args.repeat,
+                            scale=args.scale, report=_print_result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if not args.compare:
+        return 0
+    baseline = _load(args.compare[0])
+    if args.filter:
+        baseline["benchmarks"] = {
+            name: result for name, result in baseline["benchmarks"].items() if args.filter in name
+        }
+    rows = compare(baseline, current, args.threshold)
+    print()
+    _print_comparison(rows)
+    return 1 if any(row[4] == "regression" for row in rows) else 0
+
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(prog="aks bench", description="AkshayaLang benchmark suite")
+    add_arguments(argument_parser)
+    return run_from_args(argument_parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+"""
+bytecode.py — AkshayaLang Instruction Set and Bytecode Compiler
+
+Every instruction is two ints, (opcode, argument), packed into an
+`array('i')`. Jump targets are absolute instruction offsets into that
+array. Each statement leaves exactly one value on the stack, which
+mirrors how Block.evaluate returns the value of its last statement.
+
+Function parameters and names bound inside a function body live in
+numbered local slots. Every other name resolves against the globals of
+the ExecutionContext the VM runs in, except that scoping is dynamic as in
+the tree walker: a function reading a name that some function in the
+program binds locally uses LOAD_DYNAMIC(_CALLABLE), which looks for it
+among the locals of the active calls first. Names no function binds,
+such as the program's functions calling each other, stay LOAD_GLOBAL.
+"""
+
+import sys
+from array import array
+from enum import IntEnum
+
+from aks.errors import CompileError
+from aks.ast import (
+    NumberLiteral, StringLiteral, BooleanLiteral, ListLiteral, DictLiteral,
+    Identifier, BinaryExpression, UnaryExpression, IndexExpression,
+    BindStatement, AssignmentStatement, IfStatement, WhileStatement,
+    ReturnStatement, FunctionDeclaration, FunctionCall, Block, Program,
+    MirrorStatement
+)
+from aks.resolver import bound_names, dynamic_names
+
+
+class Op(IntEnum):
+    LOAD_CONST = 1
+    LOAD_LOCAL = 2
+    STORE_LOCAL = 3
+    LOAD_GLOBAL = 4
+    STORE_GLOBAL = 5
+    LOAD_CALLABLE = 6
+    POP = 7
+    DUP = 8
+
+    ADD = 10
+    SUB = 11
+    MUL = 12
+    DIV = 13
+    MOD = 14
+    EQ = 15
+    NE = 16
+    LT = 17
+    GT = 18
+    LE = 19
+    GE = 20
+    NEG = 21
+    NOT = 22
+
+    JUMP = 30
+    JUMP_IF_FALSE = 31
+    JUMP_IF_FALSE_OR_POP = 32
+    JUMP_IF_TRUE_OR_POP = 33
+
+    BUILD_LIST = 40
+    BUILD_DICT = 41
+    INDEX = 42
+    MIRROR = 43
+
+    MAKE_FUNCTION = 50
+    CALL = 51
+    RETURN_VALUE = 52
+    TAIL_CALL = 53
+    LOAD_DYNAMIC = 54
+    LOAD_DYNAMIC_CALLABLE = 55
+
+
+BINARY_OPCODES = {
+    '+': Op.ADD, '-': Op.SUB, '*': Op.MUL, '/': Op.DIV, '%': Op.MOD,
+    '==': Op.EQ, '!=': Op.NE, '<': Op.LT, '>': Op.GT, '<=': Op.LE, '>=': Op.GE,
+}
+
+# Opcodes whose argument is an index into a code object table, for the disassembler.
+_CONST_ARGS = {Op.LOAD_CONST, Op.MAKE_FUNCTION}
+_NAME_ARGS = {Op.LOAD_GLOBAL, Op.STORE_GLOBAL, Op.LOAD_CALLABLE, Op.LOAD_DYNAMIC, Op.LOAD_DYNAMIC_CALLABLE}
+_LOCAL_ARGS = {Op.LOAD_LOCAL, Op.STORE_LOCAL}
+_JUMP_ARGS = {Op.JUMP, Op.JUMP_IF_FALSE, Op.JUMP_IF_FALSE_OR_POP, Op.JUMP_IF_TRUE_OR_POP}
+
+
+class CodeObject:
+    """Compiled body of a program or function."""
+
+    __slots__ = ("name", "params", "code", "consts", "names", "local_names", "local_index", "body", "dynamic")
+
+    def __init__(self, name, params, code, consts, names, local_names, body=None, dynamic=False):
+        self.name = name
+        self.params = tuple(params)
+        self.code = code
+        self.consts = tuple(consts)
+        self.names = tuple(names)
+        self.local_names = tuple(local_names)
+        self.local_index = {local: slot for slot, local in enumerate(self.local_names)}
+        # The function's AST, for memoize's purity check.
+        self.body = body
+        # Whether its program has dynamically scoped names, so that tail
+        # calls must keep the replaced frame's locals visible.
+        self.dynamic = dynamic
+
+    @property
+    def nlocals(self):
+        return len(self.local_names)
+
+    def __repr__(self):
+        return f"<CodeObject {self.name} instructions={len(self.code) // 2}>"
+
+
+class _Scope:
+    """Name tables for the code object being emitted."""
+
+    def __init__(self, name, params, local_names=None, body=None, dynamic=False):
+        self.name = name
+        self.params = params
+        self.body = body
+        self.dynamic = dynamic
+        self.code = array("i")
+        self.consts = []
+        self._const_index = {}
+        self.names = []
+        self._name_index = {}
+        self.locals = None
+        if local_names is not None:
+            self.locals = {local: slot for slot, local in enumerate(local_names)}
+
+    def const(self, value):
+        key = (value.__class__, value) if not isinstance(value, CodeObject) else (CodeObject, id(value))
+        index = self._const_index.get(key)
+        if index is None:
+            index = self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return index
+
+    def name_index(self, name):
+        index = self._name_index.get(name)
+        if index is None:
+            index = self._name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def finish(self):
+        local_names = sorted(self.locals, key=self.locals.get) if self.locals is not None else ()
+        return CodeObject(self.name, self.params, self.code, self.consts, self.names, local_names,
+                          self.body, self.dynamic)
+
+
+class BytecodeCompiler:
+    """Compiles AST nodes into CodeObjects."""
+
+    def __init__(self):
+        self._scope = None
+        self._dynamic_names = frozenset()
+        self._dispatch = {
+            NumberLiteral: self._compile_literal,
+            StringLiteral: self._compile_literal,
+            BooleanLiteral: self._compile_literal,
+            ListLiteral: self._compile_list,
+            DictLiteral: self._compile_dict,
+            Identifier: self._compile_identifier,
+            BinaryExpression: self._compile_binary,
+            UnaryExpression: self._compile_unary,
+            IndexExpression: self._compile_index,
+            BindStatement: self._compile_bind,
+            AssignmentStatement: self._compile_assignment,
+            IfStatement: self._compile_if,
+            WhileStatement: self._compile_while,
+            ReturnStatement: self._compile_return,
+            FunctionDeclaration: self._compile_function,
+            FunctionCall: self._compile_call,
+            Block: self._compile_block,
+            Program: self._compile_block,
+            MirrorStatement: self._compile_mirror,
+        }
+
+    def compile_program(self, block, name="<module>"):
+        self._dynamic_names = dynamic_names(block)
+        self._scope = _Scope(name, (), dynamic=bool(self._dynamic_names))
+        self._compile(block)
+        self._emit(Op.RETURN_VALUE)
+        return self._scope.finish()
+
+    def compile_function(self, name, params, body):
+        outer = self._scope
+        self._scope = _Scope(name, params, bound_names(body, params), body, bool(self._dynamic_names))
+        try:
+            self._compile(body)
+            self._emit(Op.POP)
+            self._emit(Op.LOAD_CONST, self._scope.const(None))
+            self._emit(Op.RETURN_VALUE)
+            return self._scope.finish()
+        finally:
+            self._scope = outer
+
+    # ====== Emission helpers ======
+
+    def _emit(self, op, arg=0):
+        code = self._scope.code
+        code.append(op)
+        code.append(arg)
+        return len(code) - 2
+
+    def _patch(self, at):
+        """Point the jump at offset `at` to the next instruction."""
+        self._scope.code[at + 1] = len(self._scope.code)
+
+    def _compile(self, node):
+        handler = self._dispatch.get(type(node))
+        if handler is None:
+            raise CompileError(f"Cannot compile {type(node).__name__} to bytecode")
+        handler(node)
+
+    def _load_name(self, name):
+        scope = self._scope
+        if scope.locals is not None and name in scope.locals:
+            self._emit(Op.LOAD_LOCAL, scope.locals[name])
+        elif scope.locals is not None and name in self._dynamic_names:
+            self._emit(Op.LOAD_DYNAMIC, scope.name_index(name))
+        else:
+            self._emit(Op.LOAD_GLOBAL, scope.name_index(name))
+
+    def _store_name(self, name):
+        scope = self._scope
+        if scope.locals is not None and name in scope.locals:
+            self._emit(Op.STORE_LOCAL, scope.locals[name])
+        else:
+            self._emit(Op.STORE_GLOBAL, scope.name_index(name))
+
+    # ====== Node handlers ======
+
+    def _compile_literal(self, node):
+        self._emit(Op.LOAD_CONST, self._scope.const(node.value))
+
+    def _compile_list(self, node):
+        for element in node.elements:
+            self._compile(element)
+        self._emit(Op.BUILD_LIST, len(node.elements))
+
+    def _compile_dict(self, node):
+        for key, value in node.pairs:
+            self._compile(key)
+            self._compile(value)
+        self._emit(Op.BUILD_DICT, len(node.pairs))
+
+    def _compile_identifier(self, node):
+        self._load_name(node.name)
+
+    def _compile_binary(self, node):
+        self._compile(node.left)
+        if node.operator in ('and', 'or'):
+            op = Op.JUMP_IF_FALSE_OR_POP if node.operator == 'and' else Op.JUMP_IF_TRUE_OR_POP
+            jump = self._emit(op)
+            self._compile(node.right)
+            self._patch(jump)
+            return
+        opcode = BINARY_OPCODES.get(node.operator)
+        if opcode is None:
+            raise CompileError(f"Unsupported operator '{node.operator}'")
+        self._compile(node.right)
+        self._emit(opcode)
+
+    def _compile_unary(self, node):
+        self._compile(node.operand)
+        if node.operator == '-':
+            self._emit(Op.NEG)
+        elif node.operator == 'not':
+            self._emit(Op.NOT)
+        else:
+            raise CompileError(f"Unknown unary operator {node.operator}")
+
+    def _compile_index(self, node):
+        self._compile(node.target)
+        self._compile(node.index)
+        self._emit(Op.INDEX)
+
+    def _compile_bind(self, node):
+        self._compile(node.expression)
+        self._emit(Op.DUP)
+        self._store_name(node.identifier.name)
+
+    def _compile_assignment(self, node):
+        self._compile(node.expression)
+        self._emit(Op.DUP)
+        self._store_name(node.name)
+
+    def _compile_if(self, node):
+        self._compile(node.condition)
+        to_else = self._emit(Op.JUMP_IF_FALSE)
+        self._compile(node.then_branch)
+        to_end = self._emit(Op.JUMP)
+        self._patch(to_else)
+        if node.else_branch is not None:
+            self._compile(node.else_branch)
+        else:
+            self._emit(Op.LOAD_CONST, self._scope.const(None))
+        self._patch(to_end)
+
+    def _compile_while(self, node):
+        # The stack holds the last body value (initially None) across iterations.
+        self._emit(Op.LOAD_CONST, self._scope.const(None))
+        top = len(self._scope.code)
+        self._compile(node.condition)
+        to_end = self._emit(Op.JUMP_IF_FALSE)
+        self._emit(Op.POP)
+        self._compile(node.body)
+        self._emit(Op.JUMP, top)
+        self._patch(to_end)
+
+    def _compile_return(self, node):
+        if node.tail_call and self._scope.locals is not None:
+            # TAIL_CALL replaces the running frame for VM functions; other
+            # callees leave their result for the RETURN_VALUE that follows.
+            self._compile_callee(node.value)
+            self._emit(Op.TAIL_CALL, len(node.value.arguments))
+        else:
+            self._compile(node.value)
+        self._emit(Op.RETURN_VALUE)
+
+    def _compile_function(self, node):
+        code = self.compile_function(node.name, node.params, node.body)
+        self._emit(Op.MAKE_FUNCTION, self._scope.const(code))
+        self._store_name(node.name)
+        self._emit(Op.LOAD_CONST, self._scope.const(None))
+
+    def _compile_call(self, node):
+        self._compile_callee(node)
+        self._emit(Op.CALL, len(node.arguments))
+
+    def _compile_callee(self, node):
+        """Push the callee and then the arguments of a call."""
+        if isinstance(node.callee, Identifier):
+            scope = self._scope
+            if scope.locals is not None and node.callee.name in scope.locals:
+                self._emit(Op.LOAD_LOCAL, scope.locals[node.callee.name])
+            elif scope.locals is not None and node.callee.name in self._dynamic_names:
+                self._emit(Op.LOAD_DYNAMIC_CALLABLE, scope.name_index(node.callee.name))
+            else:
+                self._emit(Op.LOAD_CALLABLE, scope.name_index(node.callee.name))
+        else:
+            self._compile(node.callee)
+        for argument in node.arguments:
+            self._compile(argument)
+
+    def _compile_block(self, node):
+        if not node.statements:
+            self._emit(Op.LOAD_CONST, self._scope.const(None))
+            return
+        *leading, last = node.statements
+        for statement in leading:
+            self._compile_for_effect(statement)
+        self._compile(last)
+
+    def _compile_for_effect(self, node):
+        """Compile a statement whose value is discarded, leaving the stack unchanged."""
+        if isinstance(node, BindStatement):
+            self._compile(node.expression)
+            self._store_name(node.identifier.name)
+        elif isinstance(node, AssignmentStatement):
+            self._compile(node.expression)
+            self._store_name(node.name)
+        elif isinstance(node, FunctionDeclaration):
+            code = self.compile_function(node.name, node.params, node.body)
+            self._emit(Op.MAKE_FUNCTION, self._scope.const(code))
+            self._store_name(node.name)
+        else:
+            self._compile(node)
+            self._emit(Op.POP)
+
+    def _compile_mirror(self, node):
+        self._compile(node.expression)
+        self._emit(Op.MIRROR)
+
+
+def compile_program(block):
+    """Compile a parsed program into its top-level CodeObject."""
+    return BytecodeCompiler().compile_program(block)
+
+
+def disassemble(code, file=None):
+    """Print a human-readable listing of `code` and every nested function."""
+    file = file or sys.stdout
+    pending = [code]
+    first = True
+    while pending:
+        current = pending.pop(0)
+        if not first:
+            print(file=file)
+        first = False
+        params = ", ".join(current.params)
+        print(f"Disassembly of {current.name}({params}):", file=file)
+        for offset in range(0, len(current.code), 2):
+            op = Op(current.code[offset])
+            arg = current.code[offset + 1]
+            detail = ""
+            if op in _CONST_ARGS:
+                value = current.consts[arg]
+                detail = f"({value.name})" if isinstance(value, CodeObject) else f"({value!r})"
+                if isinstance(value, CodeObject):
+                    pending.append(value)
+            elif op in _NAME_ARGS:
+                detail = f"({current.names[arg]})"
+            elif op in _LOCAL_ARGS:
+                detail = f"({current.local_names[arg]})"
+            elif op in _JUMP_ARGS:
+                detail = f"(to {arg})"
+            print(f"  {offset:>5} {op.name:<22}{arg:>4} {detail}".rstrip(), file=file)
@@ -0,0 +1,377 @@
+"""
+compiler.py — Closure Compiler for AkshayaLang
+
+Compiles an AST once into a tree of specialized Python closures. Each
+closure is built for one node shape with its operator, literal operands
+and child closures already resolved, so running it does no dispatch on
+node types or operator strings.
+"""
+
+from aks.types import add
+from aks.persistent import PVector, PMap
+from aks.ast import (
+    Completion, UserFunction, mirror,
+    NumberLiteral, StringLiteral, BooleanLiteral, ListLiteral, DictLiteral,
+    Identifier, BinaryExpression, UnaryExpression, IndexExpression,
+    BindStatement, AssignmentStatement, IfStatement, WhileStatement,
+    ReturnStatement, FunctionDeclaration, FunctionCall, Block, Program,
+    MirrorStatement
+)
+
+
+def _add(left, right):
+    def run(context):
+        value = left(context)
+        # Strings may need to become ropes (see aks.types.add); numbers add inline.
+        if value.__class__ is str:
+            return add(value, right(context))
+        return value + right(context)
+    return run
+
+
+def _add_const(left, k):
+    if k.__class__ is str:
+        return lambda context: add(left(context), k)
+    return lambda context: left(context) + k
+
+
+def _sub(left, right):
+    return lambda context: left(context) - right(context)
+
+
+def _sub_const(left, k):
+    return lambda context: left(context) - k
+
+
+def _mul(left, right):
+    return lambda context: left(context) * right(context)
+
+
+def _mul_const(left, k):
+    return lambda context: left(context) * k
+
+
+def _div(left, right):
+    return lambda context: left(context) / right(context)
+
+
+def _div_const(left, k):
+    return lambda context: left(context) / k
+
+
+def _mod(left, right):
+    return lambda context: left(context) % right(context)
+
+
+def _mod_const(left, k):
+    return lambda context: left(context) % k
+
+
+def _eq(left, right):
+    return lambda context: left(context) == right(context)
+
+
+def _eq_const(left, k):
+    return lambda context: left(context) == k
+
+
+def _ne(left, right):
+    return lambda context: left(context) != right(context)
+
+
+def _ne_const(left, k):
+    return lambda context: left(context) != k
+
+
+def _lt(left, right):
+    return lambda context: left(context) < right(context)
+
+
+def _lt_const(left, k):
+    return lambda context: left(context) < k
+
+
+def _gt(left, right):
+    return lambda context: left(context) > right(context)
+
+
+def _gt_const(left, k):
+    return lambda context: left(context) > k
+
+
+def _le(left, right):
+    return lambda context: left(context) <= right(context)
+
+
+def _le_const(left, k):
+    return lambda context: left(context) <= k
+
+
+def _ge(left, right):
+    return lambda context: left(context) >= right(context)
+
+
+def _ge_const(left, k):
+    return lambda context: left(context) >= k
+
+
+def _and(left, right):
+    return lambda context: left(context) and right(context)
+
+
+def _or(left, right):
+    return lambda context: left(context) or right(context)
+
+
+BINARY_FACTORIES = {
+    '+': _add,
+    '-': _sub,
+    '*': _mul,
+    '/': _div,
+    '%': _mod,
+    '==': _eq,
+    '!=': _ne,
+    '<': _lt,
+    '>': _gt,
+    '<=': _le,
+    '>=': _ge,
+    'and': _and,
+    'or': _or,
+}
+
+# Variants for a literal right operand, which is then captured as a constant.
+CONST_RIGHT_FACTORIES = {
+    '+': _add_const,
+    '-': _sub_const,
+    '*': _mul_const,
+    '/': _div_const,
+    '%': _mod_const,
+    '==': _eq_const,
+    '!=': _ne_const,
+    '<': _lt_const,
+    '>': _gt_const,
+    '<=': _le_const,
+    '>=': _ge_const,
+}
+
+LITERALS = (NumberLiteral, StringLiteral, BooleanLiteral)
+
+
+class CompiledFunction(UserFunction):
+    """A UserFunction whose body has already been compiled to a closure."""
+
+    def __init__(self, params, body, code):
+        super().__init__(params, body)
+        self.code = code
+        self.entry = code
+
+
+RETURN = Completion.RETURN
+TAIL_CALL = Completion.TAIL_CALL
+
+
+def _invoke(func, args, context):
+    if isinstance(func, UserFunction):
+        return func.call(args, context)
+    return func(*args)
+
+
+class Compiler:
+    """Turns AST nodes into closures of the form `code(context) -> value`."""
+
+    def __init__(self):
+        self._dispatch = {
+            NumberLiteral: self._compile_literal,
+            StringLiteral: self._compile_literal,
+            BooleanLiteral: self._compile_literal,
+            ListLiteral: self._compile_list,
+            DictLiteral: self._compile_dict,
+            Identifier: self._compile_identifier,
+            BinaryExpression: self._compile_binary,
+            UnaryExpression: self._compile_unary,
+            IndexExpression: self._compile_index,
+            BindStatement: self._compile_bind,
+            AssignmentStatement: self._compile_assignment,
+            IfStatement: self._compile_if,
+            WhileStatement: self._compile_while,
+            ReturnStatement: self._compile_return,
+            FunctionDeclaration: self._compile_function,
+            FunctionCall: self._compile_call,
+            Block: self._compile_block,
+            Program: self._compile_block,
+            MirrorStatement: self._compile_mirror,
+        }
+
+    def compile(self, node):
+        handler = self._dispatch.get(type(node))
+        if handler is None:
+            # Unknown node shapes still run, through their own evaluate().
+            return node.evaluate
+        return handler(node)
+
+    def _compile_literal(self, node):
+        value = node.value
+        return lambda context: value
+
+    def _compile_list(self, node):
+        if node.constant_elements is not None:
+            # Vectors are immutable, so every evaluation can share one.
+            constant = PVector(node.constant_elements)
+            return lambda context: constant
+        elements = [self.compile(el) for el in node.elements]
+        return lambda context: PVector([el(context) for el in elements])
+
+    def _compile_dict(self, node):
+        if node.const_keys is not None:
+            keys = node.const_keys
+            values = [self.compile(v) for _, v in node.pairs]
+            return lambda context: PMap(zip(keys, [v(context) for v in values]))
+        pairs = [(self.compile(k), self.compile(v)) for k, v in node.pairs]
+        return lambda context: PMap([(k(context), v(context)) for k, v in pairs])
+
+    def _compile_identifier(self, node):
+        name = node.name
+
+        def run(context):
+            # Probe the innermost scope inline; fall back to the full chain walk.
+            variables = context.variables
+            if name in variables:
+                return variables[name]
+            return context.get_variable(name)
+        return run
+
+    def _compile_binary(self, node):
+        if type(node.right) in LITERALS and node.operator in CONST_RIGHT_FACTORIES:
+            return CONST_RIGHT_FACTORIES[node.operator](self.compile(node.left), node.right.value)
+        factory = BINARY_FACTORIES.get(node.operator)
+        if factory is None:
+            raise ValueError(f"Unsupported operator '{node.operator}'")
+        return factory(self.compile(node.left), self.compile(node.right))
+
+    def _compile_unary(self, node):
+        operand = self.compile(node.operand)
+        if node.operator == '-':
+            return lambda context: -operand(context)
+        if node.operator == 'not':
+            return lambda context: not operand(context)
+        raise ValueError(f"Unknown unary operator {node.operator}")
+
+    def _compile_index(self, node):
+        target = self.compile(node.target)
+        index = self.compile(node.index)
+
+        def run(context):
+            container = target(context)
+            key = index(context)
+            if isinstance(key, float) and key.is_integer():
+                key = int(key)
+            return container[key]
+        return run
+
+    def _compile_bind(self, node):
+        name = node.identifier.name
+        expression = self.compile(node.expression)
+
+        def run(context):
+            value = context.variables[name] = expression(context)
+            return value
+        return run
+
+    def _compile_assignment(self, node):
+        name = node.name
+        expression = self.compile(node.expression)
+
+        def run(context):
+            value = context.variables[name] = expression(context)
+            return value
+        return run
+
+    def _compile_if(self, node):
+        condition = self.compile(node.condition)
+        then_branch = self.compile(node.then_branch)
+        if node.else_branch is None:
+            return lambda context: then_branch(context) if condition(context) else None
+        else_branch = self.compile(node.else_branch)
+        return lambda context: then_branch(context) if condition(context) else else_branch(context)
+
+    def _compile_while(self, node):
+        condition = self.compile(node.condition)
+        body = self.compile(node.body)
+
+        def run(context):
+            result = None
+            while condition(context):
+                result = body(context)
+                if type(result) is Completion:
+                    return result
+            return result
+        return run
+
+    def _compile_return(self, node):
+        if node.tail_call:
+            return self._compile_tail_call(node.value)
+        value = self.compile(node.value)
+        return lambda context: Completion(RETURN, value(context))
+
+    def _compile_tail_call(self, node):
+        lookup = self._compile_callee(node)
+        args = [self.compile(arg) for arg in node.arguments]
+
+        def run(context):
+            func = lookup(context)
+            arguments = [arg(context) for arg in args]
+            if isinstance(func, UserFunction):
+                return Completion(TAIL_CALL, (func, arguments, context))
+            return Completion(RETURN, func(*arguments))
+        return run
+
+    def _compile_function(self, node):
+        name = node.name
+        func = CompiledFunction(node.params, node.body, self.compile(node.body))
+
+        def run(context):
+            context.set_variable(name, func)
+            return None
+        return run
+
+    def _compile_callee(self, node):
+        if isinstance(node.callee, Identifier):
+            name = node.callee.name
+            return lambda context: context.get_callable(name)
+        return self.compile(node.callee)
+
+    def _compile_call(self, node):
+        args = [self.compile(arg) for arg in node.arguments]
+        lookup = self._compile_callee(node)
+
+        if not args:
+            return lambda context: _invoke(lookup(context), [], context)
+        if len(args) == 1:
+            arg0, = args
+            return lambda context: _invoke(lookup(context), [arg0(context)], context)
+        return lambda context: _invoke(lookup(context), [arg(context) for arg in args], context)
+
+    def _compile_block(self, node):
+        statements = [self.compile(stmt) for stmt in node.statements]
+        if not statements:
+            return lambda context: None
+        if len(statements) == 1:
+            return statements[0]
+
+        def run(context):
+            result = None
+            for stmt in statements:
+                result = stmt(context)
+                if type(result) is Completion:
+                    return result
+            return result
+        return run
+
+    def _compile_mirror(self, node):
+        expression = self.compile(node.expression)
+        return lambda context: mirror(expression(context), context)
+
+
+def compile_block(block):
+    """Compile `block` once; the result is called as `code(context)`."""
+    return Compiler().compile(block)
@@ -26,10 +26,27 @@ class ParserError(AKSError):
         super().__init__(self._format())
 
     def _format(self):
-        location = f" near token '{self.token.value}'" if self.token else ""
+        location = ""
+        if self.token is not None:
+            location = f" near token '{self.token.value}'" if self.token.value is not None else " at end of input"
+            if self.token.position is not None:
+                line, column = self.token.position
+                location += f" at line {line}, column {column}"
         return f"[ParserError{location}] {self.message}"
 
 
 class AkshayaRuntimeError(AKSError):
     def __init__(self, message):
         super().__init__(f"[RuntimeError] {message}")
+
+
+class CompileError(AKSError):
+    def __init__(self, message):
+        self.message = message
+        super().__init__(f"[CompileError] {message}")
+
+
+class PurityError(AKSError):
+    def __init__(self, message):
+        self.message = message
+        super().__init__(f"[PurityError] {message}")
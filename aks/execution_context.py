@@ -2,29 +2,43 @@
 execution_context.py — AkshayaLang Sovereign Execution Environment
 """
 
+from types import MappingProxyType
+
+from aks.types import AKSRope, print_values
+from aks.persistent import PVector, PMap
+
+
 class AkshayaLangError(Exception):
     """Base exception for AkshayaLang runtime errors."""
     pass
 
 
-class ExecutionContext:
-    """
-    Represents the runtime scope.
-    Handles variables, functions, and inheritance from parent scopes.
-    """
+def _len(x):
+    return len(x) if hasattr(x, '__len__') else 0
 
-    def __init__(self, parent=None):
-        self.variables = {}
-        self.functions = {}
-        self.parent = parent
-        self._initialize_builtins()
 
-    def _initialize_builtins(self):
-        self.functions.update({
-            "print": lambda *args: print(*args),
-            "len": lambda x: len(x) if hasattr(x, '__len__') else 0,
-            "type": lambda x: str(type(x).__name__),
-        })
+def _type(x):
+    # List and dict literals evaluate to persistent collections and long
+    # strings to ropes, but they keep their names.
+    if isinstance(x, (PVector, PMap, AKSRope)):
+        return x.type_name()
+    return str(type(x).__name__)
+
+
+# Built once and shared: root contexts copy it, call frames never touch it.
+BUILTINS = MappingProxyType({
+    "print": print_values,
+    "len": _len,
+    "type": _type,
+})
+
+_NO_FUNCTIONS = MappingProxyType({})
+
+
+class Scope:
+    """Name lookup shared by ExecutionContext and Frame."""
+
+    __slots__ = ()
 
     def get_variable(self, name):
         if name in self.variables:
@@ -53,13 +67,76 @@ class ExecutionContext:
             return self.parent.get_function(name)
         raise NameError(f"Function '{name}' is not defined.")
 
+    def get_callable(self, name):
+        """Resolve a call target: a variable holding a function, else a registered function."""
+        context = self
+        while context is not None:
+            if name in context.variables:
+                return context.variables[name]
+            if name in context.functions:
+                return context.functions[name]
+            context = context.parent
+        raise NameError(f"Function '{name}' is not defined.")
+
     def call_function(self, name, arguments):
         func = self.get_function(name)
         return func(*arguments)
 
     def create_child(self):
-        return ExecutionContext(parent=self)
+        return Frame(self)
+
+
+class ExecutionContext(Scope):
+    """
+    Represents the runtime scope.
+    Handles variables, functions, and inheritance from parent scopes.
+    """
+
+    def __init__(self, parent=None):
+        self.variables = {}
+        self.functions = {}
+        self.parent = parent
+        # Local slot frame of a resolved function call (see aks.resolver).
+        self.slots = None
+        # Where `mirror` statements stream their values (see aks.serialize).
+        self.mirror_sink = None
+        # Execution event subscribers (see aks.hooks); None until someone subscribes.
+        self.hooks = None
+        if parent is None:
+            self._initialize_builtins()
+
+    def _initialize_builtins(self):
+        self.functions.update(BUILTINS)
+
+    def copy(self):
+        """A new root context holding the same variables and functions; changes to either stay separate."""
+        context = ExecutionContext()
+        context.variables = dict(self.variables)
+        context.functions = dict(self.functions)
+        context.mirror_sink = self.mirror_sink
+        context.hooks = self.hooks
+        return context
 
     def reset(self):
         self.variables.clear()
         self.functions.clear()
+
+
+class Frame(Scope):
+    """
+    A function activation. Holds only its locals; builtins and registered
+    functions are found through the parent chain.
+    """
+
+    __slots__ = ("variables", "functions", "parent", "slots")
+
+    def __init__(self, parent, slots=None):
+        self.variables = {}
+        self.functions = _NO_FUNCTIONS
+        self.parent = parent
+        self.slots = slots
+
+    def define_function(self, name, func):
+        if self.functions is _NO_FUNCTIONS:
+            self.functions = {}
+        self.functions[name] = func
@@ -0,0 +1,188 @@
+"""
+forkserver.py — Pre-Warmed Fork Server for Fast Script Startup
+
+A cold `aks run` spends most of its time importing the interpreter and
+registering the standard library before the script's first statement.
+The fork server pays that once: it imports everything, builds a template
+context with the standard library, and listens on a Unix socket. Each
+client connection is served by a forked child that already has all of
+that in memory.
+
+The client is deliberately thin: this module imports nothing from aks at
+the top, so `python -m aks.forkserver connect script.aks` starts about as
+fast as Python itself. It passes its stdin, stdout and stderr as file
+descriptors (SCM_RIGHTS) along with its argv and working directory, and
+exits with the status the child reports.
+
+    aks serve [--socket PATH]              # keep running in the background
+    aks connect [--socket PATH] script.aks [args ...]
+
+Unix only. A child starts from the server's state at fork time, so it
+never sees changes made by other scripts.
+"""
+
+import array
+import json
+import os
+import socket
+import sys
+
+MAX_REQUEST = 1 << 16
+_FDS = 3
+
+
+def default_socket_path():
+    """$AKS_FORK_SERVER, else a per-user socket in the runtime or temp directory."""
+    if os.environ.get("AKS_FORK_SERVER"):
+        return os.environ["AKS_FORK_SERVER"]
+    directory = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(directory, f"aks-forkserver-{os.getuid()}.sock")
+
+
+# ====== Client ======
+
+def connect(argv, socket_path=None, fds=(0, 1, 2)):
+    """Run `argv` ([script, *args]) on the fork server; returns its exit status."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path or default_socket_path())
+        request = json.dumps({"argv": list(argv), "cwd": os.getcwd()}).encode("utf-8")
+        client.sendmsg([request], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))])
+        client.shutdown(socket.SHUT_WR)
+        reply = b""
+        while True:
+            data = client.recv(4096)
+            if not data:
+                break
+            reply += data
+    finally:
+        client.close()
+    # A child that died without replying counts as a failure.
+    return json.loads(reply)["status"] if reply else 1
+
+
+# ====== Server ======
+
+def _receive(connection):
+    fds = array.array("i")
+    message, ancillary, _, _ = connection.recvmsg(MAX_REQUEST, socket.CMSG_SPACE(_FDS * fds.itemsize))
+    for level, kind, data in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[:len(data) - len(data) % fds.itemsize])
+    return json.loads(message), list(fds)
+
+
+class ForkServer:
+    """Holds the warm interpreter state and forks a child per connection."""
+
+    def __init__(self, socket_path=None, backend="tree", use_cache=True):
+        from aks.execution_context import ExecutionContext
+        from aks.interpreter import Interpreter
+        from aks.stdlib import register_standard_library
+
+        self.socket_path = socket_path or default_socket_path()
+        self.backend = backend
+        self.use_cache = use_cache
+        self.library = register_standard_library(ExecutionContext())
+        self._interpreter_class = Interpreter
+        self.listener = None
+
+    def bind(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self.listener.listen(64)
+
+    def serve_forever(self):
+        import signal
+
+        if self.listener is None:
+            self.bind()
+        # Children are never waited for; let the kernel reap them.
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            while True:
+                connection, _ = self.listener.accept()
+                if os.fork() == 0:
+                    self.listener.close()
+                    self._serve_child(connection)
+                connection.close()
+        finally:
+            self.close()
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def _serve_child(self, connection):
+        """Run one request in this forked child, then exit it; never returns."""
+        status = 1
+        try:
+            request, fds = _receive(connection)
+            for target, fd in zip((0, 1, 2), fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            os.chdir(request["cwd"])
+            sys.argv = request["argv"]
+            status = self.run(request["argv"][0])
+        except SystemExit as e:
+            if e.code is None:
+                status = 0
+            elif isinstance(e.code, int):
+                status = e.code
+            else:
+                print(e.code, file=sys.stderr)
+        except BaseException as e:
+            print(f"ERROR: fork server: {e}", file=sys.stderr)
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                connection.sendall(json.dumps({"status": status}).encode("utf-8"))
+            finally:
+                os._exit(status)
+
+    def run(self, script):
+        """Run `script` like `aks run` does and return the exit status."""
+        interpreter = self._interpreter_class(self.library.fork().context, backend=self.backend)
+        try:
+            result = interpreter.run_file(script, use_cache=self.use_cache)
+        except Exception as e:
+            print(f"ERROR: Runtime error: {e}", file=sys.stderr)
+            return 1
+        if result is not None:
+            print(result)
+        return 0
+
+
+def serve(socket_path=None, backend="tree", use_cache=True):
+    server = ForkServer(socket_path, backend=backend, use_cache=use_cache)
+    server.bind()
+    print(f"aks fork server listening on {server.socket_path}", file=sys.stderr)
+    server.serve_forever()
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    socket_path = None
+    if argv[:1] == ["--socket"]:
+        socket_path, argv = argv[1], argv[2:]
+    if argv[:1] == ["serve"]:
+        serve(socket_path)
+    elif argv[:1] == ["connect"] and len(argv) > 1:
+        sys.exit(connect(argv[1:], socket_path))
+    else:
+        print("usage: python -m aks.forkserver [--socket PATH] (serve | connect script.aks [args ...])",
+              file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+hooks.py — Execution Event Hooks for AkshayaLang
+
+Subscribers see what a program does as it runs:
+
+    node_enter    (node, None)      before any non-block node evaluates
+    node_exit     (node, result)    after it evaluates normally
+    call          (name, args)      a user function is called
+    return        (name, result)    ... and returns
+    builtin_call  (name, args)      a Python builtin is called
+    bind          (name, value)     `bind` or `=` sets a variable
+
+Each subscriber is called as `callback(event, subject, value)`. Nothing is
+instrumented while nobody subscribes. Otherwise `instrument` swaps the
+nodes that raise the subscribed events to hooked subclasses before a run,
+the same way aks.specialize swaps node classes, so a program without
+subscribers runs the plain classes at full speed.
+
+Hooks work on the tree backend. While they are active the specializer
+stays off, because it would swap the hooked classes back. `return f(...)`
+is still a tail call and runs in constant stack: it raises `call` when f
+is entered, and the `return` events of a chain of tail calls all come
+when the chain's first call returns, innermost first, each with the
+chain's result. A call that raises still gets its `return`, with None.
+"""
+
+import json
+import time
+from collections import Counter, defaultdict
+
+from aks.ast import (
+    ASTNode, AssignmentStatement, BindStatement, Block, FunctionCall, Identifier, Program,
+    ReturnStatement, UserFunction, Completion, child_nodes
+)
+from aks.serialize import normalize
+
+NODE_ENTER = "node_enter"
+NODE_EXIT = "node_exit"
+CALL = "call"
+RETURN = "return"
+BUILTIN_CALL = "builtin_call"
+BIND = "bind"
+
+EVENTS = (NODE_ENTER, NODE_EXIT, CALL, RETURN, BUILTIN_CALL, BIND)
+NODE_EVENTS = (NODE_ENTER, NODE_EXIT)
+CALL_EVENTS = (CALL, RETURN, BUILTIN_CALL)
+
+
+class Hooks:
+    """Subscribers to execution events, kept on the root ExecutionContext."""
+
+    def __init__(self):
+        self.subscribers = {event: [] for event in EVENTS}
+        # Per hooked call in progress, the functions it was replaced by through tail calls.
+        self.tail_calls = []
+
+    def subscribe(self, callback, events=None):
+        """Call `callback` for `events`, by default its own `events` attribute or all of them."""
+        if events is None:
+            events = getattr(callback, "events", EVENTS)
+        for event in events:
+            if event not in self.subscribers:
+                raise ValueError(f"Unknown event '{event}', expected one of {EVENTS}")
+        for event in events:
+            self.subscribers[event].append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        for callbacks in self.subscribers.values():
+            while callback in callbacks:
+                callbacks.remove(callback)
+
+    def active(self, *events):
+        return any(self.subscribers[event] for event in events)
+
+    def __bool__(self):
+        return self.active(*EVENTS)
+
+    def emit(self, event, subject, value=None):
+        for callback in self.subscribers[event]:
+            callback(event, subject, value)
+
+
+# ====== Hooked node classes ======
+
+def _callee_name(node):
+    return node.callee.name if isinstance(node.callee, Identifier) else repr(node.callee)
+
+
+def _emit_call(node, context, func, args):
+    hooks = node.hooks
+    name = _callee_name(node)
+    if isinstance(func, UserFunction):
+        hooks.emit(CALL, name, args)
+        hooks.tail_calls.append([])
+        value = None
+        try:
+            value = func.call(args, context)
+            return value
+        finally:
+            for callee in reversed(hooks.tail_calls.pop()):
+                hooks.emit(RETURN, callee, value)
+            hooks.emit(RETURN, name, value)
+    hooks.emit(BUILTIN_CALL, name, args)
+    return func(*args)
+
+
+class HookedFunctionCall(FunctionCall):
+    def evaluate(self, context):
+        func, args = self.target(context)
+        return _emit_call(self, context, func, args)
+
+
+class HookedReturnStatement(ReturnStatement):
+    def evaluate(self, context):
+        if not self.tail_call:
+            return Completion(Completion.RETURN, self.value.evaluate(context))
+        func, args = self.value.target(context)
+        hooks = self.hooks
+        # Outside any hooked call (say, under a builtin) there is no chain to join.
+        if not isinstance(func, UserFunction) or not hooks.tail_calls:
+            return Completion(Completion.RETURN, _emit_call(self.value, context, func, args))
+        name = _callee_name(self.value)
+        hooks.emit(CALL, name, args)
+        hooks.tail_calls[-1].append(name)
+        return Completion(Completion.TAIL_CALL, (func, args, context))
+
+
+class HookedBindStatement(BindStatement):
+    def evaluate(self, context):
+        value = BindStatement.evaluate(self, context)
+        self.hooks.emit(BIND, self.identifier.name, value)
+        return value
+
+
+class HookedAssignmentStatement(AssignmentStatement):
+    def evaluate(self, context):
+        value = AssignmentStatement.evaluate(self, context)
+        self.hooks.emit(BIND, self.name, value)
+        return value
+
+
+_CALL_CLASSES = {FunctionCall: HookedFunctionCall, ReturnStatement: HookedReturnStatement}
+_BIND_CLASSES = {BindStatement: HookedBindStatement, AssignmentStatement: HookedAssignmentStatement}
+_NODE_CLASSES = {}
+
+
+def _node_events_class(cls):
+    hooked = _NODE_CLASSES.get(cls)
+    if hooked is None:
+        base = cls.evaluate
+
+        def evaluate(self, context):
+            emit = self.hooks.emit
+            emit(NODE_ENTER, self)
+            value = base(self, context)
+            emit(NODE_EXIT, self, value)
+            return value
+
+        hooked = _NODE_CLASSES[cls] = type(f"Traced{cls.__name__}", (cls,), {"evaluate": evaluate})
+        _NODE_CLASSES[hooked] = hooked
+    return hooked
+
+
+def instrument(tree, hooks):
+    """Swap the nodes of `tree` that raise subscribed events to their hooked classes."""
+    classes = {}
+    if hooks.active(*CALL_EVENTS):
+        classes.update(_CALL_CLASSES)
+    if hooks.active(BIND):
+        classes.update(_BIND_CLASSES)
+    node_events = hooks.active(*NODE_EVENTS)
+
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        stack.extend(child_nodes(node))
+        hooked = classes.get(type(node))
+        if hooked is not None:
+            node.__class__ = hooked
+            node.hooks = hooks
+        # Blocks stay plain: their statements are reported, and the profiler times them.
+        if node_events and not isinstance(node, (Block, Program)):
+            node.__class__ = _node_events_class(type(node))
+            node.hooks = hooks
+    return tree
+
+
+# ====== Subscribers ======
+
+def _node_type(node):
+    # The AST class the node started out as, not its hooked subclass.
+    return next(cls.__name__ for cls in type(node).__mro__ if cls.__module__ == "aks.ast")
+
+
+class Counters:
+    """
+    Tallies calls and inclusive time per user function, builtin calls,
+    and binds per variable name. Node events are left out unless asked
+    for with `nodes=True`, since they fire for every node evaluated.
+    """
+
+    def __init__(self, nodes=False):
+        self.events = EVENTS if nodes else (CALL, RETURN, BUILTIN_CALL, BIND)
+        self.calls = Counter()
+        self.builtin_calls = Counter()
+        self.binds = Counter()
+        self.nodes = Counter()
+        self.time = defaultdict(float)
+        self._started = []
+
+    def __call__(self, event, subject, value):
+        if event == CALL:
+            self.calls[subject] += 1
+            self._started.append(time.perf_counter())
+        elif event == RETURN and self._started:
+            self.time[subject] += time.perf_counter() - self._started.pop()
+        elif event == BUILTIN_CALL:
+            self.builtin_calls[subject] += 1
+        elif event == BIND:
+            self.binds[subject] += 1
+        elif event == NODE_ENTER:
+            self.nodes[_node_type(subject)] += 1
+
+    def slowest(self, count=10):
+        """The `count` user functions with the most inclusive time, as (name, seconds)."""
+        return sorted(self.time.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def _node_label(node):
+    name = _node_type(node)
+    return f"{name}:{node.position[0]}" if node.position else name
+
+
+class JsonlTrace:
+    """
+    Writes each event to `sink` as one JSON line:
+
+        {"t": 0.000412, "event": "call", "subject": "fib", "value": [10]}
+
+    `t` is seconds since the trace was created. Nodes are written as their
+    type and source line; values as mirror would show them.
+    """
+
+    def __init__(self, sink, events=EVENTS):
+        self.sink = sink
+        self.events = events
+        self._start = time.perf_counter()
+
+    def __call__(self, event, subject, value):
+        if isinstance(subject, ASTNode):
+            subject = _node_label(subject)
+        record = {"t": round(time.perf_counter() - self._start, 6), "event": event, "subject": subject}
+        if value is not None:
+            record["value"] = normalize(value)
+        self.sink.write(json.dumps(record, default=str) + "\n")
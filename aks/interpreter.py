@@ -2,52 +2,199 @@
 interpreter.py — Sovereign Interpreter for AkshayaLang
 """
 
-from aks.lexer import tokenize
+from aks.lexer import tokenize_stream
 from aks.parser import Parser
-from aks.ast import Block, ASTNode
+from aks.ast import Block, ASTNode, unwrap
 from aks.runtime import Runtime
 from aks.execution_context import ExecutionContext
+from aks.optimizer import optimize
+from aks.resolver import resolve
+from aks.astcache import AstCache
+
+# The closure compiler, bytecode VM, transpiler, specializer and hooks are
+# imported when first used, so a plain tree-walked run does not load them.
+
+BACKENDS = ("tree", "closure", "vm")
 
 
 class Interpreter:
     """
     The sovereign orchestrator of AkshayaLang.
     Parses → builds AST → runs it via Runtime and ExecutionContext.
+
+    Backends:
+        "tree"    — walk the AST, calling evaluate() on every node (default).
+        "closure" — compile the AST once into nested Python closures.
+        "vm"      — compile to bytecode and run it on the stack VM.
+
+    Optimization levels (see aks.optimizer): 0 disables the optimizer,
+    1 folds constants and prunes dead code, 2 also precomputes literals.
+
+    With `resolve=True` the tree backend resolves variables statically
+    (see aks.resolver): functions close over their defining scope and
+    locals live in fixed slots instead of being searched for by name.
+
+    `return f(...)` is a tail call on every backend, transpiled code
+    included, and runs in constant stack. Other calls nest on the Python
+    stack in the "tree" and "closure" backends, which allows a few hundred
+    levels of recursion. The "vm" backend keeps them on a heap stack, up
+    to `max_depth` frames (default aks.vm.MAX_DEPTH), and is the backend
+    for deep non-tail recursion. It runs the same programs with the same
+    dynamic scoping, and builtins such as memoize accept its functions.
+    Hooks, the profiler, `resolve` and `specialize` are tree-only.
+
+    With `specialize=True` the tree backend rewrites hot nodes into
+    type-specialized variants as they run (see aks.specialize);
+    `specialization_stats` counts nodes specialized and deoptimized.
+
+    `run_file` keeps parsed ASTs in .aksc files (see aks.astcache), beside
+    each source or under `cache_dir`.
+
+    Given a `mirror_sink` (anything with `write(str)`), `mirror` statements
+    stream their values there as JSON lines (see aks.serialize).
+
+    A `profiler` (see aks.profiler) records where tree-walked programs
+    spend their time, line by line.
+
+    `subscribe` attaches execution event callbacks (see aks.hooks) to the
+    tree backend. Programs run without subscribers are not instrumented.
     """
 
-    def __init__(self, context=None, debug=False):
+    def __init__(self, context=None, debug=False, backend="tree", optimize=0, resolve=False,
+                 max_depth=None, specialize=False, cache_dir=None, mirror_sink=None, profiler=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+        if profiler is not None and backend != "tree":
+            raise ValueError("Profiling needs the tree backend")
         self.context = context or ExecutionContext()
+        if mirror_sink is not None:
+            self.context.mirror_sink = mirror_sink
         self.runtime = Runtime(self.context)
         self.debug = debug
+        self.backend = backend
+        self.optimize = optimize
+        self.resolve = resolve
+        self.max_depth = max_depth
+        self.specializer = None
+        if specialize:
+            from aks.specialize import Specializer
+            self.specializer = Specializer(self.context)
+        self.ast_cache = AstCache(cache_dir)
+        self.profiler = profiler
 
-    def run(self, code: str):
+    def run(self, code: str, transpile: bool = False):
         """
         Run raw .aks code: tokenize → parse → evaluate AST.
 
         Args:
             code (str): The source code string.
+            transpile (bool): Run a cached Python translation of the program
+                instead; repeated runs of the same source skip parsing entirely.
 
         Returns:
             Any: Result of final AST evaluation.
         """
         try:
-            tokens = tokenize(code)
-            if self.debug:
-                print("[Tokens]", tokens)
+            if transpile:
+                from aks.transpile import compile_source
+                return compile_source(code, self._parse).run(self.context)
 
-            parser = Parser(tokens)
-            node = parser.parse()
+            if self.profiler is not None:
+                self.profiler.source = code
+            tokens = tokenize_stream(code)
             if self.debug:
-                print("[AST Root]", repr(node))
+                print("[Tokens]", list(tokens))
 
-            if not isinstance(node, ASTNode):
-                raise RuntimeError("Parsed root is not a valid AST node.")
+            parser = Parser(tokens)
+            return self._execute(parser.parse())
 
-            return self.runtime.execute(node)
+        except Exception as e:
+            raise RuntimeError(f"Interpreter Error: {e}")
 
+    def run_file(self, path: str, use_cache: bool = True):
+        """
+        Run a .aks file. With `use_cache`, an up-to-date .aksc entry
+        replaces tokenizing and parsing, and a stale or missing one is
+        rewritten after parsing.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                code = f.read()
+            if self.profiler is not None:
+                self.profiler.source = code
+            if not use_cache:
+                return self._execute(Parser(tokenize_stream(code)).parse())
+            return self._execute(self.ast_cache.load(path, code, self._parse_unoptimized))
         except Exception as e:
             raise RuntimeError(f"Interpreter Error: {e}")
 
+    def _execute(self, node):
+        node = optimize(node, self.optimize)
+        if self.debug:
+            print("[AST Root]", repr(node))
+
+        if not isinstance(node, ASTNode):
+            raise RuntimeError("Parsed root is not a valid AST node.")
+
+        try:
+            return self._execute_on_backend(node)
+        except RecursionError as e:
+            if self.backend == "vm":
+                raise
+            raise RecursionError(f"{e}: calls nest on the Python stack in the {self.backend} backend; "
+                                 "run deep recursion with backend='vm'") from e
+
+    def _execute_on_backend(self, node):
+        if self.backend == "closure":
+            from aks.compiler import compile_block
+            return unwrap(compile_block(node)(self.context))
+        if self.backend == "vm":
+            from aks.bytecode import compile_program
+            from aks.vm import VM
+            return VM(self.context, max_depth=self.max_depth).run(compile_program(node))
+        if self.resolve:
+            resolve(node)
+        hooks = self.context.hooks
+        if hooks:
+            from aks.hooks import instrument
+            instrument(node, hooks)
+        elif self.specializer is not None:
+            self.specializer.prepare(node)
+        if self.profiler is not None:
+            with self.profiler:
+                result = self.runtime.execute(self.profiler.prepare(node))
+        else:
+            result = self.runtime.execute(node)
+        if self.debug and self.specializer is not None:
+            print("[Specialization]", self.specializer.stats)
+        return result
+
+    def subscribe(self, callback, events=None):
+        """
+        Call `callback(event, subject, value)` for `events` in programs run
+        from now on; see aks.hooks for the events and built-in subscribers.
+        """
+        if self.backend != "tree":
+            raise ValueError("Execution hooks need the tree backend")
+        if self.context.hooks is None:
+            from aks.hooks import Hooks
+            self.context.hooks = Hooks()
+        return self.context.hooks.subscribe(callback, events)
+
+    def unsubscribe(self, callback):
+        if self.context.hooks is not None:
+            self.context.hooks.unsubscribe(callback)
+
+    @property
+    def specialization_stats(self):
+        return self.specializer.stats if self.specializer is not None else None
+
+    def _parse(self, code: str):
+        return optimize(self._parse_unoptimized(code), self.optimize)
+
+    def _parse_unoptimized(self, code: str):
+        return Parser(tokenize_stream(code)).parse()
+
 
 if __name__ == "__main__":
     sample_code = """
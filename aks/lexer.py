@@ -1,79 +1,94 @@
 """
 lexer.py — Sovereign Tokenizer for AkshayaLang
+
+A single precompiled master regex scans the source by offset; no slice of
+the remaining input is ever taken, so lexing stays linear in source size.
 """
 
 import re
-from aks.tokens import Token, TokenType, KEYWORDS, SINGLE_CHAR_TOKENS
+from aks.tokens import Token, TokenStream, TokenType, KEYWORDS, SINGLE_CHAR_TOKENS, MULTI_CHAR_TOKENS, OPERATOR_TOKENS
 
 
-def tokenize(source_code):
-    tokens = []
-    line = 1
-    col = 1
-    pos = 0
-    length = len(source_code)
+# Order matters: the first alternative that matches at an offset wins.
+_TOKEN_SPEC = (
+    ("NEWLINE", r"\n"),
+    ("SKIP", r"[ \t]+"),
+    ("STRING", r'"[^"\n]*"'),
+    ("NUMBER", r"\d+(?:\.\d+)?"),
+    ("NAME", r"[A-Za-z_][A-Za-z0-9_]*"),
+    ("OP", "|".join(map(re.escape, MULTI_CHAR_TOKENS)) + "|[" + re.escape("".join(SINGLE_CHAR_TOKENS)) + "]"),
+    ("UNTERMINATED", r'"'),
+    ("MISMATCH", r"."),
+)
 
-    def advance(n=1):
-        nonlocal pos, col
-        pos += n
-        col += n
+MASTER_PATTERN = re.compile("|".join(f"(?P<{name}>{regex})" for name, regex in _TOKEN_SPEC))
 
-    while pos < length:
-        char = source_code[pos]
 
-        # Skip whitespace
-        if char in " \t":
-            advance()
-            continue
+def _scan(source_code, line_starts):
+    """
+    Yield (TokenType, value, offset) triples ending with EOF.
+    The start offset of every new line is appended to `line_starts`.
+    """
+    keywords = KEYWORDS
+    operators = OPERATOR_TOKENS
+    identifier = TokenType.IDENTIFIER
 
-        # Newlines
-        if char == "\n":
-            line += 1
-            col = 1
-            pos += 1
-            continue
+    for match in MASTER_PATTERN.finditer(source_code):
+        kind = match.lastgroup
 
-        # Single-char tokens
-        if char in SINGLE_CHAR_TOKENS:
-            token = Token(SINGLE_CHAR_TOKENS[char], char, (line, col))
-            print(f"[DEBUG] Tokenized: {token.type} - {token.value}")
-            tokens.append(token)
-            advance()
+        if kind == "SKIP":
             continue
 
-        # Strings
-        if char == '"':
-            end = pos + 1
-            while end < length and source_code[end] != '"':
-                if source_code[end] == "\n":
-                    break
-                end += 1
-            string_val = source_code[pos + 1:end]
-            tokens.append(Token(TokenType.STRING, string_val, (line, col)))
-            advance(end - pos + 1)
+        if kind == "NEWLINE":
+            line_starts.append(match.end())
             continue
 
-        # Numbers
-        number_match = re.match(r'\d+(\.\d+)?', source_code[pos:])
-        if number_match:
-            val = float(number_match.group())
-            tokens.append(Token(TokenType.NUMBER, val, (line, col)))
-            advance(len(number_match.group()))
-            continue
+        text = match.group()
+        start = match.start()
+
+        if kind == "NAME":
+            yield keywords.get(text, identifier), text, start
+        elif kind == "OP":
+            yield operators[text], text, start
+        elif kind == "NUMBER":
+            yield TokenType.NUMBER, float(text) if "." in text else int(text), start
+        elif kind == "STRING":
+            yield TokenType.STRING, text[1:-1], start
+        else:
+            line = len(line_starts)
+            column = start - line_starts[-1] + 1
+            if kind == "UNTERMINATED":
+                raise SyntaxError(f"Unterminated string at line {line}, column {column}")
+            raise SyntaxError(f"Unexpected character '{text}' at line {line}, column {column}")
 
-        # Identifiers or Keywords
-        id_match = re.match(r'[A-Za-z_][A-Za-z0-9_]*', source_code[pos:])
-        if id_match:
-            val = id_match.group()
-            token_type = KEYWORDS.get(val, TokenType.IDENTIFIER)
-            token = Token(token_type, val, (line, col))
+    yield TokenType.EOF, None, len(source_code)
+
+
+def iter_tokens(source_code, trace=False):
+    """
+    Lazily yield tokens for `source_code`, ending with an EOF token.
+
+    Args:
+        source_code (str): The .aks source text.
+        trace (bool): Print a `[DEBUG]` line for every token produced.
+    """
+    line_starts = [0]
+    for token_type, value, offset in _scan(source_code, line_starts):
+        token = Token(token_type, value, (len(line_starts), offset - line_starts[-1] + 1))
+        if trace:
             print(f"[DEBUG] Tokenized: {token.type} - {token.value}")
-            tokens.append(token)
-            advance(len(val))
-            continue
+        yield token
+
+
+def tokenize(source_code, trace=False):
+    """Tokenize `source_code` into a list of tokens (see `iter_tokens`)."""
+    return list(iter_tokens(source_code, trace=trace))
 
-        # Unknown character
-        raise SyntaxError(f"Unexpected character '{char}' at line {line}, column {col}")
 
-    tokens.append(Token(TokenType.EOF, None, (line, col)))
-    return tokens
\ No newline at end of file
+def tokenize_stream(source_code):
+    """Tokenize `source_code` straight into a compact TokenStream."""
+    stream = TokenStream()
+    append = stream.append
+    for token_type, value, offset in _scan(source_code, stream.line_starts):
+        append(token_type, value, offset)
+    return stream
@@ -0,0 +1,216 @@
+"""
+memoize.py — Memoization of Pure AkshayaLang Functions
+
+`memoize(f, maxsize)` wraps a UserFunction in an LRU cache keyed by its
+arguments. Caching is only sound for pure functions, so the function body
+is checked statically first. It is refused if it:
+
+    - reads a name it does not bind itself, since every global can be
+      rebound;
+    - calls an I/O builtin (print, input, mirror, exit) or uses a
+      `mirror` statement;
+    - calls a user function that fails these same checks, a name that is
+      not defined yet, or a function value held in a parameter or local.
+
+Free names that refer to user functions are resolved in the context the
+memoized function was created in, so recursion such as
+`bind fib to memoize(fib)` is allowed.
+"""
+
+from collections import OrderedDict
+
+from aks.errors import PurityError
+from aks.resolver import bound_names
+from aks.ast import (
+    UserFunction, Identifier, FunctionCall, FunctionDeclaration, MirrorStatement,
+    ListLiteral, DictLiteral, BinaryExpression, UnaryExpression, IndexExpression,
+    BindStatement, AssignmentStatement, IfStatement, WhileStatement,
+    ReturnStatement, Block, Program
+)
+
+IMPURE_BUILTINS = frozenset({"print", "input", "mirror", "exit"})
+
+
+def purity_violations(function, context):
+    """Reasons `function` cannot be memoized; empty when it is pure."""
+    checker = _PurityChecker(context)
+    checker.check_function(function)
+    return checker.violations
+
+
+class _PurityChecker:
+    def __init__(self, context):
+        self.context = context
+        self.violations = []
+        self._checked = set()
+        self._nested = set()
+
+    def check_function(self, function):
+        if id(function) in self._checked:
+            return
+        self._checked.add(id(function))
+        outer, self._nested = self._nested, _declared_functions(function.body)
+        try:
+            self._visit(function.body, set(bound_names(function.body, function.params)))
+        finally:
+            self._nested = outer
+
+    def _callee(self, name, local_names):
+        if name in local_names:
+            # Nested `fn`s are checked where they are declared; any other
+            # local could hold an arbitrary function.
+            if name not in self._nested:
+                self.violations.append(f"calls function value '{name}'")
+            return
+        if name in IMPURE_BUILTINS:
+            self.violations.append(f"calls I/O builtin '{name}'")
+            return
+        try:
+            callee = self.context.get_callable(name)
+        except NameError:
+            self.violations.append(f"calls undefined function '{name}'")
+            return
+        if isinstance(callee, MemoizedFunction):
+            callee = callee.function
+        if isinstance(callee, UserFunction):
+            self.check_function(callee)
+
+    def _visit(self, node, local_names):
+        kind = type(node)
+        if kind is Identifier:
+            if node.name not in local_names:
+                self.violations.append(f"reads global '{node.name}'")
+        elif kind is FunctionCall:
+            if type(node.callee) is Identifier:
+                self._callee(node.callee.name, local_names)
+            else:
+                self._visit(node.callee, local_names)
+            for argument in node.arguments:
+                self._visit(argument, local_names)
+        elif kind is MirrorStatement:
+            self.violations.append("uses 'mirror'")
+            self._visit(node.expression, local_names)
+        elif kind is FunctionDeclaration:
+            # Nested functions see their own names plus the enclosing ones.
+            self._visit(node.body, local_names | set(bound_names(node.body, node.params)))
+        elif kind in (Block, Program):
+            for statement in node.statements:
+                self._visit(statement, local_names)
+        elif kind in (BindStatement, AssignmentStatement):
+            self._visit(node.expression, local_names)
+        elif kind is ReturnStatement:
+            self._visit(node.value, local_names)
+        elif kind is IfStatement:
+            self._visit(node.condition, local_names)
+            self._visit(node.then_branch, local_names)
+            if node.else_branch is not None:
+                self._visit(node.else_branch, local_names)
+        elif kind is WhileStatement:
+            self._visit(node.condition, local_names)
+            self._visit(node.body, local_names)
+        elif kind is BinaryExpression:
+            self._visit(node.left, local_names)
+            self._visit(node.right, local_names)
+        elif kind is UnaryExpression:
+            self._visit(node.operand, local_names)
+        elif kind is IndexExpression:
+            self._visit(node.target, local_names)
+            self._visit(node.index, local_names)
+        elif kind is ListLiteral:
+            for element in node.elements:
+                self._visit(element, local_names)
+        elif kind is DictLiteral:
+            for key, value in node.pairs:
+                self._visit(key, local_names)
+                self._visit(value, local_names)
+
+
+def _declared_functions(block):
+    names = set()
+    stack = [block]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, FunctionDeclaration):
+            names.add(node.name)
+            stack.append(node.body)
+        elif isinstance(node, (Block, Program)):
+            stack.extend(node.statements)
+        elif isinstance(node, IfStatement):
+            stack.append(node.then_branch)
+            if node.else_branch is not None:
+                stack.append(node.else_branch)
+        elif isinstance(node, WhileStatement):
+            stack.append(node.body)
+    return names
+
+
+def _freeze(value):
+    """
+    A hashable stand-in for an argument. Python lists and dicts are hashed
+    by content; persistent vectors and maps already hash that way.
+    """
+    if isinstance(value, list):
+        return (list, tuple(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return (dict, frozenset((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+class MemoizedFunction:
+    """A pure UserFunction behind an LRU cache of its results."""
+
+    def __init__(self, function, context, maxsize=128):
+        self.function = function
+        self.context = context
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, *args):
+        try:
+            key = tuple(_freeze(arg) for arg in args)
+            result = self._cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable argument: nothing to look up or store.
+            self.misses += 1
+            return self.function.call(list(args), self.context)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self.function.call(list(args), self.context)
+        self._cache[key] = result
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return result
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "maxsize": self.maxsize}
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def __repr__(self):
+        return f"<MemoizedFunction {self.function.params} hits={self.hits} misses={self.misses}>"
+
+
+def memoize(function, context, maxsize=128):
+    """Wrap `function` in an LRU cache, or raise PurityError if it is not pure."""
+    if isinstance(function, MemoizedFunction):
+        function = function.function
+    if not isinstance(function, UserFunction):
+        raise PurityError(f"memoize() expects a function declared with 'fn', got {type(function).__name__}")
+    if maxsize is not None:
+        maxsize = int(maxsize)
+        if maxsize < 1:
+            raise PurityError("memoize() maxsize must be at least 1")
+    violations = purity_violations(function, context)
+    if violations:
+        raise PurityError("cannot memoize impure function: " + "; ".join(violations))
+    return MemoizedFunction(function, context, maxsize)
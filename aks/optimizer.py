@@ -0,0 +1,182 @@
+"""
+optimizer.py — AST Optimization Passes for AkshayaLang
+
+Levels:
+    1 — fold constant expressions, prune branches with literal conditions,
+        drop statements after a `return`.
+    2 — additionally precompute constant dict keys and constant lists.
+
+Every pass preserves the value a Block evaluates to, so optimized trees
+run unchanged on every backend.
+"""
+
+from aks.ast import (
+    BINARY_OPERATORS, NumberLiteral, StringLiteral, BooleanLiteral,
+    ReturnStatement, Block
+)
+
+LITERALS = (NumberLiteral, StringLiteral, BooleanLiteral)
+
+
+def _literal(value):
+    """Wrap a folded Python value back into a literal node, or None if it has no literal form."""
+    if isinstance(value, bool):
+        return BooleanLiteral(value)
+    if isinstance(value, (int, float)):
+        return NumberLiteral(value)
+    if isinstance(value, str):
+        return StringLiteral(value)
+    return None
+
+
+class Optimizer:
+    def __init__(self, level=1):
+        self.level = level
+        self.folded = 0
+        self.pruned = 0
+
+    def optimize(self, node):
+        method = getattr(self, f"_visit_{type(node).__name__}", None)
+        return method(node) if method is not None else node
+
+    # ====== Statements ======
+
+    def _visit_Block(self, node):
+        statements = []
+        for index, statement in enumerate(node.statements):
+            statement = self.optimize(statement)
+            if isinstance(statement, Block) and statement.statements:
+                # A pruned `if` leaves its surviving branch behind; splice it in.
+                statements.extend(statement.statements)
+            else:
+                statements.append(statement)
+            if isinstance(statements[-1], ReturnStatement):
+                self.pruned += len(node.statements) - index - 1
+                break
+
+        # Empty placeholder blocks only matter as the block's final value.
+        last = len(statements) - 1
+        node.statements = [
+            s for i, s in enumerate(statements)
+            if i == last or not (isinstance(s, Block) and not s.statements)
+        ]
+        return node
+
+    _visit_Program = _visit_Block
+
+    def _visit_IfStatement(self, node):
+        node.condition = self.optimize(node.condition)
+        node.then_branch = self.optimize(node.then_branch)
+        if node.else_branch is not None:
+            node.else_branch = self.optimize(node.else_branch)
+        if isinstance(node.condition, LITERALS):
+            self.pruned += 1
+            if node.condition.value:
+                return node.then_branch
+            return node.else_branch if node.else_branch is not None else Block([])
+        return node
+
+    def _visit_WhileStatement(self, node):
+        node.condition = self.optimize(node.condition)
+        node.body = self.optimize(node.body)
+        if isinstance(node.condition, LITERALS) and not node.condition.value:
+            self.pruned += 1
+            return Block([])
+        return node
+
+    def _visit_BindStatement(self, node):
+        node.expression = self.optimize(node.expression)
+        return node
+
+    def _visit_AssignmentStatement(self, node):
+        node.expression = self.optimize(node.expression)
+        return node
+
+    def _visit_ReturnStatement(self, node):
+        node.value = self.optimize(node.value)
+        return node
+
+    def _visit_MirrorStatement(self, node):
+        node.expression = self.optimize(node.expression)
+        return node
+
+    def _visit_FunctionDeclaration(self, node):
+        node.body = self.optimize(node.body)
+        return node
+
+    # ====== Expressions ======
+
+    def _visit_BinaryExpression(self, node):
+        node.left = self.optimize(node.left)
+        node.right = self.optimize(node.right)
+        left, right = node.left, node.right
+        if not isinstance(left, LITERALS):
+            return node
+
+        # `and` / `or` decide on the left operand alone.
+        if node.operator == 'and':
+            self.folded += 1
+            return right if left.value else left
+        if node.operator == 'or':
+            self.folded += 1
+            return left if left.value else right
+
+        op = BINARY_OPERATORS.get(node.operator)
+        if op is None or not isinstance(right, LITERALS):
+            return node
+        try:
+            folded = _literal(op(left.value, right.value))
+        except Exception:
+            # Leave failing expressions (e.g. 1 / 0) for the runtime to report.
+            return node
+        if folded is None:
+            return node
+        self.folded += 1
+        return folded
+
+    def _visit_UnaryExpression(self, node):
+        node.operand = self.optimize(node.operand)
+        if not isinstance(node.operand, LITERALS):
+            return node
+        try:
+            if node.operator == '-':
+                folded = _literal(-node.operand.value)
+            elif node.operator == 'not':
+                folded = BooleanLiteral(not node.operand.value)
+            else:
+                return node
+        except Exception:
+            return node
+        if folded is None:
+            return node
+        self.folded += 1
+        return folded
+
+    def _visit_FunctionCall(self, node):
+        node.callee = self.optimize(node.callee)
+        node.arguments = [self.optimize(arg) for arg in node.arguments]
+        return node
+
+    def _visit_IndexExpression(self, node):
+        node.target = self.optimize(node.target)
+        node.index = self.optimize(node.index)
+        return node
+
+    def _visit_ListLiteral(self, node):
+        node.elements = [self.optimize(el) for el in node.elements]
+        if self.level >= 2 and all(isinstance(el, LITERALS) for el in node.elements):
+            node.constant_elements = tuple(el.value for el in node.elements)
+        return node
+
+    def _visit_DictLiteral(self, node):
+        node.pairs = [(self.optimize(k), self.optimize(v)) for k, v in node.pairs]
+        if self.level >= 2 and all(isinstance(k, LITERALS) for k, _ in node.pairs):
+            node.const_keys = tuple(k.value for k, _ in node.pairs)
+        return node
+
+
+def optimize(block, level=1):
+    """Optimize `block` in place at the given level and return the new root."""
+    if level <= 0:
+        return block
+    return Optimizer(level).optimize(block)
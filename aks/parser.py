@@ -1,71 +1,156 @@
 # parser.py — Final
 
-from aks.tokens import Token, TokenType
+from aks.errors import ParserError
+from aks.tokens import TokenStream, TokenType
 from aks.ast import (
-    ASTNode, MirrorStatement, BindStatement, BinaryExpression, UnaryExpression,
+    MirrorStatement, BindStatement, AssignmentStatement,
+    BinaryExpression, UnaryExpression, IndexExpression,
     NumberLiteral, StringLiteral, BooleanLiteral, Identifier,
     FunctionCall, ListLiteral, DictLiteral, FunctionDeclaration,
     IfStatement, WhileStatement, ReturnStatement, Block
 )
 
-
-class ParserError(Exception):
-    pass
+T = TokenType
+
+# Binding powers, loosest first.
+PREC_OR = 1
+PREC_AND = 2
+PREC_NOT = 3
+PREC_COMPARISON = 4
+PREC_TERM = 5
+PREC_FACTOR = 6
+PREC_UNARY = 7
+PREC_POSTFIX = 8
+
+BINARY_PRECEDENCE = {
+    T.OR.value: PREC_OR,
+    T.AND.value: PREC_AND,
+    T.EQ.value: PREC_COMPARISON,
+    T.NEQ.value: PREC_COMPARISON,
+    T.LT.value: PREC_COMPARISON,
+    T.GT.value: PREC_COMPARISON,
+    T.LTE.value: PREC_COMPARISON,
+    T.GTE.value: PREC_COMPARISON,
+    T.PLUS.value: PREC_TERM,
+    T.MINUS.value: PREC_TERM,
+    T.STAR.value: PREC_FACTOR,
+    T.SLASH.value: PREC_FACTOR,
+    T.PERCENT.value: PREC_FACTOR,
+}
+
+EOF = T.EOF.value
+IDENTIFIER = T.IDENTIFIER.value
+ASSIGN = T.ASSIGN.value
+COMMA = T.COMMA.value
+RBRACE = T.RBRACE.value
+RBRACKET = T.RBRACKET.value
+RPAREN = T.RPAREN.value
+ELSE = T.ELSE.value
+IF = T.IF.value
 
 
 class Parser:
+    """
+    Pratt (precedence-climbing) parser over a TokenStream.
+
+    Statement keywords, prefix forms and infix operators are each looked up
+    in a table keyed on the integer token code, so choosing a rule costs one
+    dict probe instead of a chain of type comparisons.
+    """
+
     def __init__(self, tokens):
+        if not isinstance(tokens, TokenStream):
+            tokens = TokenStream.from_tokens(tokens)
         self.tokens = tokens
+        self.types = tokens.types
+        self.value_ids = tokens.value_ids
+        self.values = tokens.values
         self.position = 0
 
+        self._statement_rules = {
+            T.MIRROR.value: self._parse_mirror_statement,
+            T.BIND.value: self._parse_bind_statement,
+            T.FN.value: self._parse_function_declaration,
+            T.IF.value: self._parse_if_statement,
+            T.WHILE.value: self._parse_while_statement,
+            T.RETURN.value: self._parse_return_statement,
+        }
+        self._prefix_rules = {
+            T.NUMBER.value: self._parse_number,
+            T.STRING.value: self._parse_string,
+            T.BOOLEAN.value: self._parse_boolean,
+            T.IDENTIFIER.value: self._parse_identifier,
+            T.PRINT.value: self._parse_identifier,
+            T.LPAREN.value: self._parse_group,
+            T.LBRACKET.value: self._parse_list_literal,
+            T.LBRACE.value: self._parse_dict_literal,
+            T.MINUS.value: self._parse_unary,
+            T.NOT.value: self._parse_unary,
+        }
+        infix_rules = {code: (prec, self._parse_binary) for code, prec in BINARY_PRECEDENCE.items()}
+        infix_rules[T.LPAREN.value] = (PREC_POSTFIX, self._parse_call)
+        infix_rules[T.LBRACKET.value] = (PREC_POSTFIX, self._parse_index)
+        self._infix_rules = infix_rules
+
     def parse(self):
         statements = []
-        while not self._match("EOF"):
-            stmt = self._parse_statement()
-            if stmt:
-                statements.append(stmt)
+        while self.types[self.position] != EOF:
+            statements.append(self._parse_statement())
         return Block(statements)
 
+    # ====== Statements ======
+
     def _parse_statement(self):
-        if self._match("MIRROR"):
-            expr = self._parse_expression()
-            return MirrorStatement(expr)
-        if self._match("BIND"):
-            return self._parse_bind_statement()
-        if self._match("FN"):
-            return self._parse_function_declaration()
-        if self._match("IF"):
-            return self._parse_if_statement()
-        if self._match("WHILE"):
-            return self._parse_while_statement()
-        if self._match("RETURN"):
-            return self._parse_return_statement()
-        return self._parse_expression()
+        start = self.position
+        rule = self._statement_rules.get(self.types[start])
+        if rule is not None:
+            self.position += 1
+            statement = rule()
+        elif self.types[start] == IDENTIFIER and self.types[start + 1] == ASSIGN:
+            statement = self._parse_assignment()
+        else:
+            statement = self._parse_expression()
+        statement.position = self.tokens.position(start)
+        return statement
+
+    def _parse_mirror_statement(self):
+        return MirrorStatement(self._parse_expression())
 
     def _parse_bind_statement(self):
-        name = self._consume("IDENTIFIER", "Expected variable name after 'bind'")
-        self._consume("TO", "Expected 'to' after variable name")
+        name = self._consume(T.IDENTIFIER, "Expected variable name after 'bind'")
+        self._consume(T.TO, "Expected 'to' after variable name")
         expr = self._parse_expression()
-        return BindStatement(Identifier(name.value), expr)
+        return BindStatement(Identifier(name), expr)
+
+    def _parse_assignment(self):
+        name = self._value()
+        self.position += 2
+        return AssignmentStatement(name, self._parse_expression())
 
     def _parse_function_declaration(self):
-        name = self._consume("IDENTIFIER", "Expected function name")
-        self._consume("LPAREN", "Expected '(' after function name")
+        name = self._consume(T.IDENTIFIER, "Expected function name")
+        self._consume(T.LPAREN, "Expected '(' after function name")
         params = []
-        if not self._check("RPAREN"):
-            params.append(self._consume("IDENTIFIER", "Expected parameter").value)
-            while self._match("COMMA"):
-                params.append(self._consume("IDENTIFIER", "Expected parameter").value)
-        self._consume("RPAREN", "Expected ')' after parameters")
+        if not self._check(RPAREN):
+            params.append(self._consume(T.IDENTIFIER, "Expected parameter"))
+            while self._match(COMMA):
+                params.append(self._consume(T.IDENTIFIER, "Expected parameter"))
+        self._consume(T.RPAREN, "Expected ')' after parameters")
         body = self._parse_block()
-        return FunctionDeclaration(name.value, params, body)
+        return FunctionDeclaration(name, params, body)
 
     def _parse_if_statement(self):
         condition = self._parse_expression()
         then_branch = self._parse_block()
         else_branch = None
-        if self._match("ELSE"):
-            else_branch = self._parse_block()
+        if self._match(ELSE):
+            if self._match(IF):
+                start = self.position - 1
+                nested = self._parse_if_statement()
+                nested.position = self.tokens.position(start)
+                else_branch = Block([nested])
+            else:
+                else_branch = self._parse_block()
         return IfStatement(condition, then_branch, else_branch)
 
     def _parse_while_statement(self):
@@ -74,139 +159,129 @@ class Parser:
         return WhileStatement(condition, body)
 
     def _parse_return_statement(self):
-        value = self._parse_expression()
-        return ReturnStatement(value)
+        return ReturnStatement(self._parse_expression())
 
     def _parse_block(self):
-        self._consume("LBRACE", "Expected '{' to start block")
+        self._consume(T.LBRACE, "Expected '{' to start block")
         statements = []
-        while not self._check("RBRACE") and not self._is_at_end():
+        while not self._check(RBRACE) and self.types[self.position] != EOF:
             statements.append(self._parse_statement())
-        self._consume("RBRACE", "Expected '}' to close block")
+        self._consume(T.RBRACE, "Expected '}' to close block")
         return Block(statements)
 
-    def _parse_expression(self):
-        return self._parse_binary_expression()
+    # ====== Expressions ======
+
+    def _parse_expression(self, precedence=0):
+        prefix = self._prefix_rules.get(self.types[self.position])
+        if prefix is None:
+            raise ParserError(f"Unexpected token: {self.tokens.type_at(self.position)}", self._peek())
+        self.position += 1
+        left = prefix()
+
+        infix_rules = self._infix_rules
+        types = self.types
+        while True:
+            rule = infix_rules.get(types[self.position])
+            if rule is None or rule[0] <= precedence:
+                return left
+            self.position += 1
+            left = rule[1](left, rule[0])
 
-    def _parse_binary_expression(self):
-        expr = self._parse_unary_expression()
-        while self._check("PLUS") or self._check("MINUS") or self._check("STAR") or self._check("SLASH"):
-            op_token = self._advance()
-            op = op_token.value
-            right = self._parse_unary_expression()
-            expr = BinaryExpression(expr, op, right)
-        return expr
+    def _parse_number(self):
+        return NumberLiteral(self._previous_value())
 
-    def _parse_unary_expression(self):
-        if self._check("MINUS"):
-            op = self._advance().value
-            operand = self._parse_primary()
-            return UnaryExpression(op, operand)
-        return self._parse_primary()
+    def _parse_string(self):
+        return StringLiteral(self._previous_value())
 
-    def _parse_primary(self) -> ASTNode:
-        token = self._advance()
+    def _parse_boolean(self):
+        return BooleanLiteral(self._previous_value() == "true")
 
-        if token.type == TokenType.NUMBER:
-            return NumberLiteral(float(token.value))
+    def _parse_identifier(self):
+        return Identifier(self._previous_value())
 
-        if token.type == TokenType.STRING:
-            return StringLiteral(token.value)
+    def _parse_group(self):
+        expr = self._parse_expression()
+        self._consume(T.RPAREN, "Expected ')' after expression")
+        return expr
 
-        if token.type == TokenType.IDENTIFIER:
-            return Identifier(token.value)
-        
-        if token.type == TokenType.LPAREN:
-            expr = self._parse_expression()
-            self._consume(TokenType.RPAREN, "Expected ')' after expression")
-            return expr
+    def _parse_unary(self):
+        op = self._previous_value()
+        operand = self._parse_expression(PREC_NOT if op == "not" else PREC_UNARY)
+        return UnaryExpression(op, operand)
 
-        if token.type == TokenType.LBRACE:
-            pairs = []
-            while not self._check(TokenType.RBRACE) and not self._is_at_end():
-                key_token = self._advance()
-                if key_token.type != TokenType.IDENTIFIER and key_token.type != TokenType.STRING:
-                    raise ParserError(f"Expected identifier or string as dictionary key, got: {key_token.type}")
-                
-                self._consume(TokenType.COLON, "Expected ':' after dictionary key")
-                value_expr = self._parse_expression()
+    def _parse_list_literal(self):
+        elements = self._parse_arguments(RBRACKET, "Expected ',' or ']' in list literal")
+        return ListLiteral(elements)
 
-                if key_token.type == TokenType.STRING:
-                    key_node = StringLiteral(key_token.value)
-                else:
-                    key_node = StringLiteral(key_token.value)  # force identifier to string
+    def _parse_dict_literal(self):
+        pairs = []
+        while not self._check(RBRACE) and self.types[self.position] != EOF:
+            key_type = self.tokens.type_at(self.position)
+            if key_type is not T.IDENTIFIER and key_type is not T.STRING:
+                raise ParserError(f"Expected identifier or string as dictionary key, got: {key_type}", self._peek())
+            key_node = StringLiteral(self._value())  # identifiers are forced to string keys
+            self.position += 1
 
-                pairs.append((key_node, value_expr))
+            self._consume(T.COLON, "Expected ':' after dictionary key")
+            pairs.append((key_node, self._parse_expression()))
 
-                if not self._check(TokenType.RBRACE):
-                    self._consume(TokenType.COMMA, "Expected ',' or '}' in dictionary literal")
+            if not self._check(RBRACE):
+                self._consume(T.COMMA, "Expected ',' or '}' in dictionary literal")
 
-            self._consume(TokenType.RBRACE, "Expected '}' to close dictionary literal")
-            return DictLiteral(pairs)
+        self._consume(T.RBRACE, "Expected '}' to close dictionary literal")
+        return DictLiteral(pairs)
 
-        if token.type == TokenType.BOOLEAN:
-            return BooleanLiteral(token.value == "true")
+    def _parse_binary(self, left, precedence):
+        op = self._previous_value()
+        right = self._parse_expression(precedence)
+        return BinaryExpression(left, op, right)
+
+    def _parse_call(self, callee, precedence):
+        arguments = self._parse_arguments(RPAREN, "Expected ',' or ')' after argument")
+        return FunctionCall(callee, arguments)
+
+    def _parse_index(self, target, precedence):
+        index = self._parse_expression()
+        self._consume(T.RBRACKET, "Expected ']' after index")
+        return IndexExpression(target, index)
+
+    def _parse_arguments(self, closing, message):
+        """Comma-separated expressions up to and including the `closing` token."""
+        items = []
+        while not self._check(closing):
+            items.append(self._parse_expression())
+            if not self._match(COMMA):
+                break
+        if not self._match(closing):
+            raise ParserError(message, self._peek())
+        return items
 
-        raise ParserError(f"Unexpected token: {token.type}")
-        
+    # ====== Helpers ======
 
-    def _parse_dict_literal(self):
-        pairs = []
-        while not self._check("RBRACE") and not self._is_at_end():
-            key_token = self._advance()
-            if key_token.type == "IDENTIFIER":
-                key_node = Identifier(key_token.value)
-            elif key_token.type == "STRING":
-                key_node = StringLiteral(key_token.value)
-            else:
-                raise ParserError("Dictionary keys must be identifiers or strings")
-
-            self._consume("COLON", "Expected ':' after key")
-            value_node = self._parse_expression()
-            pairs.append((key_node, value_node))
-            if not self._check("RBRACE"):
-                self._consume("COMMA", "Expected ',' between key-value pairs")
-        self._consume("RBRACE", "Expected '}' to close dictionary")
-        return DictLiteral(pairs)
+    def _value(self):
+        return self.values[self.value_ids[self.position]]
 
-    # ====== Helpers ======
+    def _previous_value(self):
+        return self.values[self.value_ids[self.position - 1]]
 
-    def _match(self, expected_type, expected_value=None):
-        if self._check(expected_type, expected_value):
-            self._advance()
+    def _match(self, code):
+        if self.types[self.position] == code:
+            self.position += 1
             return True
         return False
 
-    def _check(self, expected_type, expected_value=None):
-        if self._is_at_end():
-            return False
-        token = self._peek()
-        if isinstance(expected_type, str):
-            type_match = token.type == expected_type or \
-                         (hasattr(token.type, "name") and token.type.name == expected_type)
-        else:
-            type_match = token.type == expected_type
-        if not type_match:
-            return False
-        if expected_value is not None and token.value != expected_value:
-            return False
-        return True
+    def _check(self, code):
+        return self.types[self.position] == code
 
     def _consume(self, expected_type, message):
-        if self._check(expected_type):
-            return self._advance()
-        raise ParserError(message)
-
-    def _advance(self):
-        if not self._is_at_end():
+        """Advance past a token of `expected_type` and return its value."""
+        if self.types[self.position] == expected_type.value:
             self.position += 1
-        return self._previous()
+            return self._previous_value()
+        raise ParserError(message, self._peek())
 
     def _peek(self):
         return self.tokens[self.position]
 
-    def _previous(self):
-        return self.tokens[self.position - 1]
-
     def _is_at_end(self):
-        return self._peek().type == "EOF"
\ No newline at end of file
+        return self.types[self.position] == EOF
@@ -0,0 +1,448 @@
+"""
+persistent.py — Persistent Vector and Map Values for AkshayaLang
+
+List and dict literals evaluate to these immutable, structurally shared
+collections. "Updating" one returns a new version that shares everything
+but the changed path with the old one, so passing a collection around,
+keeping old versions or mirroring a snapshot never copies it.
+
+    PVector  — a 32-way trie with a tail buffer, as in Clojure. Indexing
+               and `assoc` touch O(log32 n) nodes; `conj` is amortized O(1).
+    PMap     — a hash array mapped trie (HAMT). Lookup, `assoc` and
+               `dissoc` touch O(log32 n) nodes. A PVector of the entries
+               in insertion order sits beside the trie, with a tombstone
+               for each removed key, so iteration follows insertion order
+               like a dict and takes O(n).
+
+Both compare equal to the equivalent Python list / dict, hash by content
+and read like a sequence / mapping, so builtins and host code that only
+read their arguments accept them unchanged.
+"""
+
+from collections.abc import Mapping, Sequence
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+_MISSING = object()
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(n):
+        return bin(n).count("1")
+
+
+# ====== Vector ======
+
+class PVector(Sequence):
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_hash")
+
+    def __init__(self, values=()):
+        values = tuple(values)
+        # Bulk load: full leaves go into the trie, the last 1..32 values into the tail.
+        tail_start = (len(values) - 1) & ~_MASK if values else 0
+        nodes = [values[i:i + _WIDTH] for i in range(0, tail_start, _WIDTH)]
+        shift = _BITS
+        while len(nodes) > _WIDTH:
+            nodes = [tuple(nodes[i:i + _WIDTH]) for i in range(0, len(nodes), _WIDTH)]
+            shift += _BITS
+        self._init(len(values), shift, tuple(nodes), values[tail_start:])
+
+    def _init(self, count, shift, root, tail):
+        self._count = count
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+        self._hash = None
+
+    @classmethod
+    def _make(cls, count, shift, root, tail):
+        vector = object.__new__(cls)
+        vector._init(count, shift, root, tail)
+        return vector
+
+    def _tail_offset(self):
+        return self._count - len(self._tail)
+
+    def _leaf_for(self, index):
+        if index >= self._tail_offset():
+            return self._tail
+        node = self._root
+        for level in range(self._shift, 0, -_BITS):
+            node = node[(index >> level) & _MASK]
+        return node
+
+    def _index(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("vector index out of range")
+        return index
+
+    def type_name(self) -> str:
+        return "list"
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PVector(tuple(self)[index])
+        index = self._index(index)
+        return self._leaf_for(index)[index & _MASK]
+
+    def __iter__(self):
+        tail_offset = self._tail_offset()
+        for start in range(0, tail_offset, _WIDTH):
+            yield from self._leaf_for(start)
+        yield from self._tail
+
+    # --- updates ---
+
+    def conj(self, value):
+        """A new vector with `value` appended."""
+        if len(self._tail) < _WIDTH:
+            return PVector._make(self._count + 1, self._shift, self._root, self._tail + (value,))
+        shift = self._shift
+        if (self._count >> _BITS) > (1 << shift):
+            # The trie is full: grow a level above the current root.
+            root = (self._root, _new_path(shift, self._tail))
+            shift += _BITS
+        else:
+            root = _push_tail(self._count, shift, self._root, self._tail)
+        return PVector._make(self._count + 1, shift, root, (value,))
+
+    def assoc(self, index, value):
+        """A new vector with position `index` set to `value`; `len(v)` appends."""
+        if index == self._count:
+            return self.conj(value)
+        index = self._index(index)
+        if index >= self._tail_offset():
+            tail = list(self._tail)
+            tail[index & _MASK] = value
+            return PVector._make(self._count, self._shift, self._root, tuple(tail))
+        return PVector._make(self._count, self._shift, _assoc_path(self._shift, self._root, index, value), self._tail)
+
+    def extend(self, values):
+        vector = self
+        for value in values:
+            vector = vector.conj(value)
+        return vector
+
+    # --- value semantics ---
+
+    def __eq__(self, other):
+        if isinstance(other, (PVector, list, tuple)):
+            return len(other) == self._count and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __add__(self, other):
+        if isinstance(other, (PVector, list, tuple)):
+            return self.extend(other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, (list, tuple)):
+            return PVector(other).extend(self)
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _new_path(shift, node):
+    for _ in range(0, shift, _BITS):
+        node = (node,)
+    return node
+
+
+def _push_tail(count, shift, parent, tail):
+    subindex = ((count - 1) >> shift) & _MASK
+    if shift == _BITS:
+        child = tail
+    elif subindex < len(parent):
+        child = _push_tail(count, shift - _BITS, parent[subindex], tail)
+    else:
+        child = _new_path(shift - _BITS, tail)
+    if subindex < len(parent):
+        return parent[:subindex] + (child,) + parent[subindex + 1:]
+    return parent + (child,)
+
+
+def _assoc_path(shift, node, index, value):
+    subindex = (index >> shift) & _MASK
+    if shift == 0:
+        child = value
+    else:
+        child = _assoc_path(shift - _BITS, node[subindex], index, value)
+    return node[:subindex] + (child,) + node[subindex + 1:]
+
+
+# ====== Map ======
+
+class _Bitmap:
+    """A trie node: `entries` holds a (key, value, order) entry or a child node per set bit."""
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collision:
+    """Entries whose keys share one full hash."""
+
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, key_hash, entries):
+        self.hash = key_hash
+        self.entries = entries
+
+
+_EMPTY_NODE = _Bitmap(0, ())
+
+
+def _hash(key):
+    return hash(key) & _HASH_MASK
+
+
+def _find(node, key, key_hash):
+    """The (key, value, order) entry for `key`, or None."""
+    shift = 0
+    while True:
+        if type(node) is _Collision:
+            for entry in node.entries:
+                if entry[0] == key:
+                    return entry
+            return None
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return None
+        entry = node.entries[_popcount(node.bitmap & (bit - 1))]
+        if type(entry) is tuple:
+            return entry if entry[0] == key else None
+        node = entry
+        shift += _BITS
+
+
+def _merge(shift, first, first_hash, second, second_hash):
+    if first_hash == second_hash or shift >= 64:
+        return _Collision(first_hash, (first, second))
+    first_bit = (first_hash >> shift) & _MASK
+    second_bit = (second_hash >> shift) & _MASK
+    if first_bit == second_bit:
+        return _Bitmap(1 << first_bit, (_merge(shift + _BITS, first, first_hash, second, second_hash),))
+    entries = (first, second) if first_bit < second_bit else (second, first)
+    return _Bitmap((1 << first_bit) | (1 << second_bit), entries)
+
+
+def _assoc(node, shift, key, key_hash, value, order):
+    """
+    Returns (new node, the entry stored), or (node, None) when nothing
+    changed. A new key is stored with `order`; replacing a value keeps the
+    key's original position.
+    """
+    if type(node) is _Collision:
+        if key_hash != node.hash:
+            # Push the collision node one level down beside the new entry.
+            bit = 1 << ((node.hash >> shift) & _MASK)
+            return _assoc(_Bitmap(bit, (node,)), shift, key, key_hash, value, order)
+        for i, entry in enumerate(node.entries):
+            if entry[0] == key:
+                stored = (key, value, entry[2])
+                return _Collision(key_hash, node.entries[:i] + (stored,) + node.entries[i + 1:]), stored
+        stored = (key, value, order)
+        return _Collision(key_hash, node.entries + (stored,)), stored
+
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    position = _popcount(node.bitmap & (bit - 1))
+    entries = node.entries
+    if not node.bitmap & bit:
+        stored = (key, value, order)
+        return _Bitmap(node.bitmap | bit, entries[:position] + (stored,) + entries[position:]), stored
+
+    entry = entries[position]
+    if type(entry) is tuple:
+        if entry[0] == key:
+            if entry[1] is value:
+                return node, None
+            child = stored = (key, value, entry[2])
+        else:
+            stored = (key, value, order)
+            child = _merge(shift + _BITS, entry, _hash(entry[0]), stored, key_hash)
+    else:
+        child, stored = _assoc(entry, shift + _BITS, key, key_hash, value, order)
+        if stored is None:
+            return node, None
+    return _Bitmap(node.bitmap, entries[:position] + (child,) + entries[position + 1:]), stored
+
+
+def _dissoc(node, shift, key, key_hash):
+    """
+    Returns (the node without `key`, the entry removed): the node is None
+    if it became empty, and (node, None) means `key` was absent.
+    """
+    if type(node) is _Collision:
+        for i, entry in enumerate(node.entries):
+            if entry[0] == key:
+                entries = node.entries[:i] + node.entries[i + 1:]
+                if len(entries) == 1:
+                    return _Bitmap(1 << ((key_hash >> shift) & _MASK), entries), entry
+                return _Collision(node.hash, entries), entry
+        return node, None
+
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node, None
+    position = _popcount(node.bitmap & (bit - 1))
+    entry = node.entries[position]
+    if type(entry) is tuple:
+        if entry[0] != key:
+            return node, None
+        child, removed = None, entry
+    else:
+        child, removed = _dissoc(entry, shift + _BITS, key, key_hash)
+        if removed is None:
+            return node, None
+        # Pull a lone remaining entry up so lookups stay short.
+        if child is not None and type(child) is _Bitmap and len(child.entries) == 1 \
+                and type(child.entries[0]) is tuple:
+            child = child.entries[0]
+
+    entries = node.entries
+    if child is None:
+        if node.bitmap == bit:
+            return None, removed
+        return _Bitmap(node.bitmap & ~bit, entries[:position] + entries[position + 1:]), removed
+    return _Bitmap(node.bitmap, entries[:position] + (child,) + entries[position + 1:]), removed
+
+
+def _entries(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        for entry in reversed(node.entries):
+            if type(entry) is tuple:
+                yield entry
+            else:
+                stack.append(entry)
+
+
+class PMap(Mapping):
+    __slots__ = ("_root", "_count", "_order", "_hash")
+
+    def __init__(self, items=()):
+        root, order = _EMPTY_NODE, []
+        pairs = items.items() if isinstance(items, Mapping) else items
+        for key, value in pairs:
+            root, stored = _assoc(root, 0, key, _hash(key), value, len(order))
+            if stored is None:
+                continue
+            if stored[2] == len(order):
+                order.append(stored)
+            else:
+                order[stored[2]] = stored
+        self._root = root
+        self._count = len(order)
+        self._order = PVector(order)
+        self._hash = None
+
+    @classmethod
+    def _make(cls, root, count, order):
+        mapping = object.__new__(cls)
+        mapping._root = root
+        mapping._count = count
+        mapping._order = order
+        mapping._hash = None
+        return mapping
+
+    def type_name(self) -> str:
+        return "dict"
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        entry = _find(self._root, key, _hash(key))
+        if entry is None:
+            raise KeyError(key)
+        return entry[1]
+
+    def __contains__(self, key):
+        return _find(self._root, key, _hash(key)) is not None
+
+    def get(self, key, default=None):
+        entry = _find(self._root, key, _hash(key))
+        return default if entry is None else entry[1]
+
+    def _live(self):
+        # Removed keys leave _MISSING in the order vector.
+        return (entry for entry in self._order if entry is not _MISSING)
+
+    def __iter__(self):
+        return (entry[0] for entry in self._live())
+
+    def items(self):
+        return [(key, value) for key, value, _ in self._live()]
+
+    def values(self):
+        return [entry[1] for entry in self._live()]
+
+    # --- updates ---
+
+    def assoc(self, key, value):
+        """A new map with `key` bound to `value`."""
+        order = self._order
+        root, stored = _assoc(self._root, 0, key, _hash(key), value, len(order))
+        if stored is None:
+            return self
+        if stored[2] == len(order):
+            return PMap._make(root, self._count + 1, order.conj(stored))
+        return PMap._make(root, self._count, order.assoc(stored[2], stored))
+
+    def dissoc(self, key):
+        """A new map without `key`; the same map if it was absent."""
+        root, removed = _dissoc(self._root, 0, key, _hash(key))
+        if removed is None:
+            return self
+        count = self._count - 1
+        if len(self._order) > 4 * count + _WIDTH:
+            # Mostly tombstones: rebuild so iteration stays proportional to the size.
+            return PMap(entry[:2] for entry in self._live() if entry is not removed)
+        return PMap._make(_EMPTY_NODE if root is None else root, count, self._order.assoc(removed[2], _MISSING))
+
+    # --- value semantics ---
+
+    def __eq__(self, other):
+        if isinstance(other, (PMap, dict)):
+            if len(other) != self._count:
+                return False
+            for key, value, _ in _entries(self._root):
+                if other.get(key, _MISSING) != value:
+                    return False
+            return True
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset((key, value) for key, value, _ in _entries(self._root)))
+        return self._hash
+
+    def __repr__(self):
+        return repr(dict(self.items()))
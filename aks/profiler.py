@@ -0,0 +1,250 @@
+"""
+profiler.py — Statement-Level Profiler for AkshayaLang
+
+Python's profilers only see a wall of `evaluate` frames. This one
+attributes time to the .aks source instead: every statement is labelled
+`function:line` from the position the parser recorded for it, and a stack
+is the chain of statements running at a moment, outermost first.
+
+Modes:
+    "deterministic" — Blocks are swapped to a timed variant that measures
+                      every statement it runs. Hit counts and times are
+                      exact, at a few times the normal run time.
+    "sampling"      — nothing is instrumented. A background thread reads
+                      the statement each Block is on from the running
+                      thread's Python stack every `interval` seconds.
+                      Overhead is small; counts are samples, not hits.
+                      The thread only gets to look when the running thread
+                      yields the GIL, so intervals much below
+                      sys.getswitchinterval() are not honored.
+
+Results come out as folded stacks (`folded`, one "a;b;c value" line per
+stack, as read by flamegraph.pl and speedscope) or as a per-line report.
+Profiling needs the tree backend.
+"""
+
+import sys
+import threading
+import time
+
+from aks.ast import Block, Program, FunctionDeclaration, Completion, child_nodes
+
+MODES = ("deterministic", "sampling")
+MAIN = "<main>"
+DEFAULT_INTERVAL = 0.005
+
+
+def _blocks(tree):
+    """(block, enclosing function name) for every Block and Program in `tree`."""
+    stack = [(tree, MAIN)]
+    while stack:
+        node, function = stack.pop()
+        if isinstance(node, FunctionDeclaration):
+            function = node.name
+        if isinstance(node, (Block, Program)):
+            yield node, function
+        stack.extend((child, function) for child in child_nodes(node))
+
+
+def _frame(label):
+    function, line = label
+    return f"{function}:{'?' if line is None else line}"
+
+
+def _timed_evaluate(self, context):
+    run = self.profiler.run
+    result = None
+    for statement in self.statements:
+        result = run(statement, context)
+        if type(result) is Completion:
+            return result
+    return result
+
+
+class TimedBlock(Block):
+    evaluate = _timed_evaluate
+
+
+class TimedProgram(Program):
+    evaluate = _timed_evaluate
+
+
+_TIMED = {Block: TimedBlock, Program: TimedProgram}
+
+
+class Profiler:
+    """
+    Collects a profile of the programs it is prepared for and run under:
+
+        profiler = Profiler("sampling")
+        Interpreter(profiler=profiler).run(code)
+        print(profiler.report())
+
+    `lines` maps each (function, line) to [hits, self, total]. In
+    deterministic mode hits are executions and times are seconds; in
+    sampling mode all three are sample counts.
+    """
+
+    def __init__(self, mode="deterministic", interval=DEFAULT_INTERVAL):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}', expected one of {MODES}")
+        self.mode = mode
+        self.interval = interval
+        self.source = None
+        self.lines = {}
+        self.stacks = {}
+        self.samples = 0
+        self.wall = 0.0
+        self._labels = {}
+        # Labelled statements stay referenced so their ids are never reused.
+        self._statements = []
+        self._stack = []
+        self._nested = []
+        self._active = {}
+        self._started = None
+        self._sampler = None
+        self._stopped = None
+
+    # ====== Setup ======
+
+    def prepare(self, tree):
+        """Label the statements of `tree`; in deterministic mode also time its blocks."""
+        for block, function in _blocks(tree):
+            for statement in block.statements:
+                position = statement.position
+                self._labels[id(statement)] = (function, position[0] if position else None)
+                self._statements.append(statement)
+            if self.mode == "deterministic":
+                timed = _TIMED.get(type(block))
+                if timed is not None:
+                    block.__class__ = timed
+                block.profiler = self
+        return tree
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        if self.mode == "sampling":
+            self._stopped = threading.Event()
+            self._sampler = threading.Thread(
+                target=self._sample_loop, args=(threading.get_ident(),),
+                name="aks-profiler", daemon=True,
+            )
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._sampler is not None:
+            self._stopped.set()
+            self._sampler.join()
+            self._sampler = None
+        self.wall += time.perf_counter() - self._started
+        return False
+
+    # ====== Deterministic mode ======
+
+    def run(self, statement, context):
+        """Evaluate one statement and charge its time to its label."""
+        label = self._labels[id(statement)]
+        stack = self._stack
+        nested = self._nested
+        active = self._active
+        stack.append(label)
+        nested.append(0.0)
+        active[label] = active.get(label, 0) + 1
+        start = time.perf_counter()
+        try:
+            return statement.evaluate(context)
+        finally:
+            elapsed = time.perf_counter() - start
+            key = tuple(stack)
+            stack.pop()
+            own = elapsed - nested.pop()
+            if nested:
+                nested[-1] += elapsed
+            active[label] -= 1
+
+            stats = self.lines.get(label)
+            if stats is None:
+                stats = self.lines[label] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += own
+            # A recursive line counts once, at its outermost activation.
+            if not active[label]:
+                stats[2] += elapsed
+            self.stacks[key] = self.stacks.get(key, 0.0) + own
+
+    # ====== Sampling mode ======
+
+    def _sample_loop(self, thread_id):
+        # Both loops keep their current statement in a local named `stmt`.
+        loops = {Block.evaluate.__code__, Program.evaluate.__code__}
+        labels = self._labels
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                if frame.f_code in loops:
+                    label = labels.get(id(frame.f_locals.get("stmt")))
+                    if label is not None:
+                        stack.append(label)
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self._record(tuple(stack))
+
+    def _record(self, stack):
+        self.samples += 1
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        for label in set(stack):
+            stats = self.lines.get(label)
+            if stats is None:
+                stats = self.lines[label] = [0, 0, 0]
+            stats[2] += 1
+        stats = self.lines[stack[-1]]
+        stats[0] += 1
+        stats[1] += 1
+
+    # ====== Output ======
+
+    def folded(self):
+        """
+        Folded stacks, one "frame;frame;... value" line each. Values are
+        microseconds of self time, or samples in sampling mode.
+        """
+        lines = []
+        for stack, value in self.stacks.items():
+            if self.mode == "deterministic":
+                value = round(value * 1e6)
+            if value:
+                lines.append(f"{';'.join(_frame(label) for label in stack)} {value}")
+        lines.sort()
+        return lines
+
+    def write_folded(self, sink):
+        for line in self.folded():
+            sink.write(line + "\n")
+
+    def report(self, source=None):
+        """A per-line table of hits and self/total milliseconds, annotated with `source`."""
+        source = self.source if source is None else source
+        text = source.splitlines() if source else []
+        sampling = self.mode == "sampling"
+        # Samples are turned into time by sharing the wall time out evenly.
+        scale = 1000.0 * (self.wall / self.samples if sampling and self.samples else 1.0)
+
+        title = f"Profile ({self.mode}): {self.wall:.3f}s wall"
+        if sampling:
+            title += f", {self.samples} samples"
+        rows = [
+            title,
+            f"{'line':>6}  {'function':<16} {'samples' if sampling else 'hits':>10} "
+            f"{'self ms':>10} {'total ms':>10}  source",
+        ]
+        for (function, line), (hits, own, total) in sorted(
+                self.lines.items(), key=lambda item: (item[0][1] or 0, item[0][0])):
+            code = text[line - 1].strip() if line and line <= len(text) else ""
+            rows.append(
+                f"{'?' if line is None else line:>6}  {function:<16} {hits:>10} "
+                f"{own * scale:>10.2f} {total * scale:>10.2f}  {code}"
+            )
+        return "\n".join(rows)
@@ -0,0 +1,175 @@
+"""
+resolver.py — Static Scope Resolution for AkshayaLang
+
+Annotates every Identifier, BindStatement, AssignmentStatement and
+FunctionDeclaration with an `address`:
+
+    (depth, slot) — a function-local name. `depth` is how many enclosing
+                    function frames to hop, and `slot` indexes that frame.
+    None          — a global, looked up in the ExecutionContext.
+
+A frame is a fixed-size list. Slot 0 links to the frame of the function
+that lexically encloses it, and slots 1..n hold parameters first, then
+the names bound anywhere in the function body. `bind` always declares a
+local; `x = ...` declares one only when no enclosing function binds `x`,
+so closures can update the state they captured. Resolved functions close
+over the scope that defines them, not the caller's scope. A variable
+read therefore costs the same at any call depth.
+"""
+
+from aks.ast import (
+    BindStatement, AssignmentStatement, IfStatement, WhileStatement,
+    FunctionDeclaration, Identifier, Block, Program, child_nodes
+)
+
+
+def bound_names(block, params=(), assignments=True):
+    """
+    Names local to a function body: parameters first, then every name
+    bound in it. With `assignments=False`, only `bind` and `fn` declare.
+    """
+    names = list(params)
+    seen = set(names)
+    stack = [block]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BindStatement):
+            name = node.identifier.name
+        elif isinstance(node, AssignmentStatement):
+            name = node.name if assignments else None
+        elif isinstance(node, FunctionDeclaration):
+            name = node.name
+        else:
+            name = None
+        if name is not None and name not in seen:
+            seen.add(name)
+            names.append(name)
+        # Nested function bodies get their own scope.
+        if isinstance(node, (Block, Program)):
+            stack.extend(reversed(node.statements))
+        elif isinstance(node, IfStatement):
+            stack.append(node.then_branch)
+            if node.else_branch is not None:
+                stack.append(node.else_branch)
+        elif isinstance(node, WhileStatement):
+            stack.append(node.body)
+    return names
+
+
+def dynamic_names(block):
+    """Names some function in `block` reads without binding while another binds them locally."""
+    bound, free = set(), set()
+    functions = []
+    stack = [block]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, FunctionDeclaration):
+            functions.append(node)
+        stack.extend(child_nodes(node))
+    for function in functions:
+        local_names = set(bound_names(function.body, function.params))
+        bound |= local_names
+        stack = [function.body]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Identifier) and node.name not in local_names:
+                free.add(node.name)
+            elif not isinstance(node, FunctionDeclaration):
+                stack.extend(child_nodes(node))
+    return frozenset(bound & free)
+
+
+class Resolver:
+    def __init__(self):
+        # One {name: slot} dict per enclosing function, innermost last.
+        self._scopes = []
+
+    def resolve(self, node):
+        method = getattr(self, f"_visit_{type(node).__name__}", None)
+        if method is not None:
+            method(node)
+        return node
+
+    def _address(self, name):
+        for depth, scope in enumerate(reversed(self._scopes)):
+            if name in scope:
+                return (depth, scope[name])
+        return None
+
+    def _visit_Block(self, node):
+        for statement in node.statements:
+            self.resolve(statement)
+
+    _visit_Program = _visit_Block
+
+    def _visit_Identifier(self, node):
+        node.address = self._address(node.name)
+
+    def _visit_BindStatement(self, node):
+        self.resolve(node.expression)
+        node.address = node.identifier.address = self._address(node.identifier.name)
+
+    def _visit_AssignmentStatement(self, node):
+        self.resolve(node.expression)
+        node.address = self._address(node.name)
+
+    def _visit_FunctionDeclaration(self, node):
+        node.address = self._address(node.name)
+        names = bound_names(node.body, node.params, assignments=False)
+        # `x = ...` updates an enclosing function's `x` when there is one;
+        # otherwise it declares a local, as it does under dynamic scoping.
+        for name in bound_names(node.body):
+            if name not in names and self._address(name) is None:
+                names.append(name)
+        node.frame_size = len(names) + 1
+        self._scopes.append({name: slot for slot, name in enumerate(names, start=1)})
+        try:
+            self.resolve(node.body)
+        finally:
+            self._scopes.pop()
+
+    def _visit_IfStatement(self, node):
+        self.resolve(node.condition)
+        self.resolve(node.then_branch)
+        if node.else_branch is not None:
+            self.resolve(node.else_branch)
+
+    def _visit_WhileStatement(self, node):
+        self.resolve(node.condition)
+        self.resolve(node.body)
+
+    def _visit_ReturnStatement(self, node):
+        self.resolve(node.value)
+
+    def _visit_MirrorStatement(self, node):
+        self.resolve(node.expression)
+
+    def _visit_BinaryExpression(self, node):
+        self.resolve(node.left)
+        self.resolve(node.right)
+
+    def _visit_UnaryExpression(self, node):
+        self.resolve(node.operand)
+
+    def _visit_FunctionCall(self, node):
+        self.resolve(node.callee)
+        for argument in node.arguments:
+            self.resolve(argument)
+
+    def _visit_IndexExpression(self, node):
+        self.resolve(node.target)
+        self.resolve(node.index)
+
+    def _visit_ListLiteral(self, node):
+        for element in node.elements:
+            self.resolve(element)
+
+    def _visit_DictLiteral(self, node):
+        for key, value in node.pairs:
+            self.resolve(key)
+            self.resolve(value)
+
+
+def resolve(block):
+    """Annotate `block` in place with static variable addresses and return it."""
+    return Resolver().resolve(block)
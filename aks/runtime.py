@@ -5,8 +5,10 @@ from aks.ast import (
     NumberLiteral, StringLiteral, BooleanLiteral, 
     Identifier, BinaryExpression, AssignmentStatement,
     FunctionCall, BindStatement, Program, 
-    ListLiteral, DictLiteral
+    ListLiteral, DictLiteral, UserFunction, BINARY_OPERATORS, Completion, unwrap,
+    UNBOUND, load_slot, store_slot
 )
+from aks.persistent import PVector, PMap
 
 class Runtime:
     """
@@ -19,7 +21,7 @@ class Runtime:
         self.context = context or ExecutionContext()
 
     def execute(self, node):
-        return node.evaluate(self.context)
+        return unwrap(node.evaluate(self.context))
 
 # =====================
 # Evaluation Extensions
@@ -35,53 +37,73 @@ def _eval_boolean(self, context):
     return self.value
 
 def _eval_identifier(self, context):
+    if self.address is not None:
+        value = load_slot(context.slots, self.address)
+        if value is UNBOUND:
+            raise NameError(f"Variable '{self.name}' is not defined.")
+        return value
     return context.get_variable(self.name)
 
 def _eval_binary_op(self, context):
     left = self.left.evaluate(context)
-    right = self.right.evaluate(context)
-
-    if self.operator == "+":
-        return left + right
-    elif self.operator == "-":
-        return left - right
-    elif self.operator == "*":
-        return left * right
-    elif self.operator == "/":
-        return left / right
-    elif self.operator == "%":
-        return left % right
-    else:
+
+    # Logical operators short-circuit: the right operand may never run.
+    if self.operator == "and":
+        return left and self.right.evaluate(context)
+    if self.operator == "or":
+        return left or self.right.evaluate(context)
+
+    op = BINARY_OPERATORS.get(self.operator)
+    if op is None:
         raise ValueError(f"Unsupported operator '{self.operator}'")
+    return op(left, self.right.evaluate(context))
 
 def _eval_assignment(self, context):
     value = self.expression.evaluate(context)
-    context.set_variable(self.name, value)
+    if self.address is not None:
+        store_slot(context.slots, self.address, value)
+    else:
+        context.set_variable(self.name, value)
     return value
 
 def _eval_bind(self, context):
     value = self.expression.evaluate(context)
-    context.set_variable(self.identifier.name, value)
+    if self.address is not None:
+        store_slot(context.slots, self.address, value)
+    else:
+        context.set_variable(self.identifier.name, value)
     return value
 
 def _eval_call(self, context):
+    if isinstance(self.callee, Identifier) and self.callee.address is None:
+        func = context.get_callable(self.callee.name)
+    else:
+        func = self.callee.evaluate(context)
     args = [arg.evaluate(context) for arg in self.arguments]
-    return context.call_function(self.name, args)
+    if isinstance(func, UserFunction):
+        return func.call(args, context)
+    return func(*args)
 
 def _eval_program(self, context):
     result = None
     for stmt in self.statements:
         result = stmt.evaluate(context)
+        if type(result) is Completion:
+            return result
     return result
 
 def _eval_list(self, context):
-    return [element.evaluate(context) for element in self.elements]
+    if self.constant_elements is not None:
+        return PVector(self.constant_elements)
+    return PVector([element.evaluate(context) for element in self.elements])
 
 def _eval_dict(self, context):
-    return {
-        k.evaluate(context) if hasattr(k, "evaluate") else str(k): v.evaluate(context)
+    if self.const_keys is not None:
+        return PMap(zip(self.const_keys, [v.evaluate(context) for _, v in self.pairs]))
+    return PMap([
+        (k.evaluate(context) if hasattr(k, "evaluate") else str(k), v.evaluate(context))
         for k, v in self.pairs
-    }
+    ])
 
 # ====================
 # Bind evaluations
@@ -0,0 +1,190 @@
+"""
+serialize.py — Iterative Value Serializer for `mirror`
+
+Turns AkshayaLang values into plain Python data (`normalize`) or writes
+them to a file-like sink as JSON or text (`dump`). Both walk the value
+with an explicit stack, so nesting depth is bounded only by memory, and
+both track the containers on the current path, so a container reached
+again from inside itself becomes CYCLE instead of looping forever.
+Shared but acyclic substructure is written out at every place it occurs.
+
+`dump` never builds the normalized copy: it writes as it walks, through a
+buffer flushed every BUFFER_SIZE characters, and writes ropes chunk by
+chunk. Mirroring a huge state therefore holds one extra buffer rather
+than a second copy of the state.
+
+When the root ExecutionContext has a `mirror_sink`, a `mirror` statement
+streams its value there as one JSON line and evaluates to the value
+itself; otherwise it evaluates to the normalized copy.
+"""
+
+import json
+
+from aks.persistent import PVector, PMap
+from aks.types import AKSRope
+
+CYCLE = "<cycle>"
+BUFFER_SIZE = 1 << 16
+FORMATS = ("json", "text")
+
+_MAPPINGS = (dict, PMap)
+_SEQUENCES = (list, tuple, PVector)
+
+
+def _scalar(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def _key(key):
+    if type(key) is str:
+        return key
+    if hasattr(key, "value"):
+        return str(key.value)
+    from aks.ast import Identifier  # aks.ast imports this module
+    return key.name if isinstance(key, Identifier) else str(key)
+
+
+def _children(container):
+    """(key, value) pairs of a container; keys are None for sequences."""
+    if isinstance(container, _MAPPINGS):
+        return iter(container.items())
+    return ((None, item) for item in container)
+
+
+def normalize(value):
+    """Unwrap symbolic values into plain Python data for mirroring."""
+    if not isinstance(value, _MAPPINGS + _SEQUENCES):
+        return _scalar(value)
+
+    result = {} if isinstance(value, _MAPPINGS) else []
+    on_path = {id(value)}
+    stack = [(value, result, _children(value))]
+    while stack:
+        source, target, children = stack[-1]
+        for key, child in children:
+            descend = isinstance(child, _MAPPINGS + _SEQUENCES) and id(child) not in on_path
+            if descend:
+                converted = {} if isinstance(child, _MAPPINGS) else []
+            elif isinstance(child, _MAPPINGS + _SEQUENCES):
+                converted = CYCLE
+            else:
+                converted = _scalar(child)
+
+            if key is None:
+                target.append(converted)
+            else:
+                target[_key(key)] = converted
+
+            if descend:
+                on_path.add(id(child))
+                stack.append((child, converted, _children(child)))
+                break
+        else:
+            stack.pop()
+            on_path.discard(id(source))
+    return result
+
+
+class _Writer:
+    """Buffers small writes to a sink."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.parts = []
+        self.size = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.sink.write("".join(self.parts))
+            self.parts = []
+            self.size = 0
+
+
+def _json_scalar(value):
+    # Unknown objects (functions, say) are written as their str().
+    return json.dumps(_scalar(value), default=str)
+
+
+def _write_json_string(out, value):
+    if isinstance(value, AKSRope):
+        out.write('"')
+        for chunk in value.chunks():
+            out.write(json.dumps(chunk)[1:-1])
+        out.write('"')
+    else:
+        out.write(_json_scalar(value))
+
+
+def dump(value, sink, format="json"):
+    """
+    Write `value` to `sink` (anything with a `write(str)` method) as JSON,
+    or as Python-literal text with `format="text"`, without building an
+    intermediate copy.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format '{format}', expected one of {FORMATS}")
+    as_json = format == "json"
+    out = _Writer(sink)
+
+    def write_scalar(item):
+        if as_json:
+            _write_json_string(out, item)
+        else:
+            out.write(repr(_scalar(item)))
+
+    def write_key(key):
+        out.write(json.dumps(_key(key)) if as_json else repr(_key(key)))
+        out.write(": " if not as_json else ":")
+
+    separator = ", " if not as_json else ","
+    if not isinstance(value, _MAPPINGS + _SEQUENCES):
+        write_scalar(value)
+        out.flush()
+        return
+
+    on_path = {id(value)}
+    out.write("{" if isinstance(value, _MAPPINGS) else "[")
+    # Each frame: (container, its children, closing bracket, written any yet?)
+    stack = [[value, _children(value), "}" if isinstance(value, _MAPPINGS) else "]", False]]
+    while stack:
+        frame = stack[-1]
+        for key, child in frame[1]:
+            if frame[3]:
+                out.write(separator)
+            frame[3] = True
+            if key is not None:
+                write_key(key)
+            if not isinstance(child, _MAPPINGS + _SEQUENCES):
+                write_scalar(child)
+                continue
+            if id(child) in on_path:
+                write_scalar(CYCLE)
+                continue
+            is_mapping = isinstance(child, _MAPPINGS)
+            out.write("{" if is_mapping else "[")
+            on_path.add(id(child))
+            stack.append([child, _children(child), "}" if is_mapping else "]", False])
+            break
+        else:
+            stack.pop()
+            on_path.discard(id(frame[0]))
+            out.write(frame[2])
+    out.flush()
+
+
+def mirror(value, context):
+    """The result of a `mirror` statement evaluating to `value` in `context`."""
+    while context.parent is not None:
+        context = context.parent
+    sink = getattr(context, "mirror_sink", None)
+    if sink is None:
+        return normalize(value)
+    dump(value, sink)
+    sink.write("\n")
+    return value
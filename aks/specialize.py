@@ -0,0 +1,388 @@
+"""
+specialize.py — Self-Specializing AST Nodes for AkshayaLang
+
+Quickening for the tree walker. `Specializer.prepare` swaps candidate
+nodes to an uninitialized class. On first execution each one rewrites
+its own `__class__` to a variant specialized for what it observed:
+
+    BinaryExpression  → IntAddNode, FloatLtNode, … (both operands int / float)
+                        IntAddConstNode, …    (int op int literal, likewise float)
+                        StrAddNode            (string concatenation)
+    Identifier        → LocalIdentifierNode   (found in the running frame)
+                        GlobalIdentifierNode  (cached root variable table)
+    FunctionCall      → GlobalCallNode        (callee from the root table)
+
+Every specialized node guards its assumption. When the guard fails, the
+node deoptimizes for good back to the generic class, so a polymorphic
+site settles instead of flip-flopping. Parents keep pointing at the same
+node object throughout, so no tree surgery is needed.
+
+A global read or callee is only cached for names that no function in the
+program binds or takes as a parameter. No call frame can shadow such a name,
+even under dynamic scoping.
+"""
+
+import operator
+import weakref
+
+from aks.ast import (
+    BinaryExpression, Identifier, NumberLiteral, FunctionCall, UserFunction, BINARY_OPERATORS
+)
+from aks.resolver import bound_names
+from aks.types import add
+
+
+class SpecializationStats:
+    __slots__ = ("specialized", "deoptimized")
+
+    def __init__(self):
+        self.specialized = 0
+        self.deoptimized = 0
+
+    def __repr__(self):
+        return f"SpecializationStats(specialized={self.specialized}, deoptimized={self.deoptimized})"
+
+
+# ====== Binary expressions ======
+
+class UninitializedBinaryNode(BinaryExpression):
+    def evaluate(self, context):
+        left = self.left.evaluate(context)
+        right = self.right.evaluate(context)
+        kind = type(left)
+        node_class = None
+        if kind is type(right):
+            if type(self.right) is NumberLiteral:
+                node_class = _SPECIALIZED_CONST_BINARY.get((kind, self.operator))
+            else:
+                node_class = _SPECIALIZED_BINARY.get((kind, self.operator))
+        if node_class is None:
+            self.__class__ = BinaryExpression
+        else:
+            self.__class__ = node_class
+            self.stats.specialized += 1
+        return BINARY_OPERATORS[self.operator](left, right)
+
+
+class SpecializedBinaryNode(BinaryExpression):
+    def deoptimize(self, left, right):
+        self.__class__ = BinaryExpression
+        self.stats.deoptimized += 1
+        return BINARY_OPERATORS[self.operator](left, right)
+
+
+def _binary_node(name, kind, op):
+    def evaluate(self, context):
+        left = self.left.evaluate(context)
+        right = self.right.evaluate(context)
+        if type(left) is kind and type(right) is kind:
+            return op(left, right)
+        return self.deoptimize(left, right)
+
+    return type(name, (SpecializedBinaryNode,), {"evaluate": evaluate})
+
+
+def _binary_const_node(name, kind, op):
+    # The right operand is a literal, so only the left one needs a guard.
+    def evaluate(self, context):
+        left = self.left.evaluate(context)
+        if type(left) is kind:
+            return op(left, self.right.value)
+        return self.deoptimize(left, self.right.value)
+
+    return type(name, (SpecializedBinaryNode,), {"evaluate": evaluate})
+
+
+# `+` and `<` dominate loop counters and accumulators, so they skip the operator call.
+def _add_node(name, kind):
+    def evaluate(self, context):
+        left = self.left.evaluate(context)
+        right = self.right.evaluate(context)
+        if type(left) is kind and type(right) is kind:
+            return left + right
+        return self.deoptimize(left, right)
+
+    return type(name, (SpecializedBinaryNode,), {"evaluate": evaluate})
+
+
+def _lt_node(name, kind):
+    def evaluate(self, context):
+        left = self.left.evaluate(context)
+        right = self.right.evaluate(context)
+        if type(left) is kind and type(right) is kind:
+            return left < right
+        return self.deoptimize(left, right)
+
+    return type(name, (SpecializedBinaryNode,), {"evaluate": evaluate})
+
+
+def _add_const_node(name, kind):
+    def evaluate(self, context):
+        left = self.left.evaluate(context)
+        if type(left) is kind:
+            return left + self.right.value
+        return self.deoptimize(left, self.right.value)
+
+    return type(name, (SpecializedBinaryNode,), {"evaluate": evaluate})
+
+
+def _lt_const_node(name, kind):
+    def evaluate(self, context):
+        left = self.left.evaluate(context)
+        if type(left) is kind:
+            return left < self.right.value
+        return self.deoptimize(left, self.right.value)
+
+    return type(name, (SpecializedBinaryNode,), {"evaluate": evaluate})
+
+
+_OPERATORS = {
+    '-': ("Sub", operator.sub),
+    '*': ("Mul", operator.mul),
+    '/': ("Div", operator.truediv),
+    '%': ("Mod", operator.mod),
+    '>': ("Gt", operator.gt),
+    '<=': ("Le", operator.le),
+    '>=': ("Ge", operator.ge),
+    '==': ("Eq", operator.eq),
+    '!=': ("Ne", operator.ne),
+}
+
+
+def _numeric_nodes(prefix, kind):
+    """Plain and constant-operand node classes for one numeric type, keyed by operator."""
+    nodes = {'+': _add_node(f"{prefix}AddNode", kind), '<': _lt_node(f"{prefix}LtNode", kind)}
+    const_nodes = {
+        '+': _add_const_node(f"{prefix}AddConstNode", kind),
+        '<': _lt_const_node(f"{prefix}LtConstNode", kind),
+    }
+    for symbol, (name, op) in _OPERATORS.items():
+        nodes[symbol] = _binary_node(f"{prefix}{name}Node", kind, op)
+        const_nodes[symbol] = _binary_const_node(f"{prefix}{name}ConstNode", kind, op)
+    return nodes, const_nodes
+
+
+_FLOAT_NODES, _FLOAT_CONST_NODES = _numeric_nodes("Float", float)
+_INT_NODES, _INT_CONST_NODES = _numeric_nodes("Int", int)
+
+FloatAddNode = _FLOAT_NODES['+']
+FloatLtNode = _FLOAT_NODES['<']
+IntAddNode = _INT_NODES['+']
+IntLtNode = _INT_NODES['<']
+StrAddNode = _binary_node("StrAddNode", str, add)
+
+_SPECIALIZED_BINARY = {
+    **{(float, symbol): node for symbol, node in _FLOAT_NODES.items()},
+    **{(int, symbol): node for symbol, node in _INT_NODES.items()},
+    (str, '+'): StrAddNode,
+}
+
+_SPECIALIZED_CONST_BINARY = {
+    **{(float, symbol): node for symbol, node in _FLOAT_CONST_NODES.items()},
+    **{(int, symbol): node for symbol, node in _INT_CONST_NODES.items()},
+}
+
+
+# ====== Identifiers ======
+
+class UninitializedIdentifierNode(Identifier):
+    def evaluate(self, context):
+        name = self.name
+        if context.parent is not None and name in context.variables:
+            self.__class__ = LocalIdentifierNode
+            self.stats.specialized += 1
+        elif self.globals is not None and name in self.globals:
+            self.__class__ = GlobalIdentifierNode
+            self.stats.specialized += 1
+        else:
+            self.__class__ = Identifier
+        return context.get_variable(name)
+
+
+class LocalIdentifierNode(Identifier):
+    """A name bound in the frame that reads it."""
+
+    def evaluate(self, context):
+        variables = context.variables
+        if self.name in variables:
+            return variables[self.name]
+        self.__class__ = Identifier
+        self.stats.deoptimized += 1
+        return context.get_variable(self.name)
+
+
+class GlobalIdentifierNode(Identifier):
+    """A name only ever bound at top level, read straight from the cached root table."""
+
+    def evaluate(self, context):
+        variables = self.globals
+        if self.name in variables:
+            return variables[self.name]
+        self.__class__ = Identifier
+        self.stats.deoptimized += 1
+        return context.get_variable(self.name)
+
+
+# ====== Calls ======
+
+class UninitializedCallNode(FunctionCall):
+    def _quicken(self):
+        if self.globals is not None and self.callee.name in self.globals:
+            self.__class__ = GlobalCallNode
+            self.stats.specialized += 1
+        else:
+            self.__class__ = FunctionCall
+
+    def evaluate(self, context):
+        self._quicken()
+        return self.evaluate(context)
+
+    def target(self, context):
+        self._quicken()
+        return self.target(context)
+
+
+class GlobalCallNode(FunctionCall):
+    """
+    A call to a function bound at top level. Skips the walk up the dynamic
+    scope chain, which otherwise grows with every level of recursion.
+    """
+
+    def _deoptimize(self):
+        self.__class__ = FunctionCall
+        self.stats.deoptimized += 1
+
+    def evaluate(self, context):
+        try:
+            func = self.globals[self.callee.name]
+        except KeyError:
+            self._deoptimize()
+            return self.evaluate(context)
+        args = [arg.evaluate(context) for arg in self.arguments]
+        if isinstance(func, UserFunction):
+            return func.call(args, context)
+        return func(*args)
+
+    def target(self, context):
+        try:
+            func = self.globals[self.callee.name]
+        except KeyError:
+            self._deoptimize()
+            return self.target(context)
+        return func, [arg.evaluate(context) for arg in self.arguments]
+
+
+# Specialized classes that rely on a name staying global, and their generic forms.
+_GLOBAL_NODES = {GlobalIdentifierNode: Identifier, GlobalCallNode: FunctionCall}
+
+
+# ====== Preparation ======
+
+class Specializer:
+    """
+    Marks nodes of one or more programs for specialization. Keeps the set
+    of names that any function binds, across every program prepared, so a
+    later program can invalidate global caches an earlier one relied on.
+    """
+
+    def __init__(self, context):
+        self.stats = SpecializationStats()
+        # Only a root context's variables are global; a nested one could be shadowed.
+        self.globals = context.variables if context.parent is None else None
+        self.function_locals = set()
+        self._global_candidates = {}
+
+    def prepare(self, block):
+        self._names = []
+        self._new_locals = set()
+        self._visit(block)
+
+        for name in self._new_locals - self.function_locals:
+            for node in self._global_candidates.pop(name, ()):
+                node.globals = None
+                generic = _GLOBAL_NODES.get(type(node))
+                if generic is not None:
+                    node.__class__ = generic
+                    self.stats.deoptimized += 1
+        self.function_locals |= self._new_locals
+
+        for name, node, node_class in self._names:
+            node.stats = self.stats
+            if name in self.function_locals:
+                node.globals = None
+            else:
+                node.globals = self.globals
+                self._global_candidates.setdefault(name, weakref.WeakSet()).add(node)
+            node.__class__ = node_class
+        return block
+
+    def _visit(self, node):
+        method = getattr(self, f"_visit_{type(node).__name__}", None)
+        if method is not None:
+            method(node)
+
+    def _visit_Block(self, node):
+        for statement in node.statements:
+            self._visit(statement)
+
+    _visit_Program = _visit_Block
+
+    def _visit_Identifier(self, node):
+        # Resolved identifiers already have O(1) slot access.
+        if node.address is None:
+            self._names.append((node.name, node, UninitializedIdentifierNode))
+
+    def _visit_BinaryExpression(self, node):
+        self._visit(node.left)
+        self._visit(node.right)
+        if node.operator in BINARY_OPERATORS:
+            node.stats = self.stats
+            node.__class__ = UninitializedBinaryNode
+
+    def _visit_FunctionDeclaration(self, node):
+        self._new_locals.update(bound_names(node.body, node.params))
+        self._visit(node.body)
+
+    def _visit_BindStatement(self, node):
+        self._visit(node.expression)
+
+    _visit_AssignmentStatement = _visit_BindStatement
+    _visit_MirrorStatement = _visit_BindStatement
+
+    def _visit_ReturnStatement(self, node):
+        self._visit(node.value)
+
+    def _visit_IfStatement(self, node):
+        self._visit(node.condition)
+        self._visit(node.then_branch)
+        if node.else_branch is not None:
+            self._visit(node.else_branch)
+
+    def _visit_WhileStatement(self, node):
+        self._visit(node.condition)
+        self._visit(node.body)
+
+    def _visit_UnaryExpression(self, node):
+        self._visit(node.operand)
+
+    def _visit_FunctionCall(self, node):
+        if type(node.callee) is not Identifier:
+            self._visit(node.callee)
+        elif node.callee.address is None:
+            # A bare callee name is looked up with get_callable, not evaluated.
+            self._names.append((node.callee.name, node, UninitializedCallNode))
+        for argument in node.arguments:
+            self._visit(argument)
+
+    def _visit_IndexExpression(self, node):
+        self._visit(node.target)
+        self._visit(node.index)
+
+    def _visit_ListLiteral(self, node):
+        for element in node.elements:
+            self._visit(element)
+
+    def _visit_DictLiteral(self, node):
+        for key, value in node.pairs:
+            self._visit(key)
+            self._visit(value)
@@ -2,41 +2,154 @@
 stdlib.py — AkshayaLang Symbolic Standard Library (Corelib v1.0)
 """
 
+import math
+
 from aks.execution_context import ExecutionContext
-from aks.types import AKSString, AKSNumber, AKSBoolean, AKSNull
+from aks.types import AKSString, AKSBoolean, AKSNull, AKSArray, print_values
+from aks.memoize import MemoizedFunction, memoize
+from aks.persistent import PVector, PMap
 
 
 class StandardLibrary:
     def __init__(self, context: ExecutionContext):
         self.context = context
         self._register_builtins()
+        self._register_context_builtins()
+
+    def fork(self):
+        """
+        A library over a copy of this one's context. Builtins are copied
+        rather than created again; only those bound to a context are.
+        """
+        library = object.__new__(StandardLibrary)
+        library.context = self.context.copy()
+        library._register_context_builtins()
+        return library
 
     def _register_builtins(self):
         # Core I/O
-        self.context.define_function("print", lambda *args: print("🖨️", *args))
+        self.context.define_function("print", lambda *args: print_values("🖨️", *args))
         self.context.define_function("input", lambda prompt="": AKSString(input(prompt)))
 
         # Type coercion
         self.context.define_function("str", lambda x: AKSString(str(x)))
-        self.context.define_function("int", lambda x: AKSNumber(int(x.value)) if hasattr(x, 'value') else AKSNumber(int(x)))
-        self.context.define_function("float", lambda x: AKSNumber(float(x.value)) if hasattr(x, 'value') else AKSNumber(float(x)))
+        # Numbers stay native (see aks.types); boxed arguments are unwrapped.
+        self.context.define_function("int", lambda x: int(x.value) if hasattr(x, 'value') else int(x))
+        self.context.define_function("float", lambda x: float(x.value) if hasattr(x, 'value') else float(x))
         self.context.define_function("bool", lambda x: AKSBoolean(bool(x)))
 
         # Symbolic utilities
         def mirror(*args):
             for arg in args:
-                print("🪞", arg)
+                print_values("🪞", arg)
             return args[-1] if args else AKSNull()
         self.context.define_function("mirror", mirror)
 
         self.context.define_function("type", lambda x: AKSString(x.type_name()) if hasattr(x, "type_name") else AKSString(type(x).__name__))
 
+        # Arrays (NumPy) and reductions
+        self.context.define_function("array", AKSArray.from_values)
+        self.context.define_function("zeros", AKSArray.zeros)
+        self.context.define_function("range_array", AKSArray.arange)
+        self.context.define_function("sum", self._sum)
+        self.context.define_function("mean", self._mean)
+        self.context.define_function("min", self._min)
+        self.context.define_function("max", self._max)
+        self.context.define_function("dot", self._dot)
+
+        # Persistent collections: each returns a new version sharing structure with the old
+        self.context.define_function("assoc", self._assoc)
+        self.context.define_function("dissoc", self._dissoc)
+        self.context.define_function("conj", self._conj)
+
+        # Memoization of pure functions
+        self.context.define_function("memo_stats", self._memo_stats)
+
         # Introspection
         self.context.define_function("whoami", lambda: AKSString("AkshayaLang v1.0 :: Sovereign Core"))
         self.context.define_function("null", lambda: AKSNull())
 
         # Exit
         self.context.define_function("exit", lambda: exit(0))
+
+    def _register_context_builtins(self):
+        # memoize() resolves and calls functions in the library's own context.
+        self.context.define_function("memoize", lambda f, maxsize=128: memoize(f, self.context, maxsize))
         
+    # Reductions take an array or a plain list; lists reduce in Python.
+    @staticmethod
+    def _sum(values):
+        if isinstance(values, AKSArray):
+            return float(values.data.sum())
+        return math.fsum(values)
+
+    @staticmethod
+    def _mean(values):
+        if len(values) == 0:
+            raise ValueError("mean() of an empty sequence")
+        if isinstance(values, AKSArray):
+            return float(values.data.mean())
+        return math.fsum(values) / len(values)
+
+    @staticmethod
+    def _min(values):
+        if isinstance(values, AKSArray):
+            return values.data.min().item()
+        return min(values)
+
+    @staticmethod
+    def _max(values):
+        if isinstance(values, AKSArray):
+            return values.data.max().item()
+        return max(values)
+
+    @staticmethod
+    def _dot(left, right):
+        if len(left) != len(right):
+            raise ValueError(f"dot() of sequences with lengths {len(left)} and {len(right)}")
+        if isinstance(left, AKSArray) or isinstance(right, AKSArray):
+            return float(AKSArray.from_values(left).data.dot(AKSArray.from_values(right).data))
+        return math.fsum(a * b for a, b in zip(left, right))
+
+    @staticmethod
+    def _persistent(collection, name):
+        if isinstance(collection, (PVector, PMap)):
+            return collection
+        if isinstance(collection, (list, tuple)):
+            return PVector(collection)
+        if isinstance(collection, dict):
+            return PMap(collection)
+        raise TypeError(f"{name}() expects a list or dict, got {type(collection).__name__}")
+
+    @staticmethod
+    def _assoc(collection, key, value):
+        collection = StandardLibrary._persistent(collection, "assoc")
+        if isinstance(collection, PVector) and isinstance(key, float) and key.is_integer():
+            key = int(key)
+        return collection.assoc(key, value)
+
+    @staticmethod
+    def _dissoc(mapping, key):
+        mapping = StandardLibrary._persistent(mapping, "dissoc")
+        if not isinstance(mapping, PMap):
+            raise TypeError("dissoc() expects a dict")
+        return mapping.dissoc(key)
+
+    @staticmethod
+    def _conj(collection, *values):
+        collection = StandardLibrary._persistent(collection, "conj")
+        if isinstance(collection, PMap):
+            # Like Clojure, a map takes [key, value] pairs.
+            for key, value in values:
+                collection = collection.assoc(key, value)
+            return collection
+        return collection.extend(values)
+
+    @staticmethod
+    def _memo_stats(f):
+        if not isinstance(f, MemoizedFunction):
+            raise TypeError("memo_stats() expects a function returned by memoize()")
+        return f.stats()
+
 def register_standard_library(context: ExecutionContext):
         return StandardLibrary(context)
\ No newline at end of file
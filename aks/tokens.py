@@ -2,6 +2,8 @@
 tokens.py — AkshayaLang Token System
 """
 
+from array import array
+from bisect import bisect_right
 from enum import Enum, auto
 from typing import Any, Optional
 
@@ -28,6 +30,14 @@ class TokenType(Enum):
     MINUS = auto()
     STAR = auto()
     SLASH = auto()
+    PERCENT = auto()
+
+    EQ = auto()
+    NEQ = auto()
+    LT = auto()
+    GT = auto()
+    LTE = auto()
+    GTE = auto()
 
     NEWLINE = auto()
     EOF = auto()
@@ -41,6 +51,9 @@ class TokenType(Enum):
     ELSE = auto()
     WHILE = auto()
     FN = auto()
+    AND = auto()
+    OR = auto()
+    NOT = auto()
 
 
 KEYWORDS = {
@@ -55,6 +68,9 @@ KEYWORDS = {
     "return": TokenType.RETURN,
     "while": TokenType.WHILE,
     "fn": TokenType.FN,
+    "and": TokenType.AND,
+    "or": TokenType.OR,
+    "not": TokenType.NOT,
 }
 
 SINGLE_CHAR_TOKENS = {
@@ -71,14 +87,56 @@ SINGLE_CHAR_TOKENS = {
     "-": TokenType.MINUS,
     "*": TokenType.STAR,
     "/": TokenType.SLASH,
+    "%": TokenType.PERCENT,
+    "<": TokenType.LT,
+    ">": TokenType.GT,
+}
+
+MULTI_CHAR_TOKENS = {
+    "==": TokenType.EQ,
+    "!=": TokenType.NEQ,
+    "<=": TokenType.LTE,
+    ">=": TokenType.GTE,
 }
 
+OPERATOR_TOKENS = {**SINGLE_CHAR_TOKENS, **MULTI_CHAR_TOKENS}
+
+
+# Enum values double as compact integer type codes: TOKEN_TYPES[code] -> TokenType.
+TOKEN_TYPES = (None,) + tuple(TokenType)
+
 
 class Token:
+    """
+    A single token. Either standalone, or a lightweight view over one slot
+    of a TokenStream whose position is derived only when asked for.
+    """
+
+    __slots__ = ("type", "value", "_position", "_stream", "_index")
+
     def __init__(self, type_: TokenType, value: Any, position: Optional[tuple] = None):
         self.type = type_
         self.value = value
-        self.position = position  # Optional: (line, column)
+        self._position = position  # Optional: (line, column)
+        self._stream = None
+        self._index = 0
+
+    @classmethod
+    def view(cls, stream: "TokenStream", index: int) -> "Token":
+        token = cls(TOKEN_TYPES[stream.types[index]], stream.values[stream.value_ids[index]])
+        token._stream = stream
+        token._index = index
+        return token
+
+    @property
+    def position(self) -> Optional[tuple]:
+        if self._position is None and self._stream is not None:
+            self._position = self._stream.position(self._index)
+        return self._position
+
+    @position.setter
+    def position(self, value: Optional[tuple]):
+        self._position = value
 
     def __repr__(self) -> str:
         return f"<Token type={self.type.name} value={repr(self.value)} pos={self.position}>"
@@ -89,4 +147,98 @@ class Token:
             and self.type == other.type
             and self.value == other.value
             and self.position == other.position
-        )
\ No newline at end of file
+        )
+
+
+class TokenStream:
+    """
+    Struct-of-arrays token buffer.
+
+    Token i is stored as three parallel entries: a type code in `types`,
+    an index into the interned `values` table in `value_ids`, and a source
+    offset in `offsets`. Line and column are derived from `line_starts`.
+    """
+
+    __slots__ = ("types", "value_ids", "offsets", "values", "line_starts", "_interned")
+
+    def __init__(self):
+        self.types = array("H")
+        self.value_ids = array("I")
+        self.offsets = array("I")
+        self.values = [None]
+        self.line_starts = array("I", [0])
+        self._interned = {}
+
+    @classmethod
+    def from_tokens(cls, tokens) -> "TokenStream":
+        """Pack standalone tokens. Offsets are synthesized from their (line, column)."""
+        tokens = list(tokens)
+        widths = {}
+        for token in tokens:
+            if token.position is not None:
+                line, column = token.position
+                widths[line] = max(widths.get(line, 0), column)
+
+        stream = cls()
+        last_line = max(widths, default=1)
+        for line in range(1, last_line):
+            stream.line_starts.append(stream.line_starts[-1] + widths.get(line, 0) + 1)
+
+        offset = 0
+        for token in tokens:
+            if token.position is not None:
+                line, column = token.position
+                offset = stream.line_starts[line - 1] + column - 1
+            stream.append(token.type, token.value, offset)
+        return stream
+
+    def append(self, type_: TokenType, value: Any, offset: int):
+        self.types.append(type_.value)
+        self.value_ids.append(self.intern(value))
+        self.offsets.append(offset)
+
+    def intern(self, value: Any) -> int:
+        """Return the value-table index for `value`, adding it if new."""
+        if value is None:
+            return 0
+        key = (value.__class__, value)
+        index = self._interned.get(key)
+        if index is None:
+            index = self._interned[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def type_at(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def value_at(self, index: int) -> Any:
+        return self.values[self.value_ids[index]]
+
+    def position(self, index: int) -> tuple:
+        """(line, column) of token `index`, both 1-based."""
+        offset = self.offsets[index]
+        line = bisect_right(self.line_starts, offset)
+        return (line, offset - self.line_starts[line - 1] + 1)
+
+    def nbytes(self) -> int:
+        """Approximate size of the packed buffers, excluding the value table."""
+        return sum(buf.itemsize * len(buf) for buf in (self.types, self.value_ids, self.offsets, self.line_starts))
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Token.view(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        return Token.view(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Token.view(self, index)
+
+    def __repr__(self) -> str:
+        return f"<TokenStream tokens={len(self)} values={len(self.values)}>"
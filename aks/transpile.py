@@ -0,0 +1,330 @@
+"""
+transpile.py — AkshayaLang → Python Source Transpiler
+
+Emits Python source for a parsed program, compiles it once and caches
+the resulting code object under a hash of the .aks source. Running a
+cached program is then a single `exec` against a namespace built from
+the ExecutionContext.
+
+Every AkshayaLang name `x` becomes the Python name `aks_x`, so user
+names never collide with Python keywords or with the `__aks_*` helpers.
+NameErrors and TypeErrors raised by the generated code are reported
+under the AkshayaLang names.
+
+Functions become plain `def`s. Their parameters and bound names are
+Python locals, and any other name is read from the program namespace.
+That is lexical scoping, so a program whose functions read a name that
+another function binds locally (see aks.resolver.dynamic_names) depends
+on dynamic scoping and is refused with a CompileError.
+
+`return f(...)` runs in constant stack, as on the other backends. A
+function containing one is emitted as a body that returns a _TailCall
+for it, wrapped in a trampoline that keeps calling the bodies of the
+functions it bounces to. Other calls nest on the Python stack.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+
+from aks.errors import CompileError
+from aks.persistent import PVector, PMap
+from aks.types import add
+from aks.ast import (
+    ReturnSignal, UserFunction, mirror,
+    NumberLiteral, StringLiteral, BooleanLiteral, ListLiteral, DictLiteral,
+    Identifier, BinaryExpression, UnaryExpression, IndexExpression,
+    BindStatement, AssignmentStatement, IfStatement, WhileStatement,
+    ReturnStatement, FunctionDeclaration, FunctionCall, Block, Program,
+    MirrorStatement, child_nodes
+)
+from aks.resolver import dynamic_names
+
+NAME_PREFIX = "aks_"
+# A generated name as it appears in Python's error messages.
+_PYTHON_NAME = re.compile(r"\b" + NAME_PREFIX + r"(\w+)")
+RESULT = "__aks_result__"
+INDENT = "    "
+
+
+def _index(target, index):
+    if isinstance(index, float) and index.is_integer():
+        index = int(index)
+    return target[index]
+
+
+class _TailCall:
+    """A pending `return f(...)`, returned by a function body to its trampoline."""
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function, args):
+        self.function = function
+        self.args = args
+
+    def bounce(self):
+        # Call a transpiled function's body directly so the chain stays flat.
+        body = getattr(self.function, "__aks_body__", None)
+        return (body or self.function)(*self.args)
+
+
+def _has_tail_call(body):
+    stack = [body]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ReturnStatement) and node.tail_call:
+            return True
+        if not isinstance(node, FunctionDeclaration):
+            stack.extend(child_nodes(node))
+    return False
+
+
+class _Emitter:
+    def __init__(self):
+        self.lines = []
+        self.top_level_names = set()
+
+    def emit(self, depth, text):
+        self.lines.append(INDENT * depth + text)
+
+    # ====== Statements ======
+
+    def block(self, block, depth, in_function, tail):
+        """
+        Emit a block's statements. When `tail` is true, the block's value
+        (that of its last statement) is stored in the result variable.
+        """
+        statements = block.statements
+        if not statements:
+            self.emit(depth, f"{RESULT} = None" if tail else "pass")
+            return
+        last = len(statements) - 1
+        for index, statement in enumerate(statements):
+            self.statement(statement, depth, in_function, tail and index == last)
+
+    def statement(self, node, depth, in_function, tail):
+        if isinstance(node, (BindStatement, AssignmentStatement)):
+            name = node.identifier.name if isinstance(node, BindStatement) else node.name
+            if not in_function:
+                self.top_level_names.add(name)
+            self.emit(depth, f"{NAME_PREFIX}{name} = {self.expr(node.expression)}")
+            if tail:
+                self.emit(depth, f"{RESULT} = {NAME_PREFIX}{name}")
+        elif isinstance(node, IfStatement):
+            self.emit(depth, f"if {self.expr(node.condition)}:")
+            self.block(node.then_branch, depth + 1, in_function, tail)
+            if node.else_branch is not None:
+                self.emit(depth, "else:")
+                self.block(node.else_branch, depth + 1, in_function, tail)
+            elif tail:
+                self.emit(depth, "else:")
+                self.emit(depth + 1, f"{RESULT} = None")
+        elif isinstance(node, WhileStatement):
+            if tail:
+                self.emit(depth, f"{RESULT} = None")
+            self.emit(depth, f"while {self.expr(node.condition)}:")
+            self.block(node.body, depth + 1, in_function, tail)
+        elif isinstance(node, ReturnStatement):
+            if in_function and node.tail_call:
+                args = "".join(self.expr(arg) + ", " for arg in node.value.arguments)
+                self.emit(depth, f"return __aks_TailCall({self.expr(node.value.callee)}, ({args}))")
+                return
+            value = self.expr(node.value)
+            if in_function:
+                self.emit(depth, f"return {value}")
+            else:
+                self.emit(depth, f"raise __aks_ReturnSignal({value})")
+        elif isinstance(node, FunctionDeclaration):
+            if not in_function:
+                self.top_level_names.add(node.name)
+            name = NAME_PREFIX + node.name
+            params = ", ".join(NAME_PREFIX + p for p in node.params)
+            if _has_tail_call(node.body):
+                body = f"__aks_body_{node.name}"
+                self.emit(depth, f"def {body}({params}):")
+                self.block(node.body, depth + 1, True, False)
+                self.emit(depth, f"def {name}({params}):")
+                self.emit(depth + 1, f"value = {body}({params})")
+                self.emit(depth + 1, "while value.__class__ is __aks_TailCall:")
+                self.emit(depth + 2, "value = value.bounce()")
+                self.emit(depth + 1, "return value")
+                self.emit(depth, f"{name}.__aks_body__ = {body}")
+            else:
+                self.emit(depth, f"def {name}({params}):")
+                self.block(node.body, depth + 1, True, False)
+            if tail:
+                self.emit(depth, f"{RESULT} = None")
+        elif isinstance(node, (Block, Program)):
+            self.block(node, depth, in_function, tail)
+        else:
+            value = self.expr(node)
+            self.emit(depth, f"{RESULT} = {value}" if tail else value)
+
+    # ====== Expressions ======
+
+    def expr(self, node):
+        if isinstance(node, (NumberLiteral, StringLiteral, BooleanLiteral)):
+            return repr(node.value)
+        if isinstance(node, Identifier):
+            return NAME_PREFIX + node.name
+        if isinstance(node, BinaryExpression):
+            if node.operator not in _PY_OPERATORS:
+                raise CompileError(f"Unsupported operator '{node.operator}'")
+            if node.operator == '+':
+                # Long string concatenations become ropes, as on the other backends.
+                return f"__aks_add({self.expr(node.left)}, {self.expr(node.right)})"
+            return f"({self.expr(node.left)} {node.operator} {self.expr(node.right)})"
+        if isinstance(node, UnaryExpression):
+            if node.operator == '-':
+                return f"(-{self.expr(node.operand)})"
+            if node.operator == 'not':
+                return f"(not {self.expr(node.operand)})"
+            raise CompileError(f"Unknown unary operator {node.operator}")
+        if isinstance(node, FunctionCall):
+            args = ", ".join(self.expr(arg) for arg in node.arguments)
+            return f"{self.expr(node.callee)}({args})"
+        if isinstance(node, IndexExpression):
+            return f"__aks_index({self.expr(node.target)}, {self.expr(node.index)})"
+        if isinstance(node, ListLiteral):
+            return "__aks_vector([" + ", ".join(self.expr(el) for el in node.elements) + "])"
+        if isinstance(node, DictLiteral):
+            return "__aks_map({" + ", ".join(f"{self.expr(k)}: {self.expr(v)}" for k, v in node.pairs) + "})"
+        if isinstance(node, MirrorStatement):
+            return f"__aks_mirror({self.expr(node.expression)})"
+        raise CompileError(f"Cannot transpile {type(node).__name__}")
+
+
+_PY_OPERATORS = {'+', '-', '*', '/', '%', '==', '!=', '<', '>', '<=', '>=', 'and', 'or'}
+
+
+def _transpile(block):
+    dynamic = dynamic_names(block)
+    if dynamic:
+        names = ", ".join(f"'{name}'" for name in sorted(dynamic))
+        raise CompileError(
+            f"Cannot transpile a program that reads {names} from a caller's scope; "
+            f"run it without transpile"
+        )
+    emitter = _Emitter()
+    emitter.emit(0, f"{RESULT} = None")
+    emitter.block(block, 0, False, True)
+    return "\n".join(emitter.lines) + "\n", emitter.top_level_names
+
+
+def to_python(block):
+    """Return Python source equivalent to `block`."""
+    return _transpile(block)[0]
+
+
+class TranspiledProgram:
+    """A compiled Python code object plus the top-level names it binds."""
+
+    def __init__(self, code, bound_names):
+        self.code = code
+        self.bound_names = frozenset(bound_names)
+
+    def run(self, context):
+        namespace = _build_namespace(context)
+        try:
+            exec(self.code, namespace)
+        except ReturnSignal as rs:
+            # A top-level `return` ends the program with its value.
+            namespace[RESULT] = rs.value
+        except NameError as e:
+            match = _PYTHON_NAME.search(str(e))
+            if match is None:
+                raise
+            raise NameError(f"Variable '{match.group(1)}' is not defined.") from None
+        except TypeError as e:
+            raise TypeError(_PYTHON_NAME.sub(r"\1", str(e))) from None
+        for name in self.bound_names:
+            key = NAME_PREFIX + name
+            if key in namespace:
+                context.set_variable(name, namespace[key])
+        return namespace[RESULT]
+
+
+def _build_namespace(context):
+    chain = []
+    while context is not None:
+        chain.append(context)
+        context = context.parent
+    root = chain[-1]
+
+    namespace = {
+        "__builtins__": {},
+        "__aks_index": _index,
+        "__aks_add": add,
+        "__aks_vector": PVector,
+        "__aks_map": PMap,
+        "__aks_mirror": lambda value: mirror(value, root),
+        "__aks_ReturnSignal": ReturnSignal,
+        "__aks_TailCall": _TailCall,
+    }
+    # Outermost scope first so inner bindings win; variables shadow functions.
+    for scope in reversed(chain):
+        for name, value in scope.functions.items():
+            namespace[NAME_PREFIX + name] = value
+        for name, value in scope.variables.items():
+            if isinstance(value, UserFunction):
+                value = _bind_user_function(value, scope)
+            namespace[NAME_PREFIX + name] = value
+    return namespace
+
+
+def _bind_user_function(function, context):
+    return lambda *args: function.call(list(args), context)
+
+
+class CodeCache:
+    """LRU of TranspiledPrograms keyed by the SHA-256 of their source."""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source):
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        program = self._entries.get(key)
+        if program is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return program
+
+    def put(self, key, program):
+        self._entries[key] = program
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+CODE_CACHE = CodeCache()
+
+
+def compile_source(source, parse, cache=CODE_CACHE):
+    """
+    Return the TranspiledProgram for `source`, transpiling on a cache miss.
+    `parse` turns source text into a Block and is only called on a miss.
+    """
+    key = cache.key(source)
+    program = cache.get(key)
+    if program is None:
+        python_source, bound_names = _transpile(parse(source))
+        code = compile(python_source, f"<aks:{key[:12]}>", "exec")
+        program = TranspiledProgram(code, bound_names)
+        cache.put(key, program)
+    return program
@@ -1,12 +1,30 @@
 """
 types.py — Sovereign Symbolic Type System for AkshayaLang
+
+Value representation: at run time numbers are native `int` / `float`,
+strings `str`, booleans `bool`, and lists and dicts plain Python
+containers, so arithmetic and comparisons never allocate wrappers. The
+AKS* classes below box values where a symbolic type is wanted, mostly in
+the standard library. They are slotted, compare and hash by value, and
+`AKSBoolean` / `AKSNull` are cached singletons.
+
+A string built up by `+` past ROPE_THRESHOLD characters becomes an
+`AKSRope`, which appends in O(1) and is joined only when first read.
 """
 
+import operator
+import sys
+from itertools import islice
+
+from aks.persistent import PVector
 from abc import ABC, abstractmethod
 
 
 class AKSType(ABC):
     """Abstract base class for all symbolic types."""
+
+    __slots__ = ()
+
     @abstractmethod
     def type_name(self) -> str:
         pass
@@ -19,10 +37,18 @@ class AKSType(ABC):
         return str(self)
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+        return other.__class__ is self.__class__ and self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
 
 
 class AKSNumber(AKSType):
+    __slots__ = ("value",)
+
     def __init__(self, value: float):
         self.value = value
 
@@ -56,6 +82,8 @@ class AKSNumber(AKSType):
 
 
 class AKSString(AKSType):
+    __slots__ = ("value",)
+
     def __init__(self, value: str):
         self.value = value
 
@@ -72,8 +100,12 @@ class AKSString(AKSType):
 
 
 class AKSBoolean(AKSType):
-    def __init__(self, value: bool):
-        self.value = value
+    """`AKSBoolean(x)` returns one of two shared instances."""
+
+    __slots__ = ("value",)
+
+    def __new__(cls, value=False):
+        return _TRUE if value else _FALSE
 
     def type_name(self) -> str:
         return "Boolean"
@@ -81,10 +113,303 @@ class AKSBoolean(AKSType):
     def __str__(self):
         return "true" if self.value else "false"
 
+    def __reduce__(self):
+        return (AKSBoolean, (self.value,))
+
 
 class AKSNull(AKSType):
+    """`AKSNull()` always returns the same instance."""
+
+    __slots__ = ()
+
+    def __new__(cls):
+        return _NULL
+
     def type_name(self) -> str:
         return "Null"
 
     def __str__(self):
         return "null"
+
+    def __eq__(self, other):
+        return other is self
+
+    def __hash__(self):
+        return 0
+
+    def __bool__(self):
+        return False
+
+    def __reduce__(self):
+        return (AKSNull, ())
+
+
+_TRUE = object.__new__(AKSBoolean)
+_TRUE.value = True
+_FALSE = object.__new__(AKSBoolean)
+_FALSE.value = False
+_NULL = object.__new__(AKSNull)
+
+
+# ====== Ropes ======
+
+# Joining strings at least this long yields a rope rather than a new str.
+ROPE_THRESHOLD = 256
+
+
+class AKSRope(AKSType):
+    """
+    An immutable string kept as a list of chunks. Versions of a rope share
+    one chunk list: appending to the newest version extends it in place,
+    and appending to an older one copies its prefix first, so a loop of
+    `out = out + line` is linear overall. Length is known without joining;
+    anything that reads the text (printing via str(), comparison, hashing,
+    indexing) joins the chunks once and keeps the result.
+    """
+
+    __slots__ = ("_chunks", "_count", "_length", "_flat")
+
+    def __init__(self, chunks=()):
+        self._chunks = list(chunks)
+        self._count = len(self._chunks)
+        self._length = sum(map(len, self._chunks))
+        self._flat = None
+
+    @classmethod
+    def _version(cls, chunks, length):
+        rope = object.__new__(cls)
+        rope._chunks = chunks
+        rope._count = len(chunks)
+        rope._length = length
+        rope._flat = None
+        return rope
+
+    def _extend(self, texts, length):
+        chunks = self._chunks
+        if len(chunks) != self._count:
+            # A newer version already appended here; branch off a copy.
+            chunks = chunks[:self._count]
+        chunks.extend(texts)
+        return AKSRope._version(chunks, self._length + length)
+
+    def chunks(self):
+        """Iterate over the pieces of the string without joining them."""
+        if self._flat is not None:
+            return iter((self._flat,))
+        return islice(self._chunks, self._count)
+
+    def write_to(self, stream):
+        for chunk in self.chunks():
+            stream.write(chunk)
+
+    @property
+    def value(self):
+        return str(self)
+
+    def type_name(self) -> str:
+        # A rope is an implementation detail: to programs it is a str.
+        return "str"
+
+    def __str__(self):
+        if self._flat is None:
+            self._flat = "".join(islice(self._chunks, self._count))
+        return self._flat
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __add__(self, other):
+        if other.__class__ is str:
+            return self._extend((other,), len(other)) if other else self
+        if isinstance(other, AKSRope):
+            return self._extend(list(other.chunks()), other._length)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if other.__class__ is str:
+            return AKSRope._version([other, *self.chunks()], len(other) + self._length)
+        return NotImplemented
+
+    def __eq__(self, other):
+        if isinstance(other, (str, AKSRope)):
+            return len(other) == self._length and str(self) == str(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        # Equal to the hash of the joined str, so ropes and strs interchange as keys.
+        return hash(str(self))
+
+    def __lt__(self, other):
+        return str(self) < str(other) if isinstance(other, (str, AKSRope)) else NotImplemented
+
+    def __gt__(self, other):
+        return str(self) > str(other) if isinstance(other, (str, AKSRope)) else NotImplemented
+
+    def __le__(self, other):
+        return str(self) <= str(other) if isinstance(other, (str, AKSRope)) else NotImplemented
+
+    def __ge__(self, other):
+        return str(self) >= str(other) if isinstance(other, (str, AKSRope)) else NotImplemented
+
+    def __getitem__(self, index):
+        return str(self)[index]
+
+    def __contains__(self, text):
+        return str(text) in str(self)
+
+
+def add(left, right):
+    """`+` for AkshayaLang values: long string concatenations produce a rope."""
+    if left.__class__ is str and right.__class__ is str and len(left) + len(right) >= ROPE_THRESHOLD:
+        return AKSRope._version([left, right], len(left) + len(right))
+    return left + right
+
+
+def print_values(*values, sep=" ", end="\n", file=None):
+    """print() that writes ropes chunk by chunk instead of joining them first."""
+    stream = sys.stdout if file is None else file
+    for i, value in enumerate(values):
+        if i:
+            stream.write(sep)
+        if isinstance(value, AKSRope):
+            value.write_to(stream)
+        else:
+            stream.write(str(value))
+    stream.write(end)
+
+
+# ====== Arrays ======
+
+# NumPy is optional (pip install akshayalang[numpy]) and costs more to
+# import than the rest of the interpreter, so it is only imported once an
+# array is made. `aks.types.np` is the module, or None when it is missing.
+_np = None
+
+
+def _import_numpy():
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        _np = numpy
+    return _np
+
+
+def __getattr__(name):
+    if name == "np":
+        return _import_numpy()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _require_numpy(feature):
+    np = _import_numpy()
+    if np is None:
+        raise ImportError(f"{feature} requires NumPy; install it with 'pip install akshayalang[numpy]'")
+    return np
+
+
+def _unwrap_operand(other):
+    if isinstance(other, AKSArray):
+        return other.data
+    if isinstance(other, (list, tuple, PVector)):
+        return _np.asarray(tuple(other), dtype=_np.float64)
+    if isinstance(other, AKSType) and hasattr(other, "value"):
+        return other.value
+    return other
+
+
+def _elementwise(op):
+    def method(self, other):
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            return AKSArray(op(self.data, _unwrap_operand(other)))
+    return method
+
+
+def _reflected(op):
+    def method(self, other):
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            return AKSArray(op(_unwrap_operand(other), self.data))
+    return method
+
+
+class AKSArray(AKSType):
+    """
+    A one-dimensional NumPy array of numbers. Arithmetic and comparisons
+    with another array, a list or a number broadcast elementwise, so the
+    interpreter dispatches once per expression rather than per element.
+    Division by zero gives inf/nan as in NumPy instead of raising, and an
+    array is truthy when it is non-empty and every element is.
+    """
+
+    __slots__ = ("data",)
+    __hash__ = None
+
+    def __init__(self, data):
+        self.data = _require_numpy("AKSArray").asarray(data)
+
+    @classmethod
+    def from_values(cls, values):
+        if isinstance(values, AKSArray):
+            return values
+        np = _require_numpy("array()")
+        return cls(np.array([_unwrap_operand(v) for v in values], dtype=np.float64))
+
+    @classmethod
+    def zeros(cls, n):
+        return cls(_require_numpy("zeros()").zeros(int(n)))
+
+    @classmethod
+    def arange(cls, start, stop, step=1):
+        np = _require_numpy("range_array()")
+        return cls(np.arange(start, stop, step, dtype=np.float64))
+
+    @property
+    def value(self):
+        return self.data.tolist()
+
+    def type_name(self) -> str:
+        return "Array"
+
+    def __str__(self):
+        return "array([" + ", ".join(str(x) for x in self.data.tolist()) + "])"
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data.tolist())
+
+    def __getitem__(self, index):
+        return self.data[index].item()
+
+    def __bool__(self):
+        return bool(self.data.size) and bool(self.data.all())
+
+    def __neg__(self):
+        return AKSArray(-self.data)
+
+    __add__ = _elementwise(operator.add)
+    __sub__ = _elementwise(operator.sub)
+    __mul__ = _elementwise(operator.mul)
+    __truediv__ = _elementwise(operator.truediv)
+    __mod__ = _elementwise(operator.mod)
+    __radd__ = _reflected(operator.add)
+    __rsub__ = _reflected(operator.sub)
+    __rmul__ = _reflected(operator.mul)
+    __rtruediv__ = _reflected(operator.truediv)
+    __rmod__ = _reflected(operator.mod)
+    __eq__ = _elementwise(operator.eq)
+    __ne__ = _elementwise(operator.ne)
+    __lt__ = _elementwise(operator.lt)
+    __gt__ = _elementwise(operator.gt)
+    __le__ = _elementwise(operator.le)
+    __ge__ = _elementwise(operator.ge)
@@ -0,0 +1,303 @@
+"""
+vm.py — AkshayaLang Stack Virtual Machine
+
+Executes CodeObjects produced by aks.bytecode. Calls between compiled
+functions push a heap-allocated Frame onto the VM's own frame list
+instead of recursing in Python, so deep AkshayaLang recursion does not
+consume Python stack. The frame list is capped at `max_depth`, and
+TAIL_CALL replaces the running frame instead of pushing a new one.
+
+Names are scoped dynamically, as in the tree walker: LOAD_DYNAMIC finds
+a name among the locals of the active calls, innermost first, before the
+globals, and a tail call keeps the replaced frame's locals visible to the
+callee. A local slot starts out UNBOUND; reading it before it is set
+searches the same way, so `bind depth to depth + 1` sees the caller's. VM functions are UserFunctions to the rest of the interpreter, so
+builtins such as memoize can call them; that re-enters the VM.
+"""
+
+from aks.ast import UNBOUND, UserFunction, mirror
+from aks.bytecode import Op, CodeObject
+from aks.execution_context import ExecutionContext
+from aks.types import add
+from aks.persistent import PVector, PMap
+
+# Plain int opcodes: comparing against module globals is cheaper than Op attribute access.
+LOAD_LOCAL = int(Op.LOAD_LOCAL)
+LOAD_CONST = int(Op.LOAD_CONST)
+LOAD_GLOBAL = int(Op.LOAD_GLOBAL)
+STORE_LOCAL = int(Op.STORE_LOCAL)
+STORE_GLOBAL = int(Op.STORE_GLOBAL)
+POP = int(Op.POP)
+DUP = int(Op.DUP)
+ADD = int(Op.ADD)
+SUB = int(Op.SUB)
+MUL = int(Op.MUL)
+DIV = int(Op.DIV)
+MOD = int(Op.MOD)
+LT = int(Op.LT)
+GT = int(Op.GT)
+LE = int(Op.LE)
+GE = int(Op.GE)
+EQ = int(Op.EQ)
+NE = int(Op.NE)
+JUMP = int(Op.JUMP)
+JUMP_IF_FALSE = int(Op.JUMP_IF_FALSE)
+JUMP_IF_FALSE_OR_POP = int(Op.JUMP_IF_FALSE_OR_POP)
+JUMP_IF_TRUE_OR_POP = int(Op.JUMP_IF_TRUE_OR_POP)
+NEG = int(Op.NEG)
+NOT = int(Op.NOT)
+LOAD_CALLABLE = int(Op.LOAD_CALLABLE)
+CALL = int(Op.CALL)
+RETURN_VALUE = int(Op.RETURN_VALUE)
+TAIL_CALL = int(Op.TAIL_CALL)
+MAKE_FUNCTION = int(Op.MAKE_FUNCTION)
+LOAD_DYNAMIC = int(Op.LOAD_DYNAMIC)
+LOAD_DYNAMIC_CALLABLE = int(Op.LOAD_DYNAMIC_CALLABLE)
+INDEX = int(Op.INDEX)
+BUILD_LIST = int(Op.BUILD_LIST)
+BUILD_DICT = int(Op.BUILD_DICT)
+MIRROR = int(Op.MIRROR)
+
+MAX_DEPTH = 200_000
+
+
+class VMFunction(UserFunction):
+    """
+    A function value created by MAKE_FUNCTION. Called from Python, as
+    builtins and memoize do, it runs on the VM that created it.
+    """
+
+    def __init__(self, code, vm):
+        super().__init__(code.params, code.body)
+        self.code = code
+        self.name = code.name
+        self.vm = vm
+
+    def call(self, arguments, outer_context=None):
+        return self.vm.call(self, list(arguments))
+
+    def __call__(self, *arguments):
+        return self.vm.call(self, list(arguments))
+
+    def __repr__(self):
+        return f"<VMFunction {self.name}{self.code.params}>"
+
+
+class Frame:
+    """Activation record: local slots, operand stack and program counter."""
+
+    __slots__ = ("code", "pc", "locals", "stack", "inherited")
+
+    def __init__(self, code, locals_):
+        self.code = code
+        self.pc = 0
+        self.locals = locals_
+        self.stack = []
+        # Locals of the frames this one replaced by tail calls, by name.
+        self.inherited = None
+
+
+class VM:
+    def __init__(self, context=None, max_depth=None):
+        self.context = context or ExecutionContext()
+        self.max_depth = MAX_DEPTH if max_depth is None else max_depth
+
+    def run(self, code: CodeObject):
+        """Execute a top-level CodeObject and return its result."""
+        return self._execute(Frame(code, []))
+
+    def call(self, function, arguments):
+        """Call a VMFunction from Python."""
+        return self._execute(self._frame_for(function, arguments))
+
+    def _frame_for(self, function, arguments):
+        # Like UserFunction.call: extra arguments are dropped, missing ones left unbound.
+        code = function.code
+        nparams = len(code.params)
+        if len(arguments) > nparams:
+            arguments = arguments[:nparams]
+        return Frame(code, list(arguments) + [UNBOUND] * (len(code.local_names) - len(arguments)))
+
+    def _load_dynamic(self, name, frame, callers, is_callable):
+        """`name` as the innermost active call binding it sees it, else from the globals."""
+        if frame.inherited and name in frame.inherited:
+            return frame.inherited[name]
+        for caller in reversed(callers):
+            slot = caller.code.local_index.get(name)
+            if slot is not None and caller.locals[slot] is not UNBOUND:
+                return caller.locals[slot]
+            if caller.inherited and name in caller.inherited:
+                return caller.inherited[name]
+        if is_callable:
+            return self.context.get_callable(name)
+        return self.context.get_variable(name)
+
+    def _execute(self, frame):
+        context = self.context
+        global_vars = context.variables
+        max_depth = self.max_depth
+        frames = []
+
+        code = frame.code.code
+        consts = frame.code.consts
+        names = frame.code.names
+        local_slots = frame.locals
+        stack = frame.stack
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+
+        while True:
+            op = code[pc]
+            arg = code[pc + 1]
+            pc += 2
+
+            # Opcodes are numbered in families, so one range test narrows the chain.
+            if op < ADD:
+                if op == LOAD_LOCAL:
+                    value = local_slots[arg]
+                    if value is UNBOUND:
+                        value = self._load_dynamic(frame.code.local_names[arg], frame, frames, False)
+                    push(value)
+                elif op == LOAD_CONST:
+                    push(consts[arg])
+                elif op == LOAD_GLOBAL:
+                    name = names[arg]
+                    push(global_vars[name] if name in global_vars else context.get_variable(name))
+                elif op == STORE_LOCAL:
+                    local_slots[arg] = pop()
+                elif op == STORE_GLOBAL:
+                    global_vars[names[arg]] = pop()
+                elif op == POP:
+                    pop()
+                elif op == DUP:
+                    push(stack[-1])
+                elif op == LOAD_CALLABLE:
+                    push(context.get_callable(names[arg]))
+                else:
+                    raise RuntimeError(f"Unknown opcode {op}")
+                continue
+
+            if op < JUMP:
+                right = pop()
+                if op == ADD:
+                    left = stack[-1]
+                    stack[-1] = add(left, right) if left.__class__ is str else left + right
+                elif op == SUB:
+                    stack[-1] = stack[-1] - right
+                elif op == MUL:
+                    stack[-1] = stack[-1] * right
+                elif op == LT:
+                    stack[-1] = stack[-1] < right
+                elif op == DIV:
+                    stack[-1] = stack[-1] / right
+                elif op == MOD:
+                    stack[-1] = stack[-1] % right
+                elif op == GT:
+                    stack[-1] = stack[-1] > right
+                elif op == LE:
+                    stack[-1] = stack[-1] <= right
+                elif op == GE:
+                    stack[-1] = stack[-1] >= right
+                elif op == EQ:
+                    stack[-1] = stack[-1] == right
+                elif op == NE:
+                    stack[-1] = stack[-1] != right
+                elif op == NEG:
+                    push(-right)
+                elif op == NOT:
+                    push(not right)
+                else:
+                    raise RuntimeError(f"Unknown opcode {op}")
+                continue
+
+            if op < BUILD_LIST:
+                if op == JUMP_IF_FALSE:
+                    if not pop():
+                        pc = arg
+                elif op == JUMP:
+                    pc = arg
+                elif op == JUMP_IF_FALSE_OR_POP:
+                    if not stack[-1]:
+                        pc = arg
+                    else:
+                        pop()
+                elif op == JUMP_IF_TRUE_OR_POP:
+                    if stack[-1]:
+                        pc = arg
+                    else:
+                        pop()
+                else:
+                    raise RuntimeError(f"Unknown opcode {op}")
+                continue
+
+            if op == CALL or op == TAIL_CALL:
+                if arg:
+                    arguments = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    arguments = []
+                func = pop()
+                if isinstance(func, VMFunction):
+                    if op == CALL:
+                        if len(frames) >= max_depth:
+                            raise RecursionError(f"maximum recursion depth {max_depth} exceeded in {func.name}()")
+                        frame.pc = pc
+                        frames.append(frame)
+                        frame = self._frame_for(func, arguments)
+                    else:
+                        replaced = frame
+                        frame = self._frame_for(func, arguments)
+                        if replaced.code.dynamic:
+                            inherited = dict(replaced.inherited or ())
+                            inherited.update((name, value) for name, value in
+                                             zip(replaced.code.local_names, replaced.locals)
+                                             if value is not UNBOUND)
+                            frame.inherited = inherited
+                    code = frame.code.code
+                    consts = frame.code.consts
+                    names = frame.code.names
+                    local_slots = frame.locals
+                    stack = frame.stack
+                    push = stack.append
+                    pop = stack.pop
+                    pc = 0
+                elif isinstance(func, UserFunction):
+                    push(func.call(arguments, context))
+                else:
+                    push(func(*arguments))
+            elif op == RETURN_VALUE:
+                result = pop()
+                if not frames:
+                    return result
+                frame = frames.pop()
+                code = frame.code.code
+                consts = frame.code.consts
+                names = frame.code.names
+                local_slots = frame.locals
+                stack = frame.stack
+                push = stack.append
+                pop = stack.pop
+                pc = frame.pc
+                push(result)
+            elif op == MAKE_FUNCTION:
+                push(VMFunction(consts[arg], self))
+            elif op == LOAD_DYNAMIC or op == LOAD_DYNAMIC_CALLABLE:
+                push(self._load_dynamic(names[arg], frame, frames, op == LOAD_DYNAMIC_CALLABLE))
+            elif op == INDEX:
+                index = pop()
+                if isinstance(index, float) and index.is_integer():
+                    index = int(index)
+                stack[-1] = stack[-1][index]
+            elif op == BUILD_LIST:
+                items = stack[len(stack) - arg:]
+                del stack[len(stack) - arg:]
+                push(PVector(items))
+            elif op == BUILD_DICT:
+                flat = stack[len(stack) - 2 * arg:]
+                del stack[len(stack) - 2 * arg:]
+                push(PMap(zip(flat[::2], flat[1::2])))
+            elif op == MIRROR:
+                stack[-1] = mirror(stack[-1], context)
+            else:
+                raise RuntimeError(f"Unknown opcode {op}")
@@ -2,52 +2,235 @@
 
 import argparse
 import logging
+import os
 import sys
-from aks.lexer import AKSLexer
-from aks.parser import Parser
-from aks.interpreter import Interpreter
-from aks.execution_context import ExecutionContext
 
 logger = logging.getLogger("AkshayaLang")
 logging.basicConfig(format='%(levelname)s: %(message)s', level=logging.INFO)
 
-def run(file_path: str, debug: bool = False):
-    try:
-        with open(file_path, 'r') as f:
-            code = f.read()
+COMMANDS = ("run", "run-batch", "dis", "repl", "bench", "serve", "connect")
 
-        # Lexing
-        lexer = AKSLexer(code)
-        tokens = lexer.tokenize()
+# The interpreter is imported by the commands that need it, not here, so
+# `aks connect` and `aks --help` stay quick. These copies of its choices
+# are checked against the originals in tests/test_startup.py.
+BACKENDS = ("tree", "closure", "vm")                      # aks.interpreter.BACKENDS
+PROFILE_MODES = ("deterministic", "sampling")             # aks.profiler.MODES
+DEFAULT_INTERVAL = 0.005                                  # aks.profiler.DEFAULT_INTERVAL
+EVENTS = ("node_enter", "node_exit", "call", "return", "builtin_call", "bind")  # aks.hooks.EVENTS
+# Node events fire for every expression, so traces leave them out unless asked.
+TRACE_EVENTS = ("call", "return", "builtin_call", "bind")
 
-        # Parsing
-        parser = Parser(tokens)
-        ast_nodes = parser.parse()
 
-        # Interpretation
-        context = ExecutionContext()
-        interpreter = Interpreter(context)
-        for node in ast_nodes:
-            result = interpreter.eval(node)
-            if result is not None:
-                print(result)
+def _count(minimum):
+    """argparse type for an integer no smaller than `minimum`."""
+    def parse(text):
+        value = int(text)
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {value}")
+        return value
+    return parse
+
 
+def _read_source(file_path: str) -> str:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
     except FileNotFoundError:
         logger.error(f"File not found: {file_path}")
         sys.exit(1)
+
+
+def run(file_path: str, debug: bool = False, backend: str = "tree", use_cache: bool = True,
+        cache_dir: str = None, mirror_to: str = None, profile: str = None,
+        profile_interval: float = DEFAULT_INTERVAL, profile_output: str = None,
+        trace: str = None, trace_events: tuple = None):
+    if not os.path.isfile(file_path):
+        logger.error(f"File not found: {file_path}")
+        sys.exit(1)
+    from aks.execution_context import ExecutionContext
+    from aks.interpreter import Interpreter
+    from aks.stdlib import register_standard_library
+
+    sink = None
+    trace_sink = None
+    profiler = None
+    if profile:
+        from aks.profiler import Profiler
+        profiler = Profiler(profile, profile_interval)
+    try:
+        if mirror_to == "-":
+            sink = sys.stdout
+        elif mirror_to:
+            sink = open(mirror_to, "w", encoding="utf-8")
+        context = ExecutionContext()
+        register_standard_library(context)
+        interpreter = Interpreter(context, debug=debug, backend=backend, cache_dir=cache_dir,
+                                  mirror_sink=sink, profiler=profiler)
+        if trace:
+            from aks.hooks import JsonlTrace
+            trace_sink = open(trace, "w", encoding="utf-8")
+            interpreter.subscribe(JsonlTrace(trace_sink, trace_events or TRACE_EVENTS))
+        result = interpreter.run_file(file_path, use_cache=use_cache)
+        if result is not None:
+            print(result)
+        if profiler is not None:
+            _write_profile(profiler, profile_output)
     except Exception as e:
         if debug:
             logger.exception("Runtime exception occurred")
         else:
             logger.error(f"Runtime error: {str(e)}")
         sys.exit(1)
+    finally:
+        if sink is not None and sink is not sys.stdout:
+            sink.close()
+        if trace_sink is not None:
+            trace_sink.close()
+
+
+def _write_profile(profiler, output):
+    """The per-line report goes to stderr; folded stacks go to `output`, if given."""
+    print(profiler.report(), file=sys.stderr)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            profiler.write_folded(f)
+        logger.info(f"Folded stacks written to {output}")
+
+
+def run_batch(target: str, workers: int = None, chunk_size: int = 1, ordered: bool = True,
+              backend: str = "tree", use_cache: bool = True, cache_dir: str = None, output: str = None):
+    from aks.batch import collect_scripts, run_batch as batch, write_records
+
+    paths = collect_scripts(target)
+    if not paths:
+        logger.error(f"No .aks scripts found: {target}")
+        sys.exit(1)
+    sink = open(output, "w", encoding="utf-8") if output else sys.stdout
+    try:
+        records = batch(paths, workers=workers, chunksize=chunk_size, ordered=ordered,
+                        backend=backend, use_cache=use_cache, cache_dir=cache_dir)
+        succeeded, failed = write_records(records, sink)
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    logger.info(f"{succeeded} succeeded, {failed} failed")
+    if failed:
+        sys.exit(1)
+
+
+def disassemble(file_path: str):
+    from aks.bytecode import compile_program, disassemble as dis
+    from aks.lexer import tokenize_stream
+    from aks.parser import Parser
+
+    code = _read_source(file_path)
+    try:
+        dis(compile_program(Parser(tokenize_stream(code)).parse()))
+    except Exception as e:
+        logger.error(f"Cannot disassemble {file_path}: {e}")
+        sys.exit(1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="aks", description="AkshayaLang CLI Interpreter")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Time how long `aks run` takes to reach a script's first statement, by import")
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="Run a .aks file")
+    run_parser.add_argument("script", help="Path to .aks file")
+    run_parser.add_argument("--debug", action="store_true", help="Enable debug logs")
+    run_parser.add_argument("--backend", choices=BACKENDS, default="tree", help="Execution backend")
+    run_parser.add_argument("--no-cache", action="store_true", help="Do not read or write .aksc AST caches")
+    run_parser.add_argument("--cache-dir", help="Keep .aksc files here instead of beside the script")
+    run_parser.add_argument("--mirror-to", metavar="PATH",
+                            help="Stream mirror statements to PATH as JSON lines ('-' for stdout)")
+    run_parser.add_argument("--profile", action="store_true",
+                            help="Report time per source line on stderr (tree backend)")
+    run_parser.add_argument("--profile-mode", choices=PROFILE_MODES, default="deterministic",
+                            help="Time every statement, or sample the running one")
+    run_parser.add_argument("--profile-interval", type=float, default=DEFAULT_INTERVAL,
+                            help="Seconds between samples in sampling mode")
+    run_parser.add_argument("--profile-output", metavar="PATH",
+                            help="Write folded stacks for flamegraph tools to PATH")
+    run_parser.add_argument("--trace", metavar="PATH",
+                            help="Write execution events to PATH as JSON lines (tree backend)")
+    run_parser.add_argument("--trace-events", type=lambda text: tuple(text.split(",")),
+                            help=f"Comma-separated events to trace, from {', '.join(EVENTS)}")
+
+    batch_parser = commands.add_parser("run-batch", help="Run many .aks files on a process pool")
+    batch_parser.add_argument("target", help="Directory (searched recursively), glob or file")
+    batch_parser.add_argument("--workers", type=_count(0), help="Worker processes (default: CPU count; 0 runs in-process)")
+    batch_parser.add_argument("--chunk-size", type=_count(1), default=1, help="Scripts handed to a worker at a time")
+    batch_parser.add_argument("--unordered", action="store_true", help="Emit results as they finish, not in script order")
+    batch_parser.add_argument("--backend", choices=BACKENDS, default="tree", help="Execution backend")
+    batch_parser.add_argument("--no-cache", action="store_true", help="Do not read or write .aksc AST caches")
+    batch_parser.add_argument("--cache-dir", help="Keep .aksc files here instead of beside the scripts")
+    batch_parser.add_argument("--output", metavar="PATH", help="Write JSON lines to PATH instead of stdout")
+
+    dis_parser = commands.add_parser("dis", help="Disassemble a .aks file to VM bytecode")
+    dis_parser.add_argument("script", help="Path to .aks file")
+
+    commands.add_parser("repl", help="Start the interactive REPL")
+
+    serve_parser = commands.add_parser("serve", help="Run a pre-warmed fork server for fast script startup")
+    serve_parser.add_argument("--socket", help="Unix socket path (default: per-user, or $AKS_FORK_SERVER)")
+    serve_parser.add_argument("--backend", choices=BACKENDS, default="tree", help="Execution backend")
+    serve_parser.add_argument("--no-cache", action="store_true", help="Do not read or write .aksc AST caches")
+
+    connect_parser = commands.add_parser("connect", help="Run a .aks file on a running fork server")
+    connect_parser.add_argument("--socket", help="Unix socket path (default: per-user, or $AKS_FORK_SERVER)")
+    connect_parser.add_argument("script", help="Path to .aks file")
+    connect_parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the script")
+
+    # `aks bench` options are parsed by aks.bench.suite itself; see main().
+    commands.add_parser("bench", help="Run the benchmark suite or compare results (see `aks bench --help`)")
+    return parser
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # `aks` alone opens the REPL; `aks [options] file.aks` is shorthand for `aks run ...`.
+    if not argv:
+        argv = ["repl"]
+    elif argv[0] not in COMMANDS and argv[0] not in ("-h", "--help", "--startup-profile"):
+        argv.insert(0, "run")
+    if argv[0] == "bench":
+        from aks.bench.suite import main as bench
+        sys.exit(bench(argv[1:]))
+
+    args = build_parser().parse_args(argv)
+    if args.startup_profile:
+        from aks.bench.startup import profile_startup, startup_report
+        print(startup_report(profile_startup()))
+    elif args.command == "run":
+        run(args.script, debug=args.debug, backend=args.backend,
+            use_cache=not args.no_cache, cache_dir=args.cache_dir, mirror_to=args.mirror_to,
+            profile=args.profile_mode if args.profile else None,
+            profile_interval=args.profile_interval, profile_output=args.profile_output,
+            trace=args.trace, trace_events=args.trace_events)
+    elif args.command == "run-batch":
+        run_batch(args.target, workers=args.workers, chunk_size=args.chunk_size, ordered=not args.unordered,
+                  backend=args.backend, use_cache=not args.no_cache, cache_dir=args.cache_dir,
+                  output=args.output)
+    elif args.command == "serve":
+        from aks.forkserver import serve
+        serve(args.socket, backend=args.backend, use_cache=not args.no_cache)
+    elif args.command == "connect":
+        from aks.forkserver import connect
+        try:
+            sys.exit(connect([args.script] + args.args, args.socket))
+        except OSError as e:
+            logger.error(f"Cannot reach the fork server: {e}")
+            sys.exit(1)
+    elif args.command == "dis":
+        disassemble(args.script)
+    elif args.command == "repl":
+        from akshayalang.repl import start_repl
+        start_repl()
+    else:
+        build_parser().print_help()
 
-def main():
-    parser = argparse.ArgumentParser(description="AkshayaLang CLI Interpreter")
-    parser.add_argument("script", help="Path to .aks file")
-    parser.add_argument("--debug", action="store_true", help="Enable debug logs")
-    args = parser.parse_args()
-    run(args.script, debug=args.debug)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
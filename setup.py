@@ -7,9 +7,12 @@ setup(
     author="D.V.S. Siva Chandra Raju",
     packages=find_packages(),
     include_package_data=True,
+    extras_require={
+        "numpy": ["numpy>=1.17"]
+    },
     entry_points={
         "console_scripts": [
-            "aks = akshayalang.repl:start_repl"
+            "aks = akshayalang.cli:main"
         ]
     },
     classifiers=[
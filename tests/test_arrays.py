@@ -0,0 +1,76 @@
+"""
+tests/test_arrays.py
+
+Unit tests for AKSArray, its elementwise operators and the stdlib reductions.
+"""
+
+import unittest
+from aks.execution_context import ExecutionContext
+from aks.interpreter import Interpreter, BACKENDS
+from aks.stdlib import register_standard_library
+from aks.types import AKSArray, np
+
+
+def interpreter(backend="tree"):
+    context = ExecutionContext()
+    register_standard_library(context)
+    return Interpreter(context, backend=backend)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestArrays(unittest.TestCase):
+    def test_constructors(self):
+        aks = interpreter()
+        self.assertEqual(aks.run("array([1, 2, 3])").value, [1.0, 2.0, 3.0])
+        self.assertEqual(aks.run("zeros(2)").value, [0.0, 0.0])
+        self.assertEqual(aks.run("range_array(1, 4)").value, [1.0, 2.0, 3.0])
+        self.assertEqual(str(aks.run("type(zeros(1))")), "Array")
+
+    def test_broadcasting_matches_on_every_backend(self):
+        code = """
+        bind a to range_array(0, 4)
+        bind b to 10 - a * 2 + [1, 1, 1, 1]
+        b / 2
+        """
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(interpreter(backend).run(code).value, [5.5, 4.5, 3.5, 2.5])
+
+    def test_comparisons_are_elementwise(self):
+        aks = interpreter()
+        self.assertEqual(aks.run("range_array(0, 4) >= 2").value, [False, False, True, True])
+        self.assertEqual(aks.run("if array([1, 2]) == [1, 2] { 1 } else { 0 }"), 1)
+        self.assertEqual(aks.run("if array([1, 2]) == [1, 3] { 1 } else { 0 }"), 0)
+
+    def test_indexing_and_len(self):
+        aks = interpreter()
+        aks.run("bind a to array([4, 5, 6])")
+        self.assertEqual(aks.run("a[1] + len(a)"), 8.0)
+        self.assertIs(type(aks.run("a[0]")), float)
+
+    def test_reductions(self):
+        aks = interpreter()
+        aks.run("bind a to range_array(1, 5)")
+        self.assertEqual(aks.run("sum(a)"), 10.0)
+        self.assertEqual(aks.run("mean(a)"), 2.5)
+        self.assertEqual(aks.run("min(a)"), 1.0)
+        self.assertEqual(aks.run("max(a)"), 4.0)
+        self.assertEqual(aks.run("dot(a, [1, 0, 1, 0])"), 4.0)
+        self.assertEqual(aks.run("sum(a > 2)"), 2.0)
+
+    def test_not_hashable(self):
+        with self.assertRaises(TypeError):
+            hash(AKSArray.zeros(1))
+
+
+class TestListReductions(unittest.TestCase):
+    def test_reductions_on_lists(self):
+        aks = interpreter()
+        self.assertEqual(aks.run("sum([1, 2, 3])"), 6.0)
+        self.assertEqual(aks.run("mean([1, 2, 3])"), 2.0)
+        self.assertEqual(aks.run("min([3, 1, 2]) + max([3, 1, 2])"), 4.0)
+        self.assertEqual(aks.run("dot([1, 2], [3, 4])"), 11.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+tests/test_astcache.py
+
+Unit tests for the .aksc parsed-AST cache — encoding round trips and cache invalidation.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+
+from aks import astcache
+from aks.astcache import AstCache, cache_key, dumps, loads
+from aks.ast import (
+    NumberLiteral, Block, Program, IfStatement, BooleanLiteral, FunctionCall, FunctionDeclaration,
+    Identifier
+)
+from aks.interpreter import Interpreter
+from aks.lexer import tokenize_stream
+from aks.parser import Parser
+from tests.test_compiler import PROGRAMS
+
+
+def parse(code):
+    return Parser(tokenize_stream(code)).parse()
+
+
+class TestEncoding(unittest.TestCase):
+    def test_programs_round_trip(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                key = cache_key(program)
+                tree = loads(dumps(parse(program), key), key)
+                self.assertEqual(Interpreter()._execute(tree), Interpreter().run(program))
+
+    def test_numbers_round_trip(self):
+        tree = Block([NumberLiteral(v) for v in (0, 7, -300, 2 ** 70, 1.5, -0.25)])
+        key = cache_key("")
+        values = [n.value for n in loads(dumps(tree, key), key).statements]
+        self.assertEqual(values, [0, 7, -300, 2 ** 70, 1.5, -0.25])
+
+    def test_wrong_key_or_magic_rejected(self):
+        data = dumps(parse("1"), cache_key("1"))
+        self.assertIsNone(loads(data, cache_key("2")))
+        self.assertIsNone(loads(b"not an aksc file"))
+
+
+class TestAstCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "script.aks")
+        self.write("bind a to 20\na + 1")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, code):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(code)
+
+    def test_hit_skips_parsing(self):
+        interpreter = Interpreter()
+        self.assertEqual(interpreter.run_file(self.path), 21)
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "__akscache__", "script.aksc")))
+        with mock.patch.object(Interpreter, "_parse_unoptimized", side_effect=AssertionError("parsed")):
+            self.assertEqual(interpreter.run_file(self.path), 21)
+        self.assertEqual((interpreter.ast_cache.hits, interpreter.ast_cache.misses), (1, 1))
+
+    def test_edited_source_reparsed(self):
+        interpreter = Interpreter()
+        interpreter.run_file(self.path)
+        self.write("bind a to 40\na + 2")
+        self.assertEqual(interpreter.run_file(self.path), 42)
+        self.assertEqual(interpreter.ast_cache.misses, 2)
+
+    def test_version_change_invalidates(self):
+        cache = AstCache()
+        cache.load(self.path, "1 + 1", parse)
+        with mock.patch.object(astcache, "FORMAT_VERSION", astcache.FORMAT_VERSION + 1):
+            cache.load(self.path, "1 + 1", parse)
+        self.assertEqual(cache.misses, 2)
+
+    def test_corrupt_entry_reparsed(self):
+        cache = AstCache()
+        cache.load(self.path, "1 + 1", parse)
+        with open(cache.path_for(self.path), "r+b") as f:
+            f.seek(36)
+            f.write(b"\xff\xff\xff")
+        self.assertEqual(Interpreter()._execute(cache.load(self.path, "1 + 1", parse)), 2)
+        self.assertEqual(cache.misses, 2)
+
+    def test_truncated_or_damaged_file_reparsed(self):
+        self.write("fn f(n) { if n > 1 { return n * f(n - 1) } return 1 }\nbind a to f(5)\na - 100")
+        Interpreter().run_file(self.path)
+        cache_path = AstCache().path_for(self.path)
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        damaged = [data[:length] for length in range(len(data))]
+        damaged += [data[:i] + bytes([data[i] ^ 0x5A]) + data[i + 1:] for i in range(36, len(data))]
+        for broken in damaged:
+            with self.subTest(size=len(broken)):
+                with open(cache_path, "wb") as f:
+                    f.write(broken)
+                interpreter = Interpreter()
+                self.assertEqual(interpreter.run_file(self.path), 20)
+                self.assertEqual(interpreter.ast_cache.misses, 1)
+
+    def test_malformed_trees_rejected(self):
+        key = cache_key("1 + 1")
+        trees = [
+            Program([IfStatement(BooleanLiteral(True), NumberLiteral(1), None)]),
+            Program([FunctionCall(None, [])]),
+            Program([FunctionDeclaration("f", [], Identifier("x"))]),
+            NumberLiteral(1),
+        ]
+        for tree in trees:
+            with self.subTest(tree=tree):
+                with self.assertRaises(ValueError):
+                    loads(dumps(tree, key), key)
+        # Nested past the recursion limit, with a valid checksum.
+        payload = b"\x01\x01-" + bytes([astcache._UNARY, 0]) * 100_000 + bytes([astcache._INT, 2])
+        data = astcache.MAGIC + key + astcache._CHECKSUM.pack(zlib.crc32(payload)) + payload
+        with self.assertRaises(RecursionError):
+            loads(data, key)
+
+        cache = AstCache()
+        os.makedirs(os.path.dirname(cache.path_for(self.path)))
+        with open(cache.path_for(self.path), "wb") as f:
+            f.write(data)
+        self.assertEqual(Interpreter()._execute(cache.load(self.path, "1 + 1", parse)), 2)
+        self.assertEqual(cache.misses, 1)
+
+    def test_cache_dir(self):
+        cache_dir = os.path.join(self.dir, "shared")
+        interpreter = Interpreter(cache_dir=cache_dir)
+        interpreter.run_file(self.path)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "__akscache__")))
+
+
+if __name__ == "__main__":
+    unittest.main()
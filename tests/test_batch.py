@@ -0,0 +1,109 @@
+"""
+tests/test_batch.py
+
+Unit tests for the process-pool batch runner behind `aks run-batch`.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from aks.batch import collect_scripts, run_batch, write_records
+from aks.execution_context import ExecutionContext
+from aks.stdlib import register_standard_library
+from akshayalang import cli
+
+SCRIPTS = {
+    "a.aks": 'print("from a")\nbind leaked to 1\n40 + 2',
+    "b.aks": "leaked",
+    "nested/c.aks": "fn fib(n) { if n < 2 { return n } return fib(n - 1) + fib(n - 2) }\n"
+                    "bind fast to memoize(fib)\nfast(15)",
+    "nested/notes.txt": "not a script",
+}
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        for name, code in SCRIPTS.items():
+            path = os.path.join(self.dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(code)
+        self.paths = collect_scripts(self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_collects_scripts_in_order(self):
+        names = [os.path.relpath(path, self.dir) for path in self.paths]
+        self.assertEqual(names, ["a.aks", "b.aks", os.path.join("nested", "c.aks")])
+        self.assertEqual(collect_scripts(os.path.join(self.dir, "*.aks")), self.paths[:2])
+
+    def test_scripts_are_isolated(self):
+        records = list(run_batch(self.paths, workers=0, use_cache=False))
+        a, b, c = records
+        self.assertEqual((a["ok"], a["result"]), (True, 42))
+        self.assertIn("from a", a["output"])
+        self.assertFalse(b["ok"])
+        self.assertIn("NameError", b["error"])
+        self.assertEqual(c["result"], 610)
+
+    def test_process_pool_orders_and_chunks(self):
+        paths = self.paths * 4
+        ordered = list(run_batch(paths, workers=2, chunksize=3, use_cache=False))
+        self.assertEqual([r["script"] for r in ordered], paths)
+        unordered = list(run_batch(paths, workers=2, chunksize=2, ordered=False, use_cache=False))
+        self.assertEqual(sorted(r["script"] for r in unordered), sorted(paths))
+        self.assertEqual(sum(r["ok"] for r in unordered), 8)
+
+    def test_exit_ends_only_its_script(self):
+        for code, ok in (("exit()", True), ("bind x to 1\nexit()\nx", True)):
+            with open(os.path.join(self.dir, "b.aks"), "w", encoding="utf-8") as f:
+                f.write(code)
+            for workers in (0, 2):
+                with self.subTest(code=code, workers=workers):
+                    records = list(run_batch(self.paths, workers=workers, use_cache=False))
+                    self.assertEqual([r["script"] for r in records], self.paths)
+                    self.assertEqual((records[1]["ok"], records[1]["exit_code"]), (ok, 0))
+                    self.assertEqual(records[2]["result"], 610)
+
+    def test_rejects_bad_chunk_size_and_workers(self):
+        with self.assertRaises(ValueError):
+            list(run_batch(self.paths, chunksize=0))
+        with self.assertRaises(ValueError):
+            list(run_batch(self.paths, workers=-1))
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as exit_info:
+            cli.main(["run-batch", self.dir, "--chunk-size", "0"])
+        self.assertEqual(exit_info.exception.code, 2)
+
+    def test_write_records_counts(self):
+        sink = io.StringIO()
+        counts = write_records(run_batch(self.paths, workers=0, use_cache=False), sink)
+        self.assertEqual(counts, (2, 1))
+        self.assertEqual(len([json.loads(line) for line in sink.getvalue().splitlines()]), 3)
+
+    def test_cli_exit_status(self):
+        output = os.path.join(self.dir, "results.jsonl")
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as exit_info:
+            cli.main(["run-batch", self.dir, "--workers", "0", "--no-cache", "--output", output])
+        self.assertEqual(exit_info.exception.code, 1)
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+
+class TestFork(unittest.TestCase):
+    def test_fork_copies_context(self):
+        library = register_standard_library(ExecutionContext())
+        fork = library.fork()
+        fork.context.set_variable("x", 1)
+        self.assertFalse(library.context.has_variable("x"))
+        self.assertIs(fork.context.get_function("conj"), library.context.get_function("conj"))
+        self.assertIsNot(fork.context.get_function("memoize"), library.context.get_function("memoize"))
+
+
+if __name__ == "__main__":
+    unittest.main()
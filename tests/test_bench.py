@@ -0,0 +1,83 @@
+"""
+tests/test_bench.py
+
+Unit tests for the benchmark suite: statistics, JSON results and regression comparison.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from aks.bench import suite
+from akshayalang import cli
+
+
+def _results(**medians):
+    return {"benchmarks": {name: {"median": median} for name, median in medians.items()}}
+
+
+class TestSuite(unittest.TestCase):
+    def test_every_case_runs_at_small_scale(self):
+        results = suite.run_suite(warmup=0, repeat=2, scale=0.002)
+        self.assertEqual(list(results["benchmarks"]), list(suite.SUITE))
+        for name, result in results["benchmarks"].items():
+            with self.subTest(name=name):
+                self.assertEqual(len(result["runs"]), 2)
+                self.assertLessEqual(result["min"], result["median"])
+                self.assertLessEqual(result["median"], result["max"])
+                self.assertGreater(result["work"], 0)
+        json.dumps(results)
+
+    def test_measure_warms_up_before_timing(self):
+        calls = []
+        times = suite.measure(lambda: calls.append(1), warmup=2, repeat=3)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(len(times), 3)
+
+    def test_compare_flags_changes(self):
+        rows = suite.compare(_results(a=1.0, b=1.0, c=1.0, gone=1.0),
+                             _results(a=1.05, b=1.5, c=0.5, new=1.0), threshold=0.1)
+        self.assertEqual({row[0]: row[4] for row in rows}, {
+            "a": "ok", "b": "regression", "c": "improvement", "gone": "removed", "new": "added",
+        })
+
+
+class TestCli(unittest.TestCase):
+    def test_compare_files_sets_exit_status(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, median in (("base", 1.0), ("slow", 2.0)):
+                paths.append(os.path.join(directory, f"{name}.json"))
+                with open(paths[-1], "w", encoding="utf-8") as f:
+                    json.dump(_results(fib=median), f)
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                with self.assertRaises(SystemExit) as exit_info:
+                    cli.main(["bench", "--compare", paths[0], paths[1]])
+            self.assertEqual(exit_info.exception.code, 1)
+            self.assertIn("regression", out.getvalue())
+
+    def test_run_writes_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                status = suite.main(["--filter", "runtime.fib", "--scale", "0.01",
+                                     "--repeat", "1", "--warmup", "0", "--output", output])
+            self.assertEqual(status, 0)
+            with open(output, encoding="utf-8") as f:
+                self.assertEqual(list(json.load(f)["benchmarks"]), ["runtime.fib"])
+
+    def test_filter_matching_nothing_fails(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            with contextlib.redirect_stderr(io.StringIO()) as err:
+                status = suite.main(["--filter", "no-such-benchmark", "--output", output])
+            self.assertEqual(status, 2)
+            self.assertIn("no benchmarks match", err.getvalue())
+            self.assertFalse(os.path.exists(output))
+        self.assertEqual(suite.run_suite([])["benchmarks"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+tests/test_compiler.py
+
+Unit tests for the closure compiler — the "closure" backend must agree with the tree walker.
+"""
+
+import unittest
+from aks.interpreter import Interpreter
+from aks.compiler import compile_block, CompiledFunction
+from aks.execution_context import ExecutionContext
+from aks.lexer import tokenize_stream
+from aks.parser import Parser
+
+
+PROGRAMS = [
+    "bind a to 10\nbind b to 5\nmirror a + b * 2",
+    "bind i to 0\nbind t to 0\nwhile i < 10 { bind t to t + i % 3\n bind i to i + 1 }\nt",
+    "fn fib(n) { if n < 2 { return n } return fib(n - 1) + fib(n - 2) }\nfib(12)",
+    'bind d to {name: "aks", xs: [1, 2, 3]}\nmirror [d["name"], d["xs"][2], -d["xs"][0]]',
+    "mirror [1 < 2 and 3 > 4, 0 or 7, not 1 == 1, 2 >= 2, 3 != 3]",
+    "fn f(x) { if x > 0 { return 1 } else if x < 0 { return -1 } return 0 }\n[f(5), f(-5), f(0)]",
+    "fn root(n) { bind i to 0\n while true { if i * i >= n { return i }\n bind i to i + 1 } }\n[root(49), root(50)]",
+]
+
+
+class TestClosureBackend(unittest.TestCase):
+    def test_matches_tree_walker(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                tree = Interpreter(backend="tree").run(program)
+                closure = Interpreter(backend="closure").run(program)
+                self.assertEqual(closure, tree)
+
+    def test_operator_resolved_at_compile_time(self):
+        # The old evaluator computed every operator eagerly, so `+` could divide by zero.
+        self.assertEqual(Interpreter(backend="closure").run("bind z to 0\n5 + z"), 5)
+        self.assertEqual(Interpreter(backend="tree").run("bind z to 0\n5 + z"), 5)
+
+    def test_compiled_function_is_bound(self):
+        context = ExecutionContext()
+        code = compile_block(Parser(tokenize_stream("fn sq(x) { return x * x }")).parse())
+        code(context)
+        func = context.get_variable("sq")
+        self.assertIsInstance(func, CompiledFunction)
+        self.assertEqual(func.call([4.0], context), 16.0)
+
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ValueError):
+            Interpreter(backend="jit")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+tests/test_execution_context.py
+
+Unit tests for ExecutionContext scopes and lightweight call Frames.
+"""
+
+import unittest
+from aks.execution_context import BUILTINS, ExecutionContext, Frame
+from aks.interpreter import Interpreter
+
+
+class TestFrames(unittest.TestCase):
+    def test_frames_are_slotted_and_share_builtins(self):
+        root = ExecutionContext()
+        frame = root.create_child()
+        self.assertIsInstance(frame, Frame)
+        self.assertFalse(hasattr(frame, "__dict__"))
+        self.assertEqual(len(frame.functions), 0)
+        self.assertIs(frame.get_function("len"), BUILTINS["len"])
+
+    def test_frames_see_root_functions(self):
+        root = ExecutionContext()
+        root.define_function("len", lambda x: -1)
+        frame = root.create_child().create_child()
+        self.assertEqual(frame.get_callable("len")([1, 2]), -1)
+
+    def test_define_function_on_frame_is_local(self):
+        root = ExecutionContext()
+        frame = root.create_child()
+        frame.define_function("double", lambda x: x * 2)
+        self.assertEqual(frame.call_function("double", [4]), 8)
+        self.assertEqual(len(root.create_child().functions), 0)
+        with self.assertRaises(NameError):
+            root.get_function("double")
+
+    def test_builtins_inside_user_functions(self):
+        code = 'fn f(xs) { return [len(xs), type(xs)] }\nf([1, 2, 3])'
+        self.assertEqual(Interpreter().run(code), [3, "list"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+tests/test_forkserver.py
+
+Unit tests for the pre-warmed fork server behind `aks serve` and `aks connect`.
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from aks.forkserver import connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@unittest.skipUnless(hasattr(os, "fork") and hasattr(socket, "AF_UNIX"), "the fork server needs Unix")
+class TestForkServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.mkdtemp()
+        cls.socket_path = os.path.join(cls.dir, "aks.sock")
+        environment = dict(os.environ, PYTHONPATH=ROOT)
+        cls.server = subprocess.Popen(
+            [sys.executable, "-m", "aks.forkserver", "--socket", cls.socket_path, "serve"],
+            env=environment, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 30
+        while not os.path.exists(cls.socket_path):
+            if cls.server.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("fork server did not start")
+            time.sleep(0.02)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait()
+        shutil.rmtree(cls.dir)
+
+    def run_script(self, code, args=()):
+        script = os.path.join(self.dir, "script.aks")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(code)
+        with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err, \
+                open(os.devnull) as stdin:
+            status = connect([script, *args], self.socket_path,
+                             fds=(stdin.fileno(), out.fileno(), err.fileno()))
+            out.seek(0)
+            err.seek(0)
+            return status, out.read().decode("utf-8"), err.read().decode("utf-8")
+
+    def test_runs_script_and_prints_result(self):
+        status, out, err = self.run_script('print("hello")\nbind a to 6\na * 7')
+        self.assertEqual(status, 0)
+        self.assertIn("hello", out)
+        self.assertTrue(out.endswith("42\n"))
+        self.assertEqual(err, "")
+
+    def test_runtime_error_fails(self):
+        status, out, err = self.run_script("missing_name")
+        self.assertEqual(status, 1)
+        self.assertIn("missing_name", err)
+
+    def test_exit_status(self):
+        status, _, _ = self.run_script("exit()")
+        self.assertEqual(status, 0)
+
+    def test_scripts_do_not_share_state(self):
+        self.run_script("bind leaked to 1")
+        status, _, err = self.run_script("leaked")
+        self.assertEqual(status, 1)
+        self.assertIn("leaked", err)
+
+    def test_missing_server(self):
+        with self.assertRaises(OSError):
+            connect(["x.aks"], os.path.join(self.dir, "nothing.sock"))
+
+
+if __name__ == "__main__":
+    unittest.main()
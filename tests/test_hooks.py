@@ -0,0 +1,129 @@
+"""
+tests/test_hooks.py
+
+Unit tests for execution event hooks and the built-in Counters and JsonlTrace subscribers.
+"""
+
+import io
+import json
+import unittest
+from aks.ast import FunctionCall, BindStatement, child_nodes
+from aks.hooks import Counters, JsonlTrace, CALL, RETURN, BIND, BUILTIN_CALL, NODE_ENTER, NODE_EXIT
+from aks.interpreter import Interpreter
+from aks.lexer import tokenize_stream
+from aks.parser import Parser
+
+PROGRAM = """fn fact(n) {
+  if n < 2 {
+    return 1
+  }
+  return n * fact(n - 1)
+}
+fn last(n) {
+  if n == 0 {
+    return len("done")
+  }
+  return last(n - 1)
+}
+bind x to fact(5)
+x = x + last(3)
+x
+"""
+
+
+def _classes(tree):
+    stack, seen = [tree], set()
+    while stack:
+        node = stack.pop()
+        seen.add(type(node))
+        stack.extend(child_nodes(node))
+    return seen
+
+
+class TestHooks(unittest.TestCase):
+    def test_events_in_order(self):
+        events = []
+        interpreter = Interpreter()
+        interpreter.subscribe(lambda event, subject, value: events.append((event, subject, value)),
+                              (CALL, RETURN, BUILTIN_CALL, BIND))
+        self.assertEqual(interpreter.run(PROGRAM), 124)
+        self.assertEqual(events[:2], [(CALL, "fact", [5]), (CALL, "fact", [4])])
+        self.assertIn((BIND, "x", 120), events)
+        self.assertIn((BUILTIN_CALL, "len", ["done"]), events)
+        self.assertEqual(events[-1], (BIND, "x", 124))
+        # Tail calls still get a return event each.
+        self.assertEqual(sum(e[0] == CALL for e in events), sum(e[0] == RETURN for e in events))
+
+    def test_node_events_balance(self):
+        depth = []
+        interpreter = Interpreter()
+        interpreter.subscribe(lambda event, subject, value: depth.append(1 if event == NODE_ENTER else -1),
+                              (NODE_ENTER, NODE_EXIT))
+        self.assertEqual(interpreter.run(PROGRAM), 124)
+        self.assertEqual(sum(depth), 0)
+        self.assertGreater(len(depth), 100)
+
+    def test_no_subscribers_leaves_tree_plain(self):
+        tree = Parser(tokenize_stream(PROGRAM)).parse()
+        interpreter = Interpreter()
+        callback = interpreter.subscribe(lambda *event: None)
+        interpreter.unsubscribe(callback)
+        interpreter._execute(tree)
+        classes = _classes(tree)
+        self.assertIn(FunctionCall, classes)
+        self.assertIn(BindStatement, classes)
+        self.assertTrue(all(cls.__module__ == "aks.ast" for cls in classes))
+
+    def test_counters(self):
+        counters = Counters()
+        interpreter = Interpreter()
+        interpreter.subscribe(counters)
+        interpreter.run(PROGRAM)
+        self.assertEqual(counters.calls["fact"], 5)
+        self.assertEqual(counters.calls["last"], 4)
+        self.assertEqual(counters.builtin_calls["len"], 1)
+        self.assertEqual(counters.binds["x"], 2)
+        self.assertEqual({name for name, _ in counters.slowest()}, {"fact", "last"})
+        self.assertFalse(counters.nodes)
+
+    def test_tail_calls_run_in_constant_stack(self):
+        counters = Counters()
+        interpreter = Interpreter()
+        interpreter.subscribe(counters)
+        code = "fn loop(n, acc) { if n == 0 { return acc } return loop(n - 1, acc + n) }\nloop(5000, 0)"
+        self.assertEqual(interpreter.run(code), 12502500)
+        self.assertEqual(counters.calls["loop"], 5001)
+        self.assertEqual(counters._started, [])
+
+    def test_raising_call_still_returns(self):
+        events = []
+        counters = Counters()
+        interpreter = Interpreter()
+        interpreter.subscribe(counters)
+        interpreter.subscribe(lambda event, subject, value: events.append((event, subject)), (CALL, RETURN))
+        code = "fn bad(n) { return missing(n) }\nfn outer(n) { return 1 + bad(n) }\nouter(1)"
+        with self.assertRaises(RuntimeError):
+            interpreter.run(code)
+        self.assertEqual(counters._started, [])
+        self.assertEqual(events, [(CALL, "outer"), (CALL, "bad"), (RETURN, "bad"), (RETURN, "outer")])
+        self.assertEqual(interpreter.context.hooks.tail_calls, [])
+
+    def test_jsonl_trace(self):
+        sink = io.StringIO()
+        interpreter = Interpreter()
+        interpreter.subscribe(JsonlTrace(sink, (CALL, NODE_ENTER)))
+        interpreter.run(PROGRAM)
+        records = [json.loads(line) for line in sink.getvalue().splitlines()]
+        self.assertIn({"event": CALL, "subject": "fact", "value": [5]},
+                      [{k: r[k] for k in ("event", "subject", "value") if k in r} for r in records])
+        self.assertIn("BindStatement:13", {r["subject"] for r in records})
+
+    def test_rejects_unknown_events_and_backends(self):
+        with self.assertRaises(ValueError):
+            Interpreter().subscribe(lambda *event: None, ("teleport",))
+        with self.assertRaises(ValueError):
+            Interpreter(backend="closure").subscribe(lambda *event: None)
+
+
+if __name__ == "__main__":
+    unittest.main()
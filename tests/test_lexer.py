@@ -4,8 +4,12 @@ tests/test_lexer.py
 Unit tests for AkshayaLang lexer — ensures correct tokenization.
 """
 
+import io
+import types
 import unittest
-from aks.lexer import tokenize
+from contextlib import redirect_stdout
+from aks.lexer import tokenize, iter_tokens, tokenize_stream
+from aks.tokens import Token, TokenStream, TokenType
 
 
 class TestLexer(unittest.TestCase):
@@ -33,5 +37,64 @@ class TestLexer(unittest.TestCase):
             tokenize("x = 5 $")
 
 
+class TestStreamingLexer(unittest.TestCase):
+    def test_iter_tokens_is_lazy(self):
+        stream = iter_tokens("bind a to 1")
+        self.assertIsInstance(stream, types.GeneratorType)
+        self.assertEqual(next(stream).type, TokenType.BIND)
+
+    def test_positions_across_lines(self):
+        tokens = tokenize('bind a to 1\n  mirror "x"')
+        self.assertEqual(tokens[0].position, (1, 1))
+        self.assertEqual(tokens[4].type, TokenType.MIRROR)
+        self.assertEqual(tokens[4].position, (2, 3))
+        self.assertEqual(tokens[5].value, "x")
+        self.assertEqual(tokens[-1].type, TokenType.EOF)
+
+    def test_trace_is_opt_in(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            tokenize("bind a to b + 1")
+        self.assertEqual(out.getvalue(), "")
+        with redirect_stdout(out):
+            tokenize("a", trace=True)
+        self.assertIn("[DEBUG] Tokenized", out.getvalue())
+
+    def test_integer_literals_stay_int(self):
+        values = [t.value for t in tokenize("1 + 2.5")]
+        self.assertIs(type(values[0]), int)
+        self.assertIs(type(values[2]), float)
+
+    def test_unexpected_character_reports_position(self):
+        with self.assertRaisesRegex(SyntaxError, "line 2, column 3"):
+            tokenize("x\nx $")
+
+
+class TestTokenStream(unittest.TestCase):
+    SOURCE = 'bind a to 1\n\n  mirror "a" + a'
+
+    def test_stream_matches_token_list(self):
+        stream = tokenize_stream(self.SOURCE)
+        self.assertEqual(list(stream), tokenize(self.SOURCE))
+        self.assertEqual(stream[-1].type, TokenType.EOF)
+
+    def test_values_are_interned(self):
+        stream = tokenize_stream(self.SOURCE)
+        self.assertEqual(stream.value_ids[1], stream.value_ids[5])
+        self.assertEqual(stream.value_at(5), "a")
+
+    def test_position_derived_from_line_index(self):
+        stream = tokenize_stream(self.SOURCE)
+        self.assertEqual(stream.position(4), (3, 3))
+        self.assertEqual(stream[4].position, (3, 3))
+
+    def test_from_tokens_round_trip(self):
+        tokens = tokenize(self.SOURCE)
+        self.assertEqual(list(TokenStream.from_tokens(tokens)), tokens)
+
+    def test_token_has_no_instance_dict(self):
+        self.assertFalse(hasattr(Token(TokenType.EOF, None), "__dict__"))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
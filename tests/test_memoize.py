@@ -0,0 +1,82 @@
+"""
+tests/test_memoize.py
+
+Unit tests for memoize() — LRU caching, counters and the static purity check.
+"""
+
+import unittest
+from aks.errors import PurityError
+from aks.execution_context import ExecutionContext
+from aks.interpreter import Interpreter
+from aks.memoize import MemoizedFunction, memoize
+from aks.stdlib import register_standard_library
+
+
+def interpreter():
+    context = ExecutionContext()
+    register_standard_library(context)
+    return Interpreter(context)
+
+
+class TestMemoize(unittest.TestCase):
+    def test_memoized_recursion(self):
+        code = """
+        fn fib(n) { if n < 2 { return n } return fib(n - 1) + fib(n - 2) }
+        bind fib to memoize(fib)
+        fib(80)
+        """
+        aks = interpreter()
+        self.assertEqual(aks.run(code), 23416728348467685)
+        stats = aks.run("memo_stats(fib)")
+        self.assertEqual(stats["misses"], 81)
+        self.assertEqual(stats["hits"], 78)
+
+    def test_lru_eviction(self):
+        aks = interpreter()
+        aks.run("fn sq(x) { return x * x }\nbind sq to memoize(sq, 2)")
+        square = aks.context.get_variable("sq")
+        self.assertIsInstance(square, MemoizedFunction)
+        for x in (1, 2, 1, 3, 1, 2):
+            square(x)
+        # 3 evicts 2 (least recently used), so only the second 1 and the last 1 hit.
+        self.assertEqual((square.hits, square.misses), (2, 4))
+        self.assertEqual(square.stats()["size"], 2)
+
+    def test_list_and_dict_arguments_are_keys(self):
+        aks = interpreter()
+        aks.run('fn total(xs) { return xs[0] + xs[1] }\nbind total to memoize(total)')
+        total = aks.context.get_variable("total")
+        self.assertEqual(total([1, 2]), 3)
+        self.assertEqual(total([1, 2]), 3)
+        self.assertEqual(total.hits, 1)
+        self.assertEqual(total({0: 4, 1: 5}), 9)
+
+    def test_rejects_impure_functions(self):
+        cases = {
+            "bind k to 2\nfn f(x) { return x * k }": "reads global 'k'",
+            "fn f(x) { print(x)\n return x }": "calls I/O builtin 'print'",
+            "fn f(x) { mirror x }": "uses 'mirror'",
+            "fn log(x) { print(x) }\nfn f(x) { return log(x) }": "calls I/O builtin 'print'",
+            "fn f(g) { return g(1) }": "calls function value 'g'",
+            "fn f(x) { return later(x) }": "calls undefined function 'later'",
+        }
+        for code, reason in cases.items():
+            with self.subTest(code=code):
+                aks = interpreter()
+                aks.run(code)
+                with self.assertRaisesRegex(PurityError, reason):
+                    memoize(aks.context.get_variable("f"), aks.context)
+
+    def test_accepts_pure_helpers(self):
+        aks = interpreter()
+        aks.run("fn sq(x) { return x * x }\nfn f(a, b) { fn twice(v) { return v * 2 }\n return twice(sq(a)) + len([b]) }")
+        f = memoize(aks.context.get_variable("f"), aks.context)
+        self.assertEqual(f(3, 0), 19)
+
+    def test_rejects_non_functions(self):
+        with self.assertRaises(PurityError):
+            memoize(len, ExecutionContext())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+tests/test_optimizer.py
+
+Unit tests for the AST optimizer — folding, pruning and literal precomputation.
+"""
+
+import unittest
+from aks.ast import Block, BinaryExpression, NumberLiteral, ReturnStatement
+from aks.interpreter import BACKENDS, Interpreter
+from aks.optimizer import Optimizer, optimize
+from tests.test_compiler import PROGRAMS
+
+
+def parse(code):
+    return Interpreter()._parse(code)
+
+
+class TestOptimizer(unittest.TestCase):
+    def test_folds_constant_arithmetic(self):
+        stmt = optimize(parse("bind x to 60 * 60 * 24")).statements[0]
+        self.assertIsInstance(stmt.expression, NumberLiteral)
+        self.assertEqual(stmt.expression.value, 86400)
+
+    def test_keeps_non_constant_and_failing_expressions(self):
+        tree = optimize(parse("bind a to x * 2\nbind b to 1 / 0"))
+        self.assertIsInstance(tree.statements[0].expression, BinaryExpression)
+        self.assertIsInstance(tree.statements[1].expression, BinaryExpression)
+
+    def test_prunes_literal_branches(self):
+        tree = optimize(parse("if true { bind a to 1 } else { bind a to 2 }\nif false { bind b to 3 }"))
+        self.assertEqual(repr(tree.statements[0]), "Bind(a = NumberLiteral(1))")
+        self.assertIsInstance(tree.statements[1], Block)
+        self.assertEqual(Interpreter(optimize=1).run("bind q to 1\nif false { 2 }"), None)
+
+    def test_drops_statements_after_return(self):
+        optimizer = Optimizer()
+        tree = optimizer.optimize(parse('fn f() { return 1\n print("never") }'))
+        body = tree.statements[0].body.statements
+        self.assertEqual(len(body), 1)
+        self.assertIsInstance(body[0], ReturnStatement)
+        self.assertEqual(optimizer.pruned, 1)
+
+    def test_precomputes_literal_keys_at_level_two(self):
+        tree = optimize(parse('bind d to {a: x, "b": [1, 2]}'), level=2)
+        literal = tree.statements[0].expression
+        self.assertEqual(literal.const_keys, ("a", "b"))
+        self.assertEqual(literal.pairs[1][1].constant_elements, (1.0, 2.0))
+        self.assertIsNone(optimize(parse("bind d to {a: [x]}"), level=1).statements[0].expression.const_keys)
+
+    def test_optimized_programs_match_on_every_backend(self):
+        for program in PROGRAMS:
+            expected = Interpreter().run(program)
+            for backend in BACKENDS:
+                with self.subTest(program=program, backend=backend):
+                    self.assertEqual(Interpreter(backend=backend, optimize=2).run(program), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+tests/test_parser_precedence.py
+
+Unit tests for the Pratt parser — operator precedence, calls, indexing and literals.
+"""
+
+import unittest
+from aks.errors import ParserError
+from aks.lexer import tokenize, tokenize_stream
+from aks.parser import Parser
+from aks.ast import (
+    AssignmentStatement, BinaryExpression, Block, FunctionCall, Identifier,
+    IfStatement, IndexExpression, ListLiteral, UnaryExpression
+)
+
+
+def parse(code):
+    return Parser(tokenize_stream(code)).parse()
+
+
+class TestPrattParser(unittest.TestCase):
+    def test_multiplication_binds_tighter(self):
+        expr = parse("bind r to 2 + 3 * 4").statements[0].expression
+        self.assertIsInstance(expr, BinaryExpression)
+        self.assertEqual(expr.operator, "+")
+        self.assertEqual(expr.right.operator, "*")
+
+    def test_logical_and_comparison_precedence(self):
+        expr = parse("mirror not a < b and c == d or e").statements[0].expression
+        self.assertEqual(expr.operator, "or")
+        self.assertEqual(expr.left.operator, "and")
+        self.assertIsInstance(expr.left.left, UnaryExpression)
+        self.assertEqual(expr.left.left.operand.operator, "<")
+        self.assertEqual(expr.left.right.operator, "==")
+
+    def test_call_and_index(self):
+        expr = parse("f(1, g(x))[0]").statements[0]
+        self.assertIsInstance(expr, IndexExpression)
+        self.assertIsInstance(expr.target, FunctionCall)
+        self.assertEqual(len(expr.target.arguments), 2)
+        self.assertIsInstance(expr.target.arguments[1], FunctionCall)
+
+    def test_print_keyword_is_callable(self):
+        call = parse('print("hi")').statements[0]
+        self.assertIsInstance(call, FunctionCall)
+        self.assertEqual(call.callee.name, "print")
+
+    def test_list_literal_and_assignment(self):
+        stmt = parse("xs = [1, [2], 3,]").statements[0]
+        self.assertIsInstance(stmt, AssignmentStatement)
+        self.assertIsInstance(stmt.expression, ListLiteral)
+        self.assertEqual(len(stmt.expression.elements), 3)
+
+    def test_else_if_chain(self):
+        stmt = parse("if a { b } else if c { d }").statements[0]
+        self.assertIsInstance(stmt.else_branch, Block)
+        self.assertIsInstance(stmt.else_branch.statements[0], IfStatement)
+
+    def test_accepts_plain_token_list(self):
+        program = Parser(tokenize("bind y to x + 1")).parse()
+        self.assertIsInstance(program.statements[0].expression.left, Identifier)
+
+    def test_error_reports_position(self):
+        with self.assertRaisesRegex(ParserError, "line 2, column 8"):
+            parse("bind x to 1\nbind y )")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+tests/test_persistent.py
+
+Unit tests for persistent vectors and maps and the assoc/dissoc/conj builtins.
+"""
+
+import random
+import unittest
+from aks.execution_context import ExecutionContext
+from aks.interpreter import Interpreter, BACKENDS
+from aks.persistent import PVector, PMap
+from aks.stdlib import register_standard_library
+
+
+class _Key:
+    """A key with a chosen hash, to force collisions."""
+
+    def __init__(self, name, key_hash):
+        self.name = name
+        self.key_hash = key_hash
+
+    def __hash__(self):
+        return self.key_hash
+
+    def __eq__(self, other):
+        return isinstance(other, _Key) and other.name == self.name
+
+
+class TestPVector(unittest.TestCase):
+    def test_matches_list_across_trie_levels(self):
+        for size in (0, 1, 32, 33, 1056, 1057, 40000):
+            with self.subTest(size=size):
+                values = list(range(size))
+                built = PVector()
+                for value in values:
+                    built = built.conj(value)
+                self.assertEqual(PVector(values), values)
+                self.assertEqual(built, values)
+                self.assertEqual([built[i] for i in range(0, size, 97)], values[::97])
+
+    def test_assoc_leaves_original_untouched(self):
+        original = PVector(range(2000))
+        updated = original.assoc(5, "x").assoc(1999, "y").assoc(2000, "z")
+        self.assertEqual((updated[5], updated[1999], updated[2000]), ("x", "y", "z"))
+        self.assertEqual(original, list(range(2000)))
+        # Only the path to index 5 was copied; the other leaves are shared.
+        self.assertIs(updated._root[1], original._root[1])
+
+    def test_value_semantics(self):
+        self.assertEqual(PVector([1, 2]) + [3], [1, 2, 3])
+        self.assertEqual(hash(PVector([1, 2])), hash(PVector((1, 2))))
+        self.assertEqual(PVector([1, 2])[-1], 2)
+        with self.assertRaises(IndexError):
+            PVector([1])[1]
+
+
+class TestPMap(unittest.TestCase):
+    def test_random_operations_match_dict(self):
+        rng = random.Random(7)
+        keys = [rng.randrange(3000) for _ in range(8000)]
+        keys += [_Key(i, i % 3) for i in range(12)]
+        mapping, expected = PMap(), {}
+        for i, key in enumerate(keys):
+            if expected and rng.random() < 0.3:
+                key = rng.choice(list(expected))
+                mapping = mapping.dissoc(key)
+                del expected[key]
+            else:
+                mapping = mapping.assoc(key, i)
+                expected[key] = i
+        self.assertEqual(mapping, expected)
+        self.assertEqual(list(mapping), list(expected))
+        self.assertTrue(all(mapping[key] == value for key, value in expected.items()))
+
+    def test_versions_share_structure(self):
+        base = PMap((i, i) for i in range(5000))
+        updated = base.assoc(0, "zero")
+        shared = sum(a is b for a, b in zip(base._root.entries, updated._root.entries))
+        self.assertEqual(shared, len(base._root.entries) - 1)
+        self.assertEqual((base[0], updated[0]), (0, "zero"))
+
+    def test_insertion_order_and_lookups(self):
+        mapping = PMap({"b": 1, "a": 2}).assoc("c", 3).assoc("b", 9)
+        self.assertEqual(list(mapping.items()), [("b", 9), ("a", 2), ("c", 3)])
+        self.assertIs(mapping.dissoc("missing"), mapping)
+        self.assertEqual(mapping.get("missing", 0), 0)
+        self.assertNotIn("missing", mapping)
+
+    def test_removals_keep_order_and_compact(self):
+        mapping, expected = PMap((i, i) for i in range(1000)), {i: i for i in range(1000)}
+        for i in range(990):
+            mapping = mapping.dissoc(i)
+            del expected[i]
+            if i % 7 == 0:
+                # Re-adding a removed key puts it last.
+                mapping = mapping.assoc(0, -i)
+                expected[0] = -i
+            self.assertEqual(list(mapping.items()), list(expected.items()))
+        # Tombstones are dropped before they outnumber the live entries four to one.
+        self.assertLessEqual(len(mapping._order), 4 * len(mapping) + 32)
+
+
+class TestBuiltins(unittest.TestCase):
+    CODE = """
+    bind base to {"a": 1, "b": [1, 2]}
+    bind added to assoc(base, "c", 3)
+    bind removed to dissoc(added, "a")
+    bind xs to conj([1, 2], 3)
+    bind r to [base, added, removed, xs, assoc(xs, 0, 9), type(xs), type(base)]
+    r
+    """
+
+    def test_literals_are_persistent_on_every_backend(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                context = ExecutionContext()
+                register_standard_library(context)
+                result = Interpreter(context, backend=backend).run(self.CODE)
+                self.assertIsInstance(result, PVector)
+                self.assertIsInstance(result[0], PMap)
+                self.assertEqual(result[:5], [
+                    {"a": 1, "b": [1, 2]}, {"a": 1, "b": [1, 2], "c": 3}, {"b": [1, 2], "c": 3},
+                    [1, 2, 3], [9, 2, 3],
+                ])
+                self.assertEqual([str(name) for name in result[5:]], ["list", "dict"])
+
+    def test_transpiled_literals(self):
+        result = Interpreter().run('bind r to [{"k": 1}]\nr', transpile=True)
+        self.assertIsInstance(result, PVector)
+        self.assertIsInstance(result[0], PMap)
+
+
+if __name__ == "__main__":
+    unittest.main()
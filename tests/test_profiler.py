@@ -0,0 +1,110 @@
+"""
+tests/test_profiler.py
+
+Unit tests for the statement-level profiler, source positions and `aks --profile`.
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from aks.astcache import cache_key, dumps, loads
+from aks.interpreter import Interpreter
+from aks.lexer import tokenize_stream
+from aks.parser import Parser
+from aks.profiler import Profiler, MAIN
+from akshayalang import cli
+
+FIB = """fn fib(n) {
+  if n < 2 {
+    return n
+  }
+  return fib(n - 1) + fib(n - 2)
+}
+bind total to 0
+bind i to 0
+while i < 2 {
+  total = total + fib(10)
+  i = i + 1
+}
+total
+"""
+
+
+class TestPositions(unittest.TestCase):
+    def test_statements_carry_lines(self):
+        tree = Parser(tokenize_stream(FIB)).parse()
+        self.assertEqual([s.position for s in tree.statements],
+                         [(1, 1), (7, 1), (8, 1), (9, 1), (13, 1)])
+        body = tree.statements[0].body.statements
+        self.assertEqual([s.position for s in body], [(2, 3), (5, 3)])
+
+    def test_positions_survive_ast_cache(self):
+        key = cache_key(FIB)
+        tree = loads(dumps(Parser(tokenize_stream(FIB)).parse(), key), key)
+        self.assertEqual(tree.statements[3].body.statements[0].position, (10, 3))
+
+
+class TestProfiler(unittest.TestCase):
+    def test_deterministic_counts_hits(self):
+        profiler = Profiler()
+        self.assertEqual(Interpreter(profiler=profiler).run(FIB), 110)
+        calls = 2 * 177
+        self.assertEqual(profiler.lines[("fib", 2)][0], calls)
+        self.assertEqual(profiler.lines[(MAIN, 10)][0], 2)
+        self.assertEqual(profiler.lines[(MAIN, 9)][0], 1)
+        # A loop's total time covers its body; recursion is not counted twice.
+        loop_total = profiler.lines[(MAIN, 9)][2]
+        self.assertGreaterEqual(loop_total, profiler.lines[(MAIN, 10)][2])
+        self.assertLessEqual(profiler.lines[("fib", 5)][2], loop_total)
+
+    def test_folded_stacks(self):
+        profiler = Profiler()
+        Interpreter(profiler=profiler).run(FIB)
+        folded = profiler.folded()
+        self.assertTrue(any(line.startswith("<main>:9;<main>:10;fib:5;fib:5;fib:2 ") for line in folded))
+        for line in folded:
+            stack, value = line.rsplit(" ", 1)
+            self.assertGreater(int(value), 0)
+
+    def test_sampling_attributes_samples(self):
+        profiler = Profiler("sampling", interval=0.001)
+        code = FIB.replace("fib(10)", "fib(17)")
+        Interpreter(profiler=profiler).run(code)
+        self.assertGreater(profiler.samples, 0)
+        self.assertEqual(sum(stats[0] for stats in profiler.lines.values()), profiler.samples)
+        self.assertEqual(profiler.lines[(MAIN, 9)][2], profiler.samples)
+
+    def test_report_annotates_source(self):
+        profiler = Profiler()
+        Interpreter(profiler=profiler).run(FIB)
+        report = profiler.report()
+        self.assertIn("return fib(n - 1) + fib(n - 2)", report)
+        self.assertIn("Profile (deterministic)", report)
+
+    def test_rejects_other_backends_and_modes(self):
+        with self.assertRaises(ValueError):
+            Interpreter(backend="vm", profiler=Profiler())
+        with self.assertRaises(ValueError):
+            Profiler("tracing")
+
+
+class TestCli(unittest.TestCase):
+    def test_profile_flag(self):
+        with tempfile.TemporaryDirectory() as directory:
+            script = os.path.join(directory, "fib.aks")
+            output = os.path.join(directory, "fib.folded")
+            with open(script, "w", encoding="utf-8") as f:
+                f.write(FIB)
+            stdout, stderr = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                cli.main(["--profile", script, "--no-cache", "--profile-output", output])
+            self.assertEqual(stdout.getvalue().strip(), "110")
+            self.assertIn("fib", stderr.getvalue())
+            with open(output, encoding="utf-8") as f:
+                self.assertTrue(f.read().startswith("<main>:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
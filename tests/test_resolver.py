@@ -0,0 +1,75 @@
+"""
+tests/test_resolver.py
+
+Unit tests for static scope resolution — slot addresses and lexical closures.
+"""
+
+import unittest
+from aks.interpreter import Interpreter
+from aks.resolver import bound_names, resolve
+from tests.test_compiler import PROGRAMS
+
+
+def parse(code):
+    return Interpreter()._parse(code)
+
+
+class TestResolver(unittest.TestCase):
+    def test_bound_names_order(self):
+        fn = parse("fn f(a, b) { bind c to a\n if a { bind d to 1 }\n fn g() { bind e to 2 } }").statements[0]
+        self.assertEqual(bound_names(fn.body, fn.params), ["a", "b", "c", "d", "g"])
+
+    def test_assignment_updates_enclosing_binding(self):
+        tree = resolve(parse("fn f() { bind n to 0\n fn g() { n = 1\n m = 2 } }"))
+        g = tree.statements[0].body.statements[1]
+        update, local = g.body.statements
+        self.assertEqual(update.address, (1, 1))
+        self.assertEqual(local.address, (0, 1))
+
+    def test_addresses(self):
+        tree = resolve(parse("bind g to 1\nfn f(a) { bind b to a\n fn h() { return a + b + g } }"))
+        top_bind, f = tree.statements
+        self.assertIsNone(top_bind.address)
+        self.assertIsNone(f.address)
+        self.assertEqual(f.frame_size, 4)
+        bind_b, h = f.body.statements
+        self.assertEqual(bind_b.address, (0, 2))
+        self.assertEqual(bind_b.expression.address, (0, 1))
+        self.assertEqual(h.address, (0, 3))
+        total = h.body.statements[0].value
+        self.assertEqual(total.left.left.address, (1, 1))
+        self.assertEqual(total.left.right.address, (1, 2))
+        self.assertIsNone(total.right.address)
+
+    def test_closures_capture_defining_scope(self):
+        code = """
+        fn counter() {
+            bind n to 0
+            fn next() { n = n + 1
+                        return n }
+            return next
+        }
+        bind c to counter()
+        c()
+        c()
+        """
+        self.assertEqual(Interpreter(resolve=True).run(code), 2)
+
+    def test_callee_locals_are_not_visible(self):
+        code = "fn get() { return secret }\nfn f() { bind secret to 1\n return get() }\nf()"
+        self.assertEqual(Interpreter().run(code), 1)
+        with self.assertRaises(RuntimeError):
+            Interpreter(resolve=True).run(code)
+
+    def test_unbound_local(self):
+        with self.assertRaises(RuntimeError):
+            Interpreter(resolve=True).run("fn f() { bind y to x\n bind x to 1 }\nf()")
+
+    def test_programs_match_dynamic_scoping(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                self.assertEqual(Interpreter(resolve=True).run(program), Interpreter().run(program))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+tests/test_serialize.py
+
+Unit tests for the iterative mirror serializer: deep nesting, cycles and streaming output.
+"""
+
+import io
+import json
+import unittest
+from aks.interpreter import Interpreter, BACKENDS
+from aks.persistent import PVector, PMap
+from aks.serialize import CYCLE, dump, normalize
+from aks.types import AKSNumber, AKSString, add
+
+
+def _nested(depth):
+    value = []
+    for _ in range(depth):
+        value = [value]
+    return value
+
+
+class TestNormalize(unittest.TestCase):
+    def test_unwraps_symbolic_values(self):
+        value = PMap([("n", AKSNumber(3)), (AKSString("s"), PVector([AKSString("x"), 1]))])
+        self.assertEqual(normalize(value), {"n": 3, "s": ["x", 1]})
+
+    def test_deep_nesting_does_not_recurse(self):
+        result = normalize(_nested(100000))
+        depth = 0
+        while result:
+            result = result[0]
+            depth += 1
+        self.assertEqual(depth, 100000)
+
+    def test_cycles_become_markers(self):
+        state = {"name": "loop"}
+        state["self"] = state
+        items = [1]
+        items.append(items)
+        self.assertEqual(normalize(state), {"name": "loop", "self": CYCLE})
+        self.assertEqual(normalize(items), [1, CYCLE])
+
+    def test_shared_values_are_not_cycles(self):
+        shared = [1, 2]
+        self.assertEqual(normalize([shared, shared]), [[1, 2], [1, 2]])
+
+
+class TestDump(unittest.TestCase):
+    def test_json_matches_normalize(self):
+        value = {"a": [1, 2.5, None, True], "b": {"c": "d"}, "e": PVector([PMap([("f", 1)])])}
+        sink = io.StringIO()
+        dump(value, sink)
+        self.assertEqual(json.loads(sink.getvalue()), normalize(value))
+
+    def test_text_format(self):
+        sink = io.StringIO()
+        dump({"a": [1, "x"]}, sink, format="text")
+        self.assertEqual(sink.getvalue(), "{'a': [1, 'x']}")
+        with self.assertRaises(ValueError):
+            dump(1, sink, format="yaml")
+
+    def test_deep_and_cyclic_values(self):
+        state = {"child": _nested(50000)}
+        state["root"] = state
+        sink = io.StringIO()
+        dump(state, sink)
+        output = sink.getvalue()
+        self.assertTrue(output.startswith('{"child":' + "[" * 50001 + "]" * 50001))
+        self.assertTrue(output.endswith(',"root":"%s"}' % CYCLE))
+
+    def test_streams_ropes_in_chunks(self):
+        text = ""
+        for i in range(2000):
+            text = add(text, f'line "{i}"\n')
+        sink = io.StringIO()
+        dump({"log": text}, sink)
+        self.assertEqual(json.loads(sink.getvalue()), {"log": str(text)})
+
+
+class TestMirrorSink(unittest.TestCase):
+    def test_mirror_streams_json_lines(self):
+        code = 'bind state to {"n": 1, "items": [1, 2]}\nmirror state\nmirror 3\n'
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                sink = io.StringIO()
+                interpreter = Interpreter(backend=backend, mirror_sink=sink)
+                result = interpreter.run(code)
+                self.assertEqual(result, 3)
+                lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+                self.assertEqual(lines, [{"n": 1, "items": [1, 2]}, 3])
+
+    def test_mirror_without_sink_normalizes(self):
+        code = 'bind state to {"n": 1}\nmirror state\n'
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(Interpreter(backend=backend).run(code), {"n": 1})
+        self.assertEqual(Interpreter().run(code, transpile=True), {"n": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+tests/test_specialize.py
+
+Unit tests for self-specializing AST nodes — rewriting, guards and deoptimization.
+"""
+
+import unittest
+from aks.interpreter import Interpreter
+from aks.lexer import tokenize_stream
+from aks.parser import Parser
+from aks.runtime import Runtime
+from aks.specialize import (
+    IntAddNode, GlobalCallNode, GlobalIdentifierNode, LocalIdentifierNode
+)
+from aks.ast import BinaryExpression
+from tests.test_compiler import PROGRAMS
+
+
+class TestSpecialization(unittest.TestCase):
+    def test_programs_match_generic_tree_walker(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                self.assertEqual(Interpreter(specialize=True).run(program), Interpreter().run(program))
+
+    def test_nodes_rewrite_themselves(self):
+        interpreter = Interpreter(specialize=True)
+        tree = Parser(tokenize_stream("bind k to 2\nfn f(x) { return x + k }\nf(1)")).parse()
+        interpreter.specializer.prepare(tree)
+        self.assertEqual(Runtime(interpreter.context).execute(tree), 3)
+        addition = tree.statements[1].body.statements[0].value
+        self.assertIs(type(addition), IntAddNode)
+        self.assertIs(type(addition.left), LocalIdentifierNode)
+        self.assertIs(type(addition.right), GlobalIdentifierNode)
+        self.assertIs(type(tree.statements[2]), GlobalCallNode)
+        self.assertEqual(interpreter.specialization_stats.specialized, 4)
+
+    def test_type_guard_deoptimizes(self):
+        interpreter = Interpreter(specialize=True)
+        code = 'fn add(a, b) { return a + b }\n[add(1, 2), add("a", "b"), add(3, 4)]'
+        self.assertEqual(interpreter.run(code), [3, "ab", 7])
+        self.assertEqual(interpreter.specialization_stats.deoptimized, 1)
+
+    def test_later_program_invalidates_global_cache(self):
+        first = "bind g to 1\nfn show() { return g }\nshow()"
+        second = "fn f(g) { return show() + 0 }\nf(5)"
+        interpreter = Interpreter(specialize=True)
+        self.assertEqual(interpreter.run(first), 1)
+        self.assertEqual(interpreter.run(second), 5)
+        self.assertGreaterEqual(interpreter.specialization_stats.deoptimized, 1)
+
+    def test_rebinding_keeps_global_cache_valid(self):
+        interpreter = Interpreter(specialize=True)
+        code = "bind i to 0\nwhile i < 5 { bind i to i + 1 }\ni"
+        self.assertEqual(interpreter.run(code), 5)
+        self.assertEqual(interpreter.specialization_stats.deoptimized, 0)
+
+    def test_disabled_by_default(self):
+        interpreter = Interpreter()
+        self.assertIsNone(interpreter.specialization_stats)
+        tree = Parser(tokenize_stream("1 + 2")).parse()
+        Runtime(interpreter.context).execute(tree)
+        self.assertIs(type(tree.statements[0]), BinaryExpression)
+
+
+if __name__ == "__main__":
+    unittest.main()
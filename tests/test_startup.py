@@ -0,0 +1,72 @@
+"""
+tests/test_startup.py
+
+Startup budget for the `aks` entry point: lazy imports and the time a
+cold `aks run` takes to reach a script's first statement.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+from aks import hooks, interpreter, profiler
+from aks.bench.startup import STARTUP_BUDGET, parse_importtime, profile_startup, startup_report
+from akshayalang import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Only imported by the features that use them.
+OPTIONAL = ("numpy", "aks.compiler", "aks.bytecode", "aks.vm", "aks.transpile",
+            "aks.specialize", "aks.hooks", "aks.profiler", "aks.bench.suite")
+
+
+def imported_by(code):
+    output = subprocess.run([sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sys.modules))"],
+                            env=dict(os.environ, PYTHONPATH=ROOT), stdout=subprocess.PIPE,
+                            check=True, universal_newlines=True).stdout
+    return set(output.split())
+
+
+class TestStartup(unittest.TestCase):
+    def test_cli_imports_no_interpreter(self):
+        modules = imported_by("import akshayalang.cli")
+        for module in ("aks.interpreter", "aks.stdlib", "aks.parser") + OPTIONAL:
+            self.assertNotIn(module, modules)
+
+    def test_tree_run_skips_optional_modules(self):
+        modules = imported_by(
+            "from aks.interpreter import Interpreter\nInterpreter().run('bind x to 1 + 2')"
+        )
+        self.assertIn("aks.runtime", modules)
+        for module in OPTIONAL:
+            self.assertNotIn(module, modules)
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None, "NumPy is not installed")
+    def test_numpy_loads_on_first_array(self):
+        self.assertNotIn("numpy", imported_by("import aks.stdlib"))
+        self.assertIn("numpy", imported_by("from aks.types import AKSArray\nAKSArray.zeros(2)"))
+
+    def test_cli_choices_match_their_modules(self):
+        self.assertEqual(cli.BACKENDS, interpreter.BACKENDS)
+        self.assertEqual(cli.PROFILE_MODES, profiler.MODES)
+        self.assertEqual(cli.DEFAULT_INTERVAL, profiler.DEFAULT_INTERVAL)
+        self.assertEqual(cli.EVENTS, hooks.EVENTS)
+        self.assertEqual(cli.TRACE_EVENTS, tuple(e for e in hooks.EVENTS if e not in hooks.NODE_EVENTS))
+
+    def test_parse_importtime(self):
+        text = ("import time: self [us] | cumulative | imported package\n"
+                "import time:       120 |        120 |     _io\n"
+                "import time:      2000 |       2500 |   aks.tokens\n"
+                "import time:      1500 |       4000 | aks.lexer\n")
+        self.assertEqual(parse_importtime(text), [
+            ("_io", 0.00012, 0.00012, 2), ("aks.tokens", 0.002, 0.0025, 1), ("aks.lexer", 0.0015, 0.004, 0),
+        ])
+
+    def test_time_to_first_statement_within_budget(self):
+        profile = profile_startup(runs=3)
+        self.assertIn("aks.interpreter", [name for name, _, _, _ in profile["imports"]])
+        self.assertLess(profile["seconds"], STARTUP_BUDGET, "\n" + startup_report(profile))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+tests/test_tail_calls.py
+
+Unit tests for tail-call elimination and the VM's bounded call stack.
+"""
+
+import unittest
+from aks.ast import ReturnStatement
+from aks.bytecode import Op, compile_program
+from aks.interpreter import BACKENDS, Interpreter
+from aks.lexer import tokenize_stream
+from aks.parser import Parser
+
+COUNT_DOWN = "fn count(n, acc) { if n == 0 { return acc } return count(n - 1, acc + 1) }\ncount(30000, 0)"
+DEPTH = "fn depth(n) { if n == 0 { return 0 } return 1 + depth(n - 1) }\ndepth(100000)"
+
+
+def parse(code):
+    return Parser(tokenize_stream(code)).parse()
+
+
+class TestTailCalls(unittest.TestCase):
+    def test_parser_marks_tail_calls(self):
+        body = parse("fn f(n) { return g(n)\n return n + g(n) }").statements[0].body.statements
+        self.assertIsInstance(body[0], ReturnStatement)
+        self.assertTrue(body[0].tail_call)
+        self.assertFalse(body[1].tail_call)
+
+    def test_deep_tail_recursion_on_every_backend(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(Interpreter(backend=backend).run(COUNT_DOWN), 30000)
+        self.assertEqual(Interpreter(resolve=True).run(COUNT_DOWN), 30000)
+
+    def test_tail_callee_sees_caller_locals(self):
+        code = "fn g() { return x }\nfn f() { bind x to 7\n return g() }\nf()"
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertEqual(Interpreter(backend=backend).run(code), 7)
+
+    def test_tail_call_to_builtin(self):
+        self.assertEqual(Interpreter(backend="vm").run("fn f(xs) { return len(xs) }\nf([1, 2])"), 2)
+        self.assertEqual(Interpreter().run("fn f(xs) { return len(xs) }\nreturn f([1, 2])"), 2)
+
+
+class TestVMCallStack(unittest.TestCase):
+    def test_emits_tail_call(self):
+        code = compile_program(parse("fn f(n) { return f(n) }"))
+        function = code.consts[0]
+        self.assertIn(int(Op.TAIL_CALL), list(function.code[::2]))
+
+    def test_deep_non_tail_recursion(self):
+        self.assertEqual(Interpreter(backend="vm").run(DEPTH), 100000)
+
+    def test_tree_backends_point_to_vm(self):
+        code = "fn d(n) { if n == 0 { return 0 } return 1 + d(n - 1) }\nd(2000)"
+        for backend in ("tree", "closure"):
+            with self.subTest(backend=backend):
+                with self.assertRaisesRegex(RuntimeError, "backend='vm'"):
+                    Interpreter(backend=backend).run(code)
+        self.assertEqual(Interpreter(backend="vm").run(code), 2000)
+
+    def test_vm_runs_deep_recursion_like_the_tree_walker(self):
+        # Dynamic scoping, memoize and lax arity all behave as on the tree backend.
+        code = """
+            fn walk(node) { if len(node) == 0 { return depth } return walk_child(node[0]) }
+            fn walk_child(child) { bind depth to depth + 1
+                return 0 + walk(child) }
+            fn pair(a, b) { return a }
+            bind depth to 0
+            bind tree to []
+            bind i to 0
+            while i < 20000 { tree = [tree]
+                i = i + 1 }
+            walk(tree) + pair(1)
+        """
+        self.assertEqual(Interpreter(backend="vm").run(code), 20001)
+
+    def test_depth_limit(self):
+        with self.assertRaisesRegex(RuntimeError, "maximum recursion depth 500"):
+            Interpreter(backend="vm", max_depth=500).run(DEPTH)
+        self.assertEqual(Interpreter(backend="vm", max_depth=500).run(COUNT_DOWN), 30000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+tests/test_transpile.py
+
+Unit tests for the Python transpiler and its code-object cache.
+"""
+
+import unittest
+from aks.interpreter import Interpreter
+from aks.transpile import CodeCache, compile_source, to_python
+from tests.test_compiler import PROGRAMS
+
+
+class TestTranspiler(unittest.TestCase):
+    def test_matches_tree_walker(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                self.assertEqual(Interpreter().run(program, transpile=True), Interpreter().run(program))
+
+    def test_names_are_prefixed(self):
+        source = to_python(Interpreter()._parse("bind class to 1\nclass + 1"))
+        self.assertIn("aks_class = 1\n", source)
+        compile(source, "<test>", "exec")
+
+    def test_bindings_written_back_to_context(self):
+        interpreter = Interpreter()
+        interpreter.run("fn sq(x) { return x * x }\nbind k to sq(3)", transpile=True)
+        self.assertEqual(interpreter.context.get_variable("k"), 9.0)
+        self.assertEqual(interpreter.run("sq(k)"), 81.0)
+
+    def test_tree_walker_functions_callable(self):
+        interpreter = Interpreter()
+        interpreter.run("fn inc(x) { return x + 1 }")
+        self.assertEqual(interpreter.run("inc(inc(1))", transpile=True), 3.0)
+
+    def test_top_level_return_ends_program(self):
+        code = "bind a to 1\nreturn a + 4\nbind a to 9"
+        self.assertEqual(Interpreter().run(code, transpile=True), 5)
+        self.assertEqual(Interpreter().run(code), 5)
+
+    def test_tail_calls_run_in_constant_stack(self):
+        code = "fn loop(n, acc) { if n == 0 { return acc } return loop(n - 1, acc + n) }\nloop(5000, 0)"
+        self.assertEqual(Interpreter().run(code, transpile=True), 12502500)
+        mutual = (
+            "fn even(n) { if n == 0 { return true } return odd(n - 1) }\n"
+            "fn odd(n) { if n == 0 { return false } return even(n - 1) }\n"
+            "[even(5000), odd(5001), even(len(\"abc\"))]"
+        )
+        self.assertEqual(Interpreter().run(mutual, transpile=True), Interpreter().run(mutual))
+
+    def test_tail_call_to_builtin(self):
+        self.assertEqual(Interpreter().run('fn f(s) { return len(s) }\nf("abcd")', transpile=True), 4)
+
+    def test_dynamic_scoping_is_refused(self):
+        code = "fn g() { return depth }\nfn f() { bind depth to 3\n return g() }\nf()"
+        with self.assertRaises(RuntimeError) as caught:
+            Interpreter().run(code, transpile=True)
+        self.assertIn("'depth'", str(caught.exception))
+        self.assertIn("caller's scope", str(caught.exception))
+        self.assertEqual(Interpreter().run(code), 3.0)
+
+    def test_errors_use_akshayalang_names(self):
+        for code, message in [
+            ("y + 1", "Variable 'y' is not defined."),
+            ("fn f() { return y }\nf()", "Variable 'y' is not defined."),
+            ("fn f(a) { return a * 2 }\nf()", "f() missing 1 required positional argument: 'a'"),
+        ]:
+            with self.subTest(code=code):
+                with self.assertRaises(RuntimeError) as caught:
+                    Interpreter().run(code, transpile=True)
+                self.assertIn(message, str(caught.exception))
+                self.assertNotIn("aks_", str(caught.exception))
+
+    def test_cache_skips_parsing_on_hit(self):
+        cache = CodeCache()
+        calls = []
+
+        def parse(source):
+            calls.append(source)
+            return Interpreter()._parse(source)
+
+        first = compile_source("1 + 2", parse, cache)
+        second = compile_source("1 + 2", parse, cache)
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
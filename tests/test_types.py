@@ -0,0 +1,120 @@
+"""
+tests/test_types.py
+
+Unit tests for the symbolic value types — slots, equality, hashing and singletons.
+"""
+
+import io
+import pickle
+import unittest
+from aks.interpreter import Interpreter
+from aks.types import AKSNumber, AKSString, AKSBoolean, AKSNull, AKSRope, ROPE_THRESHOLD, print_values
+
+
+class TestValueTypes(unittest.TestCase):
+    def test_wrappers_have_no_instance_dict(self):
+        for value in (AKSNumber(1), AKSString("a"), AKSBoolean(True), AKSNull()):
+            with self.subTest(value=value):
+                self.assertFalse(hasattr(value, "__dict__"))
+
+    def test_equality_and_hashing_by_value(self):
+        self.assertEqual(AKSNumber(2), AKSNumber(2))
+        self.assertNotEqual(AKSNumber(2), AKSString("2"))
+        self.assertEqual(len({AKSNumber(2), AKSNumber(2), AKSString("x")}), 2)
+
+    def test_boolean_and_null_are_singletons(self):
+        self.assertIs(AKSBoolean(1), AKSBoolean(True))
+        self.assertIsNot(AKSBoolean(True), AKSBoolean(False))
+        self.assertIs(AKSNull(), AKSNull())
+        self.assertIs(pickle.loads(pickle.dumps(AKSBoolean(False))), AKSBoolean(False))
+        self.assertIs(pickle.loads(pickle.dumps(AKSNull())), AKSNull())
+
+    def test_truthiness(self):
+        self.assertFalse(AKSBoolean(False))
+        self.assertFalse(AKSNull())
+        self.assertFalse(AKSNumber(0))
+        self.assertTrue(AKSString("x"))
+
+
+class TestNativeNumbers(unittest.TestCase):
+    def test_integer_arithmetic_stays_int(self):
+        for backend in ("tree", "closure", "vm"):
+            with self.subTest(backend=backend):
+                result = Interpreter(backend=backend).run("bind i to 0\nwhile i < 10 { i = i + 3 }\ni * 2")
+                self.assertEqual(result, 24)
+                self.assertIs(type(result), int)
+
+    def test_division_and_float_literals(self):
+        interpreter = Interpreter()
+        self.assertEqual(interpreter.run("7 / 2"), 3.5)
+        self.assertIs(type(interpreter.run("1 + 2.0")), float)
+        self.assertEqual(interpreter.run("[10, 20, 30][1]"), 20)
+
+
+class TestRope(unittest.TestCase):
+    LOOP = """
+    bind out to ""
+    bind i to 0
+    while i < 200 { out = out + "0123456789"
+    i = i + 1 }
+    out
+    """
+
+    def test_concatenation_loop_builds_rope(self):
+        for backend in ("tree", "closure", "vm"):
+            with self.subTest(backend=backend):
+                out = Interpreter(backend=backend).run(self.LOOP)
+                self.assertIsInstance(out, AKSRope)
+                self.assertEqual(len(out), 2000)
+                self.assertEqual(out, "0123456789" * 200)
+
+    def test_transpiled_concatenation_builds_rope(self):
+        out = Interpreter().run(self.LOOP, transpile=True)
+        self.assertIsInstance(out, AKSRope)
+        self.assertEqual(out, "0123456789" * 200)
+        self.assertEqual(Interpreter().run(self.LOOP + "type(out)", transpile=True), "str")
+
+    def test_type_of_rope_is_str(self):
+        for backend in ("tree", "closure", "vm"):
+            with self.subTest(backend=backend):
+                self.assertEqual(Interpreter(backend=backend).run(self.LOOP + "type(out)"), "str")
+                self.assertEqual(Interpreter(backend=backend).run('type("ab")'), "str")
+
+    def test_short_strings_stay_str(self):
+        self.assertEqual(Interpreter().run('"a" + "b"'), "ab")
+        self.assertIs(type(Interpreter().run('"a" + "b"')), str)
+
+    def test_versions_do_not_share_appends(self):
+        base = AKSRope(["x" * ROPE_THRESHOLD])
+        first = base + "1"
+        second = base + "2"
+        self.assertEqual(str(first)[-1], "1")
+        self.assertEqual(str(second)[-1], "2")
+        self.assertEqual(len(base), ROPE_THRESHOLD)
+
+    def test_behaves_like_its_string(self):
+        rope = "ab" + AKSRope(["cd", "ef"]) + AKSRope(["gh"])
+        self.assertEqual(str(rope), "abcdefgh")
+        self.assertEqual(hash(rope), hash("abcdefgh"))
+        self.assertEqual({rope: 1}["abcdefgh"], 1)
+        self.assertEqual(rope[2], "c")
+        self.assertTrue("def" in rope)
+        self.assertLess(rope, "abd")
+        self.assertNotEqual(rope, "abcdefgX")
+
+    def test_print_streams_chunks(self):
+        writes = []
+
+        class Sink:
+            def write(self, text):
+                writes.append(text)
+
+        print_values(">", AKSRope(["ab", "cd"]), file=Sink())
+        self.assertEqual(writes, [">", " ", "ab", "cd", "\n"])
+        out = io.StringIO()
+        print_values(AKSRope(["ab", "cd"]), 1, file=out)
+        self.assertEqual(out.getvalue(), "abcd 1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
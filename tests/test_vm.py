@@ -0,0 +1,88 @@
+"""
+tests/test_vm.py
+
+Unit tests for the bytecode compiler, stack VM and disassembler.
+"""
+
+import io
+import sys
+import unittest
+from aks.bytecode import Op, compile_program, disassemble
+from aks.execution_context import ExecutionContext
+from aks.interpreter import Interpreter
+from aks.lexer import tokenize_stream
+from aks.parser import Parser
+from aks.stdlib import register_standard_library
+from tests.test_compiler import PROGRAMS
+
+
+def compile_source(code):
+    return compile_program(Parser(tokenize_stream(code)).parse())
+
+
+class TestVirtualMachine(unittest.TestCase):
+    def test_matches_tree_walker(self):
+        for program in PROGRAMS:
+            with self.subTest(program=program):
+                self.assertEqual(Interpreter(backend="vm").run(program), Interpreter().run(program))
+
+    def test_function_locals_use_slots(self):
+        code = compile_source("fn f(a) { bind b to a + 1\n return b }")
+        function = code.consts[0]
+        self.assertEqual(function.local_names, ("a", "b"))
+        ops = [Op(function.code[i]) for i in range(0, len(function.code), 2)]
+        self.assertIn(Op.STORE_LOCAL, ops)
+        self.assertNotIn(Op.STORE_GLOBAL, ops)
+
+    def test_deep_recursion_uses_no_python_stack(self):
+        script = "fn down(n) { if n == 0 { return 0 } return 1 + down(n - 1) }\ndown(5000)"
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(200)
+        try:
+            self.assertEqual(Interpreter(backend="vm").run(script), 5000)
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def test_dynamic_scope_matches_tree_walker(self):
+        programs = [
+            "fn outer(n) { fn inner() { return n * 2 } return inner() }\nouter(21)",
+            "fn outer(n) { fn inner() { return n * 2 } return 1 + inner() }\nouter(21)",
+            "fn show() { return level }\nfn a() { bind level to 1\n return show() }\n"
+            "fn b() { bind level to 2\n return 10 * a() }\nbind level to 3\nbind r to [b(), show()]\nr",
+        ]
+        for program in programs:
+            with self.subTest(program=program):
+                self.assertEqual(Interpreter(backend="vm").run(program), Interpreter().run(program))
+
+    def test_only_shadowable_names_are_dynamic(self):
+        code = compile_source("fn f(n) { if n < 1 { return n } return f(n - 1) }\n"
+                              "fn g(x) { fn h() { return x } return h() }")
+        f, g = code.consts[0], code.consts[1]
+        ops = lambda c: {Op(c.code[i]) for i in range(0, len(c.code), 2)}
+        self.assertIn(Op.LOAD_CALLABLE, ops(f))
+        self.assertNotIn(Op.LOAD_DYNAMIC_CALLABLE, ops(f))
+        h = next(const for const in g.consts if hasattr(const, "code"))
+        self.assertIn(Op.LOAD_DYNAMIC, ops(h))
+
+    def test_memoize_and_python_calls(self):
+        context = ExecutionContext()
+        register_standard_library(context)
+        interpreter = Interpreter(context, backend="vm")
+        code = "fn fib(n) { if n < 2 { return n } return fib(n - 1) + fib(n - 2) }\n" \
+               "bind fib to memoize(fib)\nfib(90)"
+        self.assertEqual(interpreter.run(code), 2880067194370816120)
+        square = interpreter.run("fn sq(x) { return x * x }\nsq")
+        self.assertEqual(square(7), 49)
+
+    def test_disassembler_lists_nested_functions(self):
+        out = io.StringIO()
+        disassemble(compile_source("fn sq(x) { return x * x }\nsq(3)"), file=out)
+        listing = out.getvalue()
+        self.assertIn("Disassembly of <module>()", listing)
+        self.assertIn("Disassembly of sq(x)", listing)
+        self.assertIn("LOAD_LOCAL", listing)
+        self.assertIn("(sq)", listing)
+
+
+if __name__ == "__main__":
+    unittest.main()